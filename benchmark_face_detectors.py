@@ -0,0 +1,71 @@
+import argparse
+import os
+import time
+import cv2
+from face_detectors import DETECTOR_TYPES, create_face_detector, load_detector_config
+
+
+def load_images(image_dir, scale=1.0, limit=None):
+    """Klasördeki (alt klasörler dahil) fotoğrafları RGB olarak yükle"""
+    images = []
+    for root, _, files in os.walk(image_dir):
+        for filename in sorted(files):
+            if not filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+                continue
+            image = cv2.imread(os.path.join(root, filename))
+            if image is None:
+                continue
+            if scale != 1.0:
+                image = cv2.resize(image, (0, 0), fx=scale, fy=scale)
+            images.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            if limit and len(images) >= limit:
+                return images
+    return images
+
+
+def benchmark_detector(detector, images):
+    """Ortalama / en kötü gecikme (ms), yüz bulunan fotoğraf oranı ve toplam yüz sayısı"""
+    detector.detect(images[0])  # Isınma
+    latencies = []
+    hits = faces = 0
+    for image in images:
+        start = time.perf_counter()
+        locations = detector.detect(image)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += bool(locations)
+        faces += len(locations)
+    latencies.sort()
+    return {
+        "mean_ms": sum(latencies) / len(latencies),
+        "p95_ms": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "detection_rate": hits / len(images),
+        "faces": faces,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yüz dedektörleri için gecikme ve tespit oranı ölçümü")
+    parser.add_argument("--images", default="data/faces", help="Fotoğraf klasörü")
+    parser.add_argument("--backends", nargs="+", default=list(DETECTOR_TYPES))
+    parser.add_argument("--scale", type=float, default=1.0, help="Fotoğrafları bu ölçekte test et")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--config", default="face_detector.json")
+    args = parser.parse_args()
+
+    images = load_images(args.images, args.scale, args.limit)
+    if not images:
+        print(f"HATA: {args.images} içinde fotoğraf bulunamadı")
+        raise SystemExit(1)
+
+    config = load_detector_config(args.config)
+    print(f"{len(images)} fotoğraf, ölçek {args.scale}")
+    print(f"{'dedektör':<10}{'ort. ms':>10}{'p95 ms':>10}{'tespit oranı':>14}{'yüz':>8}")
+    for backend in args.backends:
+        try:
+            detector = create_face_detector(config, backend)
+        except (ImportError, IOError, cv2.error) as e:
+            print(f"{backend:<10} atlandı: {e}")
+            continue
+        result = benchmark_detector(detector, images)
+        print(f"{backend:<10}{result['mean_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+              f"{result['detection_rate']:>14.2%}{result['faces']:>8}")
@@ -0,0 +1,90 @@
+import argparse
+import os
+import time
+import cv2
+import numpy as np
+from face_embedders import EMBEDDER_TYPES, create_face_embedder, load_embedder_config
+
+
+def list_face_images(face_dir):
+    """data/faces/<kişi>/<fotoğraf> yapısındaki (yol, kişi) çiftleri"""
+    items = []
+    for person_name in sorted(os.listdir(face_dir)):
+        person_dir = os.path.join(face_dir, person_name)
+        if os.path.isdir(person_dir):
+            for filename in sorted(os.listdir(person_dir)):
+                if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+                    items.append((os.path.join(person_dir, filename), person_name))
+    return items
+
+
+def leave_one_out_accuracy(encodings, labels, tolerance):
+    """Her yüzü geri kalan galeriyle eşleştir: (doğruluk, bilinmeyen oranı)"""
+    if len(encodings) < 2:
+        return 0.0, 0.0
+    sq = np.sum(encodings ** 2, axis=1)
+    distances = np.sqrt(np.maximum(sq[:, None] + sq[None, :] - 2 * encodings @ encodings.T, 0))
+    np.fill_diagonal(distances, np.inf)
+    nearest = np.argmin(distances, axis=1)
+    nearest_dist = distances[np.arange(len(labels)), nearest]
+    labels = np.asarray(labels)
+    known = nearest_dist <= tolerance
+    correct = known & (labels[nearest] == labels)
+    return correct.mean(), 1.0 - known.mean()
+
+
+def benchmark_embedder(embedder, items):
+    """Kayıt süresi, yüz başına embedding süresi ve doğruluk"""
+    encodings, labels = [], []
+    enroll_ms, embed_ms = [], []
+    for image_path, person_name in items:
+        start = time.perf_counter()
+        encoding = embedder.encode_file(image_path)
+        enroll_ms.append((time.perf_counter() - start) * 1000)
+        if encoding is None:
+            continue
+        encodings.append(np.asarray(encoding, dtype=np.float32))
+        labels.append(person_name)
+
+        # Kayıt fotoğrafları yüz kesitidir; tüm görüntü tek yüz kutusu sayılır
+        rgb = cv2.cvtColor(cv2.imread(image_path), cv2.COLOR_BGR2RGB)
+        height, width = rgb.shape[:2]
+        start = time.perf_counter()
+        embedder.embed(rgb, [(0, width, height, 0)])
+        embed_ms.append((time.perf_counter() - start) * 1000)
+
+    accuracy, unknown = leave_one_out_accuracy(np.array(encodings), labels, embedder.tolerance)
+    return {
+        "enroll_ms": float(np.mean(enroll_ms)) if enroll_ms else 0.0,
+        "embed_ms": float(np.mean(embed_ms)) if embed_ms else 0.0,
+        "faces": len(encodings),
+        "accuracy": accuracy,
+        "unknown": unknown,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yüz embedding arka uçlarını gecikme ve doğrulukta karşılaştır")
+    parser.add_argument("--faces", default="data/faces", help="Kişi klasörlerini içeren yüz veri klasörü")
+    parser.add_argument("--backends", nargs="+", default=list(EMBEDDER_TYPES))
+    parser.add_argument("--config", default="face_embedder.json")
+    parser.add_argument("--limit", type=int, default=None, help="En fazla bu kadar fotoğraf kullan")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.faces):
+        print(f"HATA: Yüz veri klasörü bulunamadı: {args.faces}")
+        raise SystemExit(1)
+    items = list_face_images(args.faces)[:args.limit]
+    config = load_embedder_config(args.config)
+
+    print(f"{len(items)} fotoğraf, {len({label for _, label in items})} kişi")
+    print(f"{'arka uç':<10}{'kayıt ms':>10}{'embed ms':>10}{'yüz':>7}{'doğruluk':>10}{'bilinmeyen':>12}")
+    for backend in args.backends:
+        try:
+            embedder = create_face_embedder(config, backend)
+        except (ImportError, IOError, cv2.error) as e:
+            print(f"{backend:<10} atlandı: {e}")
+            continue
+        result = benchmark_embedder(embedder, items)
+        print(f"{backend:<10}{result['enroll_ms']:>10.1f}{result['embed_ms']:>10.1f}{result['faces']:>7}"
+              f"{result['accuracy']:>10.2%}{result['unknown']:>12.2%}")
@@ -0,0 +1,63 @@
+import argparse
+import os
+import time
+import numpy as np
+from face_index import BruteForceIndex, IVFIndex
+
+
+def synthetic_gallery(n, people, dim=128, seed=0):
+    """Kişi merkezleri etrafında kümelenmiş yapay yüz encoding'leri üret"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(0, 0.09, size=(people, dim)).astype(np.float32)
+    labels = rng.integers(0, people, size=n)
+    vectors = centers[labels] + rng.normal(0, 0.025, size=(n, dim)).astype(np.float32)
+    return vectors.astype(np.float32), centers
+
+
+def time_search(index, queries, k, **kwargs):
+    """Sorgu başına ortalama süreyi (ms) ve sonuçları döndür"""
+    start = time.perf_counter()
+    results = [index.search(q[None, :], k, **kwargs)[1][0] for q in queries]
+    elapsed = (time.perf_counter() - start) * 1000 / len(queries)
+    return elapsed, np.array(results)
+
+
+def run_benchmark(vectors, n_queries=200, k=1, seed=1):
+    """Kaba kuvvet ile IVF'yi farklı nprobe değerlerinde karşılaştır"""
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(vectors), n_queries, replace=False)
+    queries = vectors[picks] + rng.normal(0, 0.02, size=(n_queries, vectors.shape[1])).astype(np.float32)
+
+    brute = BruteForceIndex(vectors)
+    brute_ms, truth = time_search(brute, queries, k)
+
+    start = time.perf_counter()
+    ivf = IVFIndex(vectors)
+    build_s = time.perf_counter() - start
+
+    print(f"Galeri: {len(vectors)} encoding, IVF nlist={ivf.nlist}, kurulum {build_s:.1f} sn")
+    print(f"{'yöntem':<16}{'nprobe':>8}{'recall@' + str(k):>12}{'ms/sorgu':>12}{'hızlanma':>10}")
+    print(f"{'brute':<16}{'-':>8}{1.0:>12.3f}{brute_ms:>12.3f}{1.0:>10.1f}")
+    for nprobe in sorted({1, 2, 4, 8, 16, 32, ivf.nprobe}):
+        if nprobe > ivf.nlist:
+            continue
+        ivf_ms, found = time_search(ivf, queries, k, nprobe=nprobe)
+        recall = np.mean([len(set(t) & set(f)) / k for t, f in zip(truth, found)])
+        print(f"{'ivf':<16}{nprobe:>8}{recall:>12.3f}{ivf_ms:>12.3f}{brute_ms / ivf_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yüz galerisi indeksleri için recall / gecikme ölçümü")
+    parser.add_argument("--size", type=int, default=50000, help="Yapay galeri boyutu")
+    parser.add_argument("--people", type=int, default=5000, help="Yapay kişi sayısı")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=1)
+    parser.add_argument("--cache", default=None,
+                        help="Yapay veri yerine kullanılacak encoding matrisi (örn. models/face_encodings.npy)")
+    args = parser.parse_args()
+
+    if args.cache and os.path.exists(args.cache):
+        vectors = np.load(args.cache).astype(np.float32)
+    else:
+        vectors, _ = synthetic_gallery(args.size, args.people)
+    run_benchmark(vectors, n_queries=min(args.queries, len(vectors)), k=args.k)
@@ -0,0 +1,64 @@
+import argparse
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from frame_context import FrameBufferPool, FrameContext
+
+
+def _make_frames(height, width, count=4):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def per_frame_conversions(frame, scale):
+    """Eski yol: her aşama kendi küçültme ve renk dönüşümünü yeni dizilere yapar"""
+    small_frame = cv2.resize(frame, (0, 0), fx=scale, fy=scale)
+    rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+    gray_small_frame = cv2.cvtColor(rgb_small_frame, cv2.COLOR_RGB2GRAY)
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return gray_small_frame, rgb_small_frame, rgb_frame
+
+
+def context_conversions(frame, scale, pool):
+    """FrameContext: her görüntü bir kez, havuzdaki tampona hesaplanır"""
+    context = FrameContext(frame, pool)
+    images = context.small_gray(scale), context.small_rgb(scale), context.rgb()
+    context.release()
+    return images
+
+
+def run(name, convert, frames, count):
+    # Isınma (OpenCV iş parçacıkları, havuzun ilk tamponları)
+    for frame in frames:
+        convert(frame)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    allocated = 0
+    start = time.perf_counter()
+    for i in range(count):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        convert(frames[i % len(frames)])
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - before
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    print(f"{name:<14}{elapsed / count * 1000:>10.2f}{allocated / count / 1e6:>18.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kare başına renk dönüşümü: ayrı diziler vs FrameContext tamponları")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--scale", type=float, default=0.25)
+    args = parser.parse_args()
+
+    frames = _make_frames(args.height, args.width)
+    pool = FrameBufferPool()
+    print(f"{args.frames} kare, {args.width}x{args.height}, ölçek {args.scale}")
+    print(f"{'yöntem':<14}{'ms/kare':>10}{'MB ayrılan/kare':>18}")
+    run("ayrı diziler", lambda frame: per_frame_conversions(frame, args.scale), frames, args.frames)
+    run("FrameContext", lambda frame: context_conversions(frame, args.scale, pool), frames, args.frames)
+    print(f"Havuz: {pool.allocations} tampon ayrıldı, {pool.reuses} kez yeniden kullanıldı")
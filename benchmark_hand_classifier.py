@@ -0,0 +1,79 @@
+import os
+import time
+import pickle
+import argparse
+import numpy as np
+from compiled_forest import CompiledForest
+
+
+def _synthetic_model(trees, classes, samples, features=63):
+    """Gerçek model yoksa el işaretlerine benzer boyutta sentetik veriyle eğit"""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(0, 1, (classes, features))
+    y = rng.integers(0, classes, samples)
+    X = centers[y] + rng.normal(0, 0.05, (samples, features))
+    labels = np.array([chr(ord('A') + i) for i in range(classes)])[y]
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=trees, random_state=42).fit(scaler.transform(X), labels)
+    return model, scaler, X
+
+
+def _load_model(models_dir):
+    with open(os.path.join(models_dir, 'hand_gesture_model.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    with open(os.path.join(models_dir, 'hand_scaler.pkl'), 'rb') as f:
+        scaler = pickle.load(f)
+    rng = np.random.default_rng(0)
+    X = scaler.mean_ + rng.normal(0, 1, (500, len(scaler.mean_))) * scaler.scale_
+    return model, scaler, X
+
+
+def time_per_call(fn, rows, calls):
+    """fn'in satır başına ortalama süresi (µs); gesture_leaderboard.py de kullanır"""
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(rows[i % len(rows)])
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="El hareketi RandomForest tahmini: sklearn vs derlenmiş NumPy orman")
+    parser.add_argument("--models-dir", default=None, help="hand_gesture_model.pkl / hand_scaler.pkl klasörü (yoksa sentetik model)")
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--classes", type=int, default=26)
+    parser.add_argument("--samples", type=int, default=2600)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.models_dir:
+        model, scaler, X = _load_model(args.models_dir)
+    else:
+        model, scaler, X = _synthetic_model(args.trees, args.classes, args.samples)
+    compiled = CompiledForest.from_sklearn(model, scaler)
+    print(f"{len(model.estimators_)} ağaç, {len(model.classes_)} sınıf, {len(compiled.threshold)} düğüm, "
+          f"en fazla derinlik {compiled.depth}")
+
+    # Doğruluk: etiket ve olasılıklar sklearn ile bit düzeyinde aynı olmalı
+    rows = X[:500]
+    expected = model.predict_proba(scaler.transform(rows))
+    same_proba = np.array_equal(expected, compiled.predict_proba(rows))
+    mismatches = 0
+    for row in rows[:100]:
+        scaled = scaler.transform([row])
+        label, probability = compiled.predict_one(row)
+        mismatches += label != model.predict(scaled)[0] or probability != np.max(model.predict_proba(scaled))
+    print(f"Toplu olasılıklar aynı: {same_proba}, tek satır uyuşmazlık: {mismatches}/100")
+
+    def sklearn_call(row):
+        scaled = scaler.transform([row])
+        return model.predict(scaled)[0], np.max(model.predict_proba(scaled))
+
+    calls = args.calls
+    sklearn_us = time_per_call(sklearn_call, rows, max(10, calls // 10))
+    compiled_us = time_per_call(compiled.predict_one, rows, calls)
+    print(f"{'yöntem':<22}{'µs/çağrı':>12}")
+    print(f"{'sklearn (2 çağrı)':<22}{sklearn_us:>12.0f}")
+    print(f"{'derlenmiş orman':<22}{compiled_us:>12.0f}")
+    print(f"Hızlanma: {sklearn_us / compiled_us:.0f}x")
@@ -0,0 +1,126 @@
+import argparse
+import time
+import cv2
+import numpy as np
+from frame_context import FrameBufferPool, FrameContext
+from hand_roi import HandSearchRegion
+
+try:
+    import mediapipe as mp
+except ImportError:
+    mp = None
+
+
+def _load_frames(source, width, height, count=30):
+    """Video dosyasından kareler; verilmezse rastgele kareler"""
+    if source:
+        cap = cv2.VideoCapture(source)
+        frames = []
+        while len(frames) < count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+        if frames:
+            return frames
+        print(f"UYARI: {source} okunamadı, rastgele kareler kullanılıyor")
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def _default_face_box(frame_shape):
+    """Kapı kamerasındaki tipik yüz: ortada, kare yüksekliğinin beşte biri"""
+    height, width = frame_shape[:2]
+    size = height // 5
+    top, left = height // 5, (width - size) // 2
+    return top, left + size, top + size, left
+
+
+def run(name, process, frames, count):
+    # Isınma (MediaPipe grafiği, havuzun ilk tamponları)
+    for frame in frames[:5]:
+        process(frame)
+    found = 0
+    start = time.perf_counter()
+    for i in range(count):
+        found += process(frames[i % len(frames)])
+    elapsed = (time.perf_counter() - start) / count * 1000
+    print(f"{name:<26}{elapsed:>10.2f}{found / count:>14.0%}")
+    return elapsed
+
+
+def preprocess_only(pool, hand_search, frames):
+    def full(frame):
+        context = FrameContext(frame, pool)
+        context.rgb()
+        context.release()
+        return 0
+
+    region_box, size = hand_search.current_region(frames[0].shape)
+
+    def region(frame):
+        context = FrameContext(frame, pool)
+        context.region_rgb(region_box, size)
+        context.release()
+        return 0
+    return full, region
+
+
+def with_mediapipe(pool, hand_search, hands_full, hands_region):
+    def full(frame):
+        context = FrameContext(frame, pool)
+        results = hands_full.process(context.rgb())
+        context.release()
+        return bool(results.multi_hand_landmarks)
+
+    def region(frame):
+        context = FrameContext(frame, pool)
+        results = hand_search.process(hands_region, context)
+        context.release()
+        return bool(results.multi_hand_landmarks)
+    return full, region
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MediaPipe el araması: tam kare vs yüz çevresindeki küçültülmüş bölge")
+    parser.add_argument("--video", default=None, help="Yüz ve el içeren video (yoksa rastgele kareler)")
+    parser.add_argument("--face-box", type=int, nargs=4, default=None, metavar=("TOP", "RIGHT", "BOTTOM", "LEFT"),
+                        help="Yüz kutusu (tam çözünürlük); verilmezse karenin ortası")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--max-side", type=int, default=320)
+    args = parser.parse_args()
+
+    frames = _load_frames(args.video, args.width, args.height)
+    face_box = tuple(args.face_box) if args.face_box else _default_face_box(frames[0].shape)
+    hand_search = HandSearchRegion(max_side=args.max_side)
+    hand_search.anchor(face_box)
+    # Ölçüm hep bölgede yapılsın; el bulunamayan karelerde tüm kareye dönülmez
+    hand_search.max_misses = float("inf")
+    region_box, size = hand_search.current_region(frames[0].shape)
+    if region_box is None:
+        print(f"Yüz {face_box} için bölge karenin %{hand_search.max_area_ratio * 100:.0f}'inden büyük; "
+              f"HandSearchRegion kırpmaz, tüm kare işlenir")
+        raise SystemExit(0)
+    (top, right, bottom, left), (width, height) = region_box, size
+    print(f"{args.frames} kare, {frames[0].shape[1]}x{frames[0].shape[0]}; yüz {face_box}, "
+          f"bölge {right - left}x{bottom - top} -> {width}x{height}")
+    print(f"{'yöntem':<26}{'ms/kare':>10}{'el bulunan':>14}")
+
+    pool = FrameBufferPool()
+    full, region = preprocess_only(pool, hand_search, frames)
+    full_ms = run("renk dönüşümü: tam kare", full, frames, args.frames)
+    region_ms = run("renk dönüşümü: bölge", region, frames, args.frames)
+    if mp is None:
+        print("UYARI: mediapipe kurulu değil, sadece ön işleme ölçüldü")
+    else:
+        # Her yol kendi Hands nesnesini kullanır (kareler arası iz karışmasın)
+        create = lambda: mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1,
+                                                  min_detection_confidence=0.7, min_tracking_confidence=0.5)
+        with create() as hands_full, create() as hands_region:
+            full, region = with_mediapipe(pool, hand_search, hands_full, hands_region)
+            full_ms = run("MediaPipe: tam kare", full, frames, args.frames)
+            region_ms = run("MediaPipe: bölge", region, frames, args.frames)
+    print(f"Hızlanma: {full_ms / region_ms:.1f}x")
@@ -0,0 +1,95 @@
+import os
+import argparse
+import tempfile
+import cv2
+import numpy as np
+from detection_scale import SCALE_STEPS
+from face_detectors import load_detector_config
+from face_embedders import load_embedder_config
+from face_gallery import FaceGallery
+from gesture_classifiers import HandGestureRecognizer
+from multi_camera import (CameraSession, MultiCameraProcessRunner, MultiCameraRunner, PersonGestureCheck,
+                          SharedRecognition)
+
+
+class ConstantEmbedder:
+    """Ölçümde yüz tespitini ayırmak için sabit encoding üreten embedder"""
+
+    name = "dlib"
+
+    def embed(self, rgb_image, locations):
+        return [np.zeros(128, dtype=np.float32) for _ in locations]
+
+
+class BenchRecognition(SharedRecognition):
+    """Gerçek dedektör, sabit embedder; yüz hiç doğrulanmaz, her kare tespit yoluna girer"""
+
+    @property
+    def embedder(self):
+        return ConstantEmbedder()
+
+
+def no_hands(static_image_mode=False):
+    # Yüz doğrulanmadığı için MediaPipe'a hiç gerek yok
+    return None
+
+
+def write_synthetic_video(path, width, height, frames):
+    """Kenar ve gürültü içeren, dedektöre iş çıkaran rastgele video"""
+    rng = np.random.default_rng(0)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (width, height))
+    for _ in range(frames):
+        frame = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (5, 5), 0)
+        writer.write(frame)
+    writer.release()
+
+
+def measure(mode, cameras, video, shared, duration, options):
+    sources = [video] * cameras
+    if mode == "processes":
+        runner = MultiCameraProcessRunner(sources, shared, **options)
+    else:
+        sessions = [CameraSession(camera_id, source, shared, **options) for camera_id, source in enumerate(sources)]
+        runner = MultiCameraRunner(sessions)
+    summaries = runner.run(duration, verbose=False)
+    return sum(summary["fps"] for summary in summaries), sum(summary["frames"] for summary in summaries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Çoklu kamera verimi: 1/2/4 kamera, thread havuzu vs kamera başına süreç")
+    parser.add_argument("--video", default=None, help="Her kameraya verilecek video (yoksa rastgele video üretilir)")
+    parser.add_argument("--detector", default=None, help="Yüz dedektörü (varsayılan face_detector.json)")
+    parser.add_argument("--cameras", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--modes", nargs="+", default=["threads", "processes"], choices=["threads", "processes"])
+    parser.add_argument("--duration", type=float, default=10.0, help="Her ölçümün en fazla süresi (sn)")
+    parser.add_argument("--scale", type=float, default=0.5, choices=SCALE_STEPS,
+                        help="Sabit tespit ölçeği (uyarlamalı ölçek yük altında küçülür ve ölçümü bozar)")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    args = parser.parse_args()
+
+    detector_config = load_detector_config()
+    if args.detector:
+        detector_config["backend"] = args.detector
+    gallery = FaceGallery(np.zeros((1, 128), dtype=np.float32), ["bench"], index_method="brute")
+    shared = BenchRecognition(gallery, detector_config, load_embedder_config(),
+                              classify_gesture=HandGestureRecognizer(None), check_gesture=PersonGestureCheck({}),
+                              hands_factory=no_hands)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Yüz hiç doğrulanmaz; her kamera sadece tespit / izleme yolunu çalıştırır
+        options = dict(realtime=False, face_threshold=float("inf"), detection_scale=args.scale,
+                       metrics_dir=os.path.join(directory, "metrics"))
+        video = args.video
+        if video is None:
+            video = os.path.join(directory, "synthetic.avi")
+            write_synthetic_video(video, args.width, args.height, frames=600)
+        print(f"{os.cpu_count()} çekirdek, dedektör {detector_config['backend']} (ölçek {args.scale}), "
+              f"kaynak {args.video or 'rastgele video'}")
+        print(f"{'mod':<12}{'kamera':>8}{'kare':>8}{'kare/sn':>10}{'ölçek':>8}")
+        for mode in args.modes:
+            single = None
+            for cameras in args.cameras:
+                fps, frames = measure(mode, cameras, video, shared, args.duration, options)
+                single = single or fps / cameras
+                print(f"{mode:<12}{cameras:>8}{frames:>8}{fps:>10.1f}{fps / single if single else 0.0:>7.2f}x")
@@ -0,0 +1,95 @@
+import argparse
+import time
+import multiprocessing as mp
+import numpy as np
+from shared_frames import SharedFrameRing
+
+
+def _make_frames(height, width, count=4):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def _pickle_producer(frame_queue, height, width, frames):
+    images = _make_frames(height, width)
+    for i in range(frames):
+        frame_queue.put((i, time.time(), images[i % len(images)]))
+    frame_queue.put(None)
+
+
+def _ring_producer(ring, height, width, frames):
+    images = _make_frames(height, width)
+    for i in range(frames):
+        ring.write(images[i % len(images)], (i, time.time()), timeout=None)
+    ring.finish()
+
+
+def _touch(frame):
+    """Tüketicide karenin gerçekten okunduğundan emin olmak için ucuz bir iş"""
+    return int(frame[::97, ::97].sum())
+
+
+def benchmark_pickle(height, width, frames, slots):
+    """Kareleri multiprocessing.Queue ile (pickle + kopya) aktar"""
+    context = mp.get_context("spawn")
+    frame_queue = context.Queue(maxsize=slots)
+    producer = context.Process(target=_pickle_producer, args=(frame_queue, height, width, frames))
+    producer.start()
+    latencies = []
+    first = frame_queue.get()
+    start = time.perf_counter()
+    item = first
+    while item is not None:
+        _, sent, frame = item
+        _touch(frame)
+        latencies.append((time.time() - sent) * 1000)
+        item = frame_queue.get()
+    elapsed = time.perf_counter() - start
+    producer.join()
+    return elapsed, latencies
+
+
+def benchmark_ring(height, width, frames, slots):
+    """Kareleri paylaşılan bellek halkasıyla (yuva mesajı + kopyasız görünüm) aktar"""
+    context = mp.get_context("spawn")
+    ring = SharedFrameRing(slots, context)
+    ring.allocate((height, width, 3), np.uint8)
+    producer = context.Process(target=_ring_producer, args=(ring, height, width, frames))
+    producer.start()
+    latencies = []
+    frame, meta = ring.read()
+    start = time.perf_counter()
+    while frame is not None:
+        _, sent = meta
+        _touch(frame)
+        latencies.append((time.time() - sent) * 1000)
+        ring.release(frame)
+        frame, meta = ring.read()
+    elapsed = time.perf_counter() - start
+    producer.join()
+    ring.close()
+    return elapsed, latencies
+
+
+def report(name, elapsed, latencies, frame_bytes):
+    count = len(latencies)
+    latencies = sorted(latencies)
+    # İlk kare (süreç açılışı) süreye katılmaz
+    rate = (count - 1) / elapsed if elapsed > 0 else 0.0
+    print(f"{name:<14}{rate:>10.1f}{rate * frame_bytes / 1e6:>10.0f}"
+          f"{latencies[count // 2]:>10.2f}{latencies[min(count - 1, int(0.95 * count))]:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Süreçler arası kare aktarımı: pickle kuyruğu vs paylaşılan bellek halkası")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--slots", type=int, default=8, help="Kuyruk boyu / halka yuva sayısı")
+    args = parser.parse_args()
+
+    frame_bytes = args.width * args.height * 3
+    print(f"{args.frames} kare, {args.width}x{args.height} ({frame_bytes / 1e6:.1f} MB/kare), {args.slots} yuva")
+    print(f"{'yöntem':<14}{'kare/sn':>10}{'MB/sn':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    report("pickle kuyruk", *benchmark_pickle(args.height, args.width, args.frames, args.slots), frame_bytes)
+    report("paylaşımlı", *benchmark_ring(args.height, args.width, args.frames, args.slots), frame_bytes)
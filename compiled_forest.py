@@ -0,0 +1,180 @@
+import os
+import numpy as np
+
+
+class CompiledForest:
+    """Eğitilmiş RandomForestClassifier + StandardScaler'ın sklearn'süz hali.
+
+    Tüm ağaçların düğümleri tek dizilerde tutulur (özellik, eşik, çocuklar;
+    yapraklar kendilerini gösterir) ve tek satırlık tahminde bütün ağaçlar
+    derinlik sayısı kadar vektörel adımda birlikte yürünür. Sonuç sklearn ile
+    bire bir aynıdır: ağaçlar gibi float32 girdiyle karşılaştırılır, yaprak
+    olasılıkları aynı sırayla toplanıp ağaç sayısına bölünür. Diziler
+    save() / load() ile .npz olarak saklanır; yüklemek için sklearn gerekmez.
+    feature_version modelin eğitildiği el özelliği sürümüdür (hand_features);
+    mirror_handedness sol ellerin eğitimde aynalanıp aynalanmadığını söyler.
+    """
+
+    name = "random_forest"
+
+    def __init__(self, feature, threshold, children, leaf_index, leaf_values, roots, depth, classes,
+                 mean=None, scale=None, feature_version=1, mirror_handedness=False):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        # children[düğüm, sağa mı] = _next[2 * düğüm + sağa mı]
+        self._next = np.ascontiguousarray(children).reshape(-1)
+        self.leaf_index = leaf_index
+        self.leaf_values = leaf_values
+        self.roots = roots
+        self.depth = int(depth)
+        self.classes = classes
+        self.mean = mean
+        self.scale = scale
+        self.n_trees = len(roots)
+        self.feature_version = int(feature_version)
+        self.mirror_handedness = bool(mirror_handedness)
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None):
+        """RandomForestClassifier (ve varsa StandardScaler) dizilere çevir"""
+        features, thresholds, children, leaf_index, leaf_values, roots = [], [], [], [], [], []
+        offset = leaves = 0
+        depth = 0
+        n_classes = len(model.classes_)
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            left, right = tree.children_left, tree.children_right
+            nodes = np.arange(tree.node_count)
+            is_leaf = left == -1
+            # Yapraklar kendilerini gösterir; böylece tüm ağaçlar aynı adım sayısıyla yürünür
+            tree_children = np.stack([np.where(is_leaf, nodes, left), np.where(is_leaf, nodes, right)], axis=1)
+            children.append(tree_children + offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            # sklearn DecisionTreeClassifier.predict_proba ile aynı normalizasyon
+            values = tree.value[is_leaf, 0, :n_classes].astype(np.float64)
+            normalizer = values.sum(axis=1)[:, None]
+            normalizer[normalizer == 0.0] = 1.0
+            leaf_values.append(values / normalizer)
+            index = np.full(tree.node_count, -1, dtype=np.int32)
+            index[is_leaf] = leaves + np.arange(int(is_leaf.sum()))
+            leaf_index.append(index)
+            roots.append(offset)
+            offset += tree.node_count
+            leaves += int(is_leaf.sum())
+            depth = max(depth, tree.max_depth)
+
+        mean = scale = None
+        if scaler is not None:
+            if getattr(scaler, "with_mean", True) and scaler.mean_ is not None:
+                mean = np.asarray(scaler.mean_, dtype=np.float64)
+            if getattr(scaler, "with_std", True) and scaler.scale_ is not None:
+                scale = np.asarray(scaler.scale_, dtype=np.float64)
+        return cls(np.concatenate(features).astype(np.intp), np.concatenate(thresholds).astype(np.float64),
+                   np.concatenate(children).astype(np.intp), np.concatenate(leaf_index),
+                   np.concatenate(leaf_values), np.asarray(roots, dtype=np.intp), depth,
+                   np.asarray(model.classes_), mean, scale, getattr(model, "feature_version_", 1),
+                   getattr(model, "mirror_handedness_", False))
+
+    @classmethod
+    def train(cls, X, y, feature_version=1, n_estimators=100, mirror_handedness=False):
+        """StandardScaler + RandomForestClassifier eğitip derle"""
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
+        scaler = StandardScaler().fit(X)
+        model = RandomForestClassifier(n_estimators=n_estimators, random_state=42).fit(scaler.transform(X), y)
+        model.feature_version_ = feature_version
+        model.mirror_handedness_ = mirror_handedness
+        return cls.from_sklearn(model, scaler)
+
+    def _scale(self, X):
+        # StandardScaler.transform ile aynı işlem sırası
+        X = np.array(X, dtype=np.float64)
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+        # sklearn ağaçları girdiyi float32'ye çevirip karşılaştırır
+        return X.astype(np.float32)
+
+    def predict_one(self, features):
+        """Tek özellik satırı için (etiket, olasılık) (predict + max(predict_proba))"""
+        x = self._scale(features)
+        node = self.roots
+        for step in range(self.depth):
+            previous = node
+            # take() tek boyutlu dizide fancy indekslemeden belirgin hızlı
+            go_right = np.greater(x.take(self.feature.take(node)), self.threshold.take(node))
+            node = self._next.take(2 * node + go_right)
+            # Çoğu yol en derin ağaçtan kısadır; hepsi yaprağa ulaşınca dur
+            if step % 4 == 3 and np.array_equal(node, previous):
+                break
+        # Ağaç olasılıkları sklearn'deki gibi sırayla toplanır (eksen 0 boyunca)
+        proba = np.add.reduce(self.leaf_values[self.leaf_index[node]], axis=0) / self.n_trees
+        best = int(np.argmax(proba))
+        return self.classes[best], proba[best]
+
+    def predict_proba(self, X):
+        """(N, özellik) matrisi için sınıf olasılıkları (N, sınıf)"""
+        X = self._scale(X)
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.depth):
+            go_right = X[rows, self.feature[node]] > self.threshold[node]
+            node = self.children[node, go_right.view(np.uint8)]
+        return np.add.reduce(self.leaf_values[self.leaf_index[node]], axis=1) / self.n_trees
+
+    def predict(self, X):
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        arrays = dict(kind=np.array(self.name), feature=self.feature, threshold=self.threshold, children=self.children,
+                      leaf_index=self.leaf_index, leaf_values=self.leaf_values, roots=self.roots,
+                      depth=np.array(self.depth), classes=self.classes,
+                      feature_version=np.array(self.feature_version),
+                      mirror_handedness=np.array(self.mirror_handedness))
+        if self.mean is not None:
+            arrays["mean"] = self.mean
+        if self.scale is not None:
+            arrays["scale"] = self.scale
+        # np.savez yolun sonuna .npz ekler; yazılan dosya tam olarak path olsun
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["feature"], data["threshold"], data["children"], data["leaf_index"],
+                       data["leaf_values"], data["roots"], data["depth"], data["classes"],
+                       data["mean"] if "mean" in data else None, data["scale"] if "scale" in data else None,
+                       data["feature_version"] if "feature_version" in data else 1,
+                       bool(data["mirror_handedness"]) if "mirror_handedness" in data else False)
+
+
+def load_compiled_forest(model_path, scaler_path, compiled_path):
+    """Derlenmiş ormanı yükle; yoksa ya da pickle daha yeniyse pickle'dan derleyip kaydet.
+
+    (CompiledForest, model, scaler) döndürür; model ve scaler sadece pickle
+    okunduysa doludur. Hiçbiri yoksa (None, None, None).
+    """
+    pickles = [p for p in (model_path, scaler_path) if os.path.exists(p)]
+    if os.path.exists(compiled_path) and (len(pickles) < 2 or
+                                          os.path.getmtime(compiled_path) >= max(map(os.path.getmtime, pickles))):
+        return CompiledForest.load(compiled_path), None, None
+    if len(pickles) < 2:
+        return None, None, None
+    import pickle
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    with open(scaler_path, 'rb') as f:
+        scaler = pickle.load(f)
+    compiled = CompiledForest.from_sklearn(model, scaler)
+    try:
+        compiled.save(compiled_path)
+    except OSError as e:
+        print(f"UYARI: Derlenmiş el hareketi modeli yazılamadı: {e}")
+    return compiled, model, scaler
@@ -0,0 +1,88 @@
+import time
+from collections import deque
+
+# Tespit ölçeği bu basamaklardan seçilir (kareden kareye titremeyi önler)
+SCALE_STEPS = (0.125, 0.1875, 0.25, 0.375, 0.5, 0.75, 1.0)
+
+
+class DetectionScaleController:
+    """Her kare için yüz tespit ölçeğini seçen uyarlamalı denetleyici.
+
+    Son görülen yüz boyutlarına göre en küçük yüz tespit ölçeğinde yaklaşık
+    target_face_px piksel olacak şekilde ölçek seçilir; yüz yoksa uzaktaki
+    küçük yüzleri yakalamak için ölçek büyütülür. Tespit süresinin piksel
+    sayısıyla orantılı olduğu varsayılarak ölçülen gecikmeden bir maliyet
+    katsayısı öğrenilir ve ölçek budget_ms bütçesini aşmayacak şekilde sınırlanır.
+    """
+
+    def __init__(self, budget_ms=40.0, target_face_px=80, initial_scale=0.25,
+                 min_scale=SCALE_STEPS[0], max_scale=SCALE_STEPS[-1], history_size=300):
+        self.budget_ms = budget_ms
+        self.target_face_px = target_face_px
+        self.steps = [s for s in SCALE_STEPS if min_scale <= s <= max_scale]
+        self.scale = initial_scale
+        self.scale_cap = None           # Verilirse ölçek bunu aşmaz (ör. yük altında)
+        self.face_height = None         # Son görülen en küçük yüz yüksekliği (tam çözünürlük)
+        self.cost_per_pixel = None      # ms / piksel (üstel ortalama)
+        self.history = deque(maxlen=history_size)   # (zaman, ölçek, gecikme ms, yüz sayısı)
+
+    def _step_at_least(self, value):
+        for step in self.steps:
+            if step >= value:
+                return step
+        return self.steps[-1]
+
+    def _step_at_most(self, value):
+        best = self.steps[0]
+        for step in self.steps:
+            if step <= value:
+                best = step
+        return best
+
+    def choose(self, frame_shape):
+        """Bu kare için kullanılacak tespit ölçeğini döndür"""
+        if self.face_height:
+            desired = self._step_at_least(self.target_face_px / self.face_height)
+        else:
+            # Yüz yokken bir basamak büyüterek küçük/uzak yüzleri ara
+            higher = [s for s in self.steps if s > self.scale]
+            desired = higher[0] if higher else self.scale
+
+        if self.cost_per_pixel:
+            pixels = frame_shape[0] * frame_shape[1]
+            budget_scale = (self.budget_ms / (self.cost_per_pixel * pixels)) ** 0.5
+            desired = min(desired, self._step_at_most(budget_scale))
+        if self.scale_cap:
+            desired = min(desired, self._step_at_most(self.scale_cap))
+
+        self.scale = desired
+        return self.scale
+
+    def observe(self, frame_shape, face_heights, latency_ms, pixels=None):
+        """Bu karenin tespit sonucunu (tam çözünürlükte yüz yükseklikleri) bildir.
+
+        pixels tespitin gerçekten taradığı piksel sayısıdır (sadece arama
+        bölgeleri tarandıysa); verilmezse küçültülmüş karenin tamamı sayılır.
+        """
+        if pixels is None:
+            pixels = frame_shape[0] * frame_shape[1] * self.scale * self.scale
+        # Hiç taranmayan karede (boş bölgeler) maliyet öğrenilmez
+        if pixels > 0:
+            cost = latency_ms / pixels
+            if self.cost_per_pixel is None:
+                self.cost_per_pixel = cost
+            else:
+                self.cost_per_pixel = 0.8 * self.cost_per_pixel + 0.2 * cost
+        self.face_height = min(face_heights) if face_heights else None
+        self.history.append((time.time(), self.scale, latency_ms, len(face_heights)))
+
+    def report(self):
+        """Son karenin ölçeği ve gecikmesi ile ortalama gecikme"""
+        if not self.history:
+            return {"scale": self.scale, "latency_ms": 0.0, "mean_latency_ms": 0.0}
+        latencies = [entry[2] for entry in self.history]
+        return {
+            "scale": self.history[-1][1],
+            "latency_ms": self.history[-1][2],
+            "mean_latency_ms": sum(latencies) / len(latencies),
+        }
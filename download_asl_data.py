@@ -7,6 +7,7 @@ from PIL import Image
 import cv2
 import mediapipe as mp
 from tqdm import tqdm
+from hand_features import HandFeatureExtractor, detected_hands
 
 def download_asl_dataset():
     """ASL alphabet veri setini indir"""
@@ -48,6 +49,7 @@ def process_asl_images():
         max_num_hands=1,
         min_detection_confidence=0.7
     )
+    hand_features = HandFeatureExtractor()
     
     # El hareketi eşleştirmeleri (ASL harfleri -> bizim hareketlerimiz)
     asl_to_gesture = {
@@ -136,11 +138,9 @@ def process_asl_images():
                         results = hands.process(rgb_image)
                         
                         if results.multi_hand_landmarks:
-                            for hand_landmarks in results.multi_hand_landmarks:
+                            for hand_landmarks, handedness in detected_hands(results):
                                 # El özelliklerini çıkar
-                                features = []
-                                for landmark in hand_landmarks.landmark:
-                                    features.extend([landmark.x, landmark.y, landmark.z])
+                                features = hand_features.record(hand_landmarks, handedness)
                                 
                                 # JSON dosyası olarak kaydet
                                 timestamp = f"asl_{letter}_{i:03d}"
@@ -150,9 +150,9 @@ def process_asl_images():
                                 data = {
                                     "person": person,
                                     "gesture": gesture,
-                                    "features": features,
                                     "timestamp": timestamp,
-                                    "source": "asl_dataset"
+                                    "source": "asl_dataset",
+                                    **features
                                 }
                                 
                                 with open(filepath, 'w') as f:
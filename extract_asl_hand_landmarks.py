@@ -3,6 +3,7 @@ import cv2
 import mediapipe as mp
 import json
 from tqdm import tqdm
+from hand_features import HandFeatureExtractor, detected_hands
 
 # Klasörler
 ASL_DIR = 'asl_alphabet_train'
@@ -10,6 +11,7 @@ OUT_DIR = 'data/hands'
 
 mp_hands = mp.solutions.hands
 hands = mp_hands.Hands(static_image_mode=True, max_num_hands=1)
+hand_features = HandFeatureExtractor()
 
 os.makedirs(OUT_DIR, exist_ok=True)
 
@@ -31,15 +33,12 @@ for letter in tqdm(os.listdir(ASL_DIR)):
         img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
         results = hands.process(img_rgb)
         if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                landmarks = []
-                for lm in hand_landmarks.landmark:
-                    landmarks.extend([lm.x, lm.y, lm.z])
+            for hand_landmarks, handedness in detected_hands(results):
                 # JSON olarak kaydet
                 out_json = os.path.join(out_letter_dir, img_name.replace('.jpg', '.json').replace('.jpeg', '.json').replace('.png', '.json'))
                 with open(out_json, 'w') as f:
                     json.dump({
-                        'features': landmarks,
+                        **hand_features.record(hand_landmarks, handedness),
                         'gesture': letter
                     }, f)
                 break # Sadece ilk el
@@ -0,0 +1,133 @@
+import os
+import json
+import cv2
+import numpy as np
+try:
+    import face_recognition
+except ImportError:
+    face_recognition = None
+
+DEFAULT_DETECTOR_CONFIG = {
+    "backend": "hog",
+    "hog": {"upsample": 1},
+    "haar": {"scale_factor": 1.1, "min_neighbors": 5, "min_size": 20},
+    "dnn": {
+        # Caffe SSD (deploy.prototxt + .caffemodel) ya da ONNX (YuNet) dosyası
+        "model": "models/res10_300x300_ssd_iter_140000.caffemodel",
+        "config": "models/deploy.prototxt",
+        "confidence": 0.6,
+        "input_size": 300,
+    },
+}
+
+
+class HogFaceDetector:
+    """dlib HOG yüz dedektörü (face_recognition.face_locations)"""
+
+    name = "hog"
+
+    def __init__(self, upsample=1):
+        if face_recognition is None:
+            raise ImportError("HOG dedektörü için face_recognition kurulu olmalı")
+        self.upsample = upsample
+
+    def detect(self, rgb_image):
+        """RGB görüntüdeki yüzleri (top, right, bottom, left) listesi olarak döndür"""
+        return face_recognition.face_locations(rgb_image, self.upsample, model="hog")
+
+
+class HaarFaceDetector:
+    """OpenCV Haar cascade yüz dedektörü"""
+
+    name = "haar"
+    # Gri girdi verilirse renk dönüşümü atlanır
+    input_format = "gray"
+
+    def __init__(self, scale_factor=1.1, min_neighbors=5, min_size=20,
+                 cascade_path=None):
+        cascade_path = cascade_path or cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        if self.cascade.empty():
+            raise IOError(f"Haar cascade yüklenemedi: {cascade_path}")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = (min_size, min_size)
+
+    def detect(self, rgb_image):
+        gray = rgb_image if rgb_image.ndim == 2 else cv2.cvtColor(rgb_image, cv2.COLOR_RGB2GRAY)
+        faces = self.cascade.detectMultiScale(gray, self.scale_factor, self.min_neighbors,
+                                              minSize=self.min_size)
+        return [(int(y), int(x + w), int(y + h), int(x)) for (x, y, w, h) in faces]
+
+
+class DnnFaceDetector:
+    """cv2.dnn ile yerel model dosyasından çalışan yüz dedektörü.
+
+    .caffemodel dosyaları (res10 SSD) cv2.dnn ağı olarak, .onnx dosyaları
+    (YuNet) cv2.FaceDetectorYN ile yüklenir.
+    """
+
+    name = "dnn"
+
+    def __init__(self, model, config=None, confidence=0.6, input_size=300):
+        if not os.path.exists(model):
+            raise IOError(f"DNN yüz modeli bulunamadı: {model}")
+        self.confidence = confidence
+        self.input_size = input_size
+        self.yunet = None
+        self.net = None
+        if model.lower().endswith('.onnx'):
+            self.yunet = cv2.FaceDetectorYN.create(model, "", (input_size, input_size), confidence)
+        else:
+            self.net = cv2.dnn.readNetFromCaffe(config, model)
+
+    def detect(self, rgb_image):
+        height, width = rgb_image.shape[:2]
+        if self.yunet is not None:
+            bgr = cv2.cvtColor(rgb_image, cv2.COLOR_RGB2BGR)
+            self.yunet.setInputSize((width, height))
+            _, faces = self.yunet.detect(bgr)
+            if faces is None:
+                return []
+            # YuNet (x, y, w, h) döndürür; kenardaki yüzlerde kutu kare dışına taşabilir
+            boxes = np.column_stack([faces[:, 0], faces[:, 1], faces[:, 0] + faces[:, 2], faces[:, 1] + faces[:, 3]])
+        else:
+            # SSD girişi BGR ortalaması çıkarılmış 300x300 görüntü bekler
+            blob = cv2.dnn.blobFromImage(rgb_image, 1.0, (self.input_size, self.input_size),
+                                         (104.0, 177.0, 123.0), swapRB=True)
+            self.net.setInput(blob)
+            detections = self.net.forward()[0, 0]
+            detections = detections[detections[:, 2] >= self.confidence]
+            boxes = detections[:, 3:7] * np.array([width, height, width, height])
+        # Kutular iki modelde de kareye kırpılır (Haar/HOG gibi hep kare içinde kalır)
+        locations = []
+        for x1, y1, x2, y2 in boxes:
+            x1, y1 = max(0, int(x1)), max(0, int(y1))
+            x2, y2 = min(width, int(x2)), min(height, int(y2))
+            if x2 > x1 and y2 > y1:
+                locations.append((y1, x2, y2, x1))
+        return locations
+
+
+DETECTOR_TYPES = {cls.name: cls for cls in (HogFaceDetector, HaarFaceDetector, DnnFaceDetector)}
+
+
+def load_detector_config(path="face_detector.json"):
+    """Dedektör ayarlarını oku; dosya yoksa varsayılanları kullan"""
+    config = json.loads(json.dumps(DEFAULT_DETECTOR_CONFIG))
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            user_config = json.load(f)
+        config["backend"] = user_config.get("backend", config["backend"])
+        for name in DETECTOR_TYPES:
+            config[name].update(user_config.get(name, {}))
+    return config
+
+
+def create_face_detector(config=None, backend=None):
+    """Ayarlara göre yüz dedektörü oluştur"""
+    config = config or load_detector_config()
+    backend = backend or config["backend"]
+    if backend not in DETECTOR_TYPES:
+        raise ValueError(f"Bilinmeyen yüz dedektörü: {backend}")
+    return DETECTOR_TYPES[backend](**config.get(backend, {}))
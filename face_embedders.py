@@ -0,0 +1,143 @@
+import os
+import json
+import cv2
+import numpy as np
+try:
+    import face_recognition
+except ImportError:
+    face_recognition = None
+
+DEFAULT_EMBEDDER_CONFIG = {
+    "backend": "dlib",
+    "dlib": {"num_jitters": 1},
+    "sface": {
+        # OpenCV Zoo SFace tanıma modeli ve hizalama için YuNet dedektörü
+        "model": "models/face_recognition_sface_2021dec.onnx",
+        "detector_model": "models/face_detection_yunet_2023mar.onnx",
+    },
+}
+
+
+class DlibFaceEmbedder:
+    """dlib ResNet yüz encoding'i (face_recognition.face_encodings), 128 boyut"""
+
+    name = "dlib"
+    dim = 128
+    tolerance = 0.6
+
+    def __init__(self, num_jitters=1):
+        if face_recognition is None:
+            raise ImportError("dlib embedding için face_recognition kurulu olmalı")
+        self.num_jitters = num_jitters
+
+    def embed(self, rgb_image, locations):
+        """Verilen (top, right, bottom, left) kutularındaki yüzlerin encoding'leri"""
+        if not locations:
+            return []
+        return face_recognition.face_encodings(rgb_image, list(locations), self.num_jitters)
+
+    def encode_file(self, image_path):
+        """Fotoğraftaki ilk yüzün encoding'i (yüz yoksa None)"""
+        image = face_recognition.load_image_file(image_path)
+        encodings = face_recognition.face_encodings(image, None, self.num_jitters)
+        if encodings:
+            return encodings[0]
+        return None
+
+
+class SFaceEmbedder:
+    """OpenCV FaceRecognizerSF (SFace ONNX) yüz encoding'i, 128 boyut.
+
+    Encoding'ler L2 normalize edilir; SFace'in 0.363 kosinüs benzerliği
+    eşiği öklid mesafesinde sqrt(2 - 2 * 0.363) ≈ 1.128'e karşılık gelir.
+    detector_model (YuNet) varsa yüz 5 noktadan hizalanır, yoksa kutu
+    doğrudan 112x112'ye ölçeklenir.
+    """
+
+    name = "sface"
+    dim = 128
+    tolerance = 1.128
+
+    def __init__(self, model, detector_model=None):
+        if not os.path.exists(model):
+            raise IOError(f"SFace modeli bulunamadı: {model}")
+        self.recognizer = cv2.FaceRecognizerSF.create(model, "")
+        self.detector = None
+        if detector_model and os.path.exists(detector_model):
+            self.detector = cv2.FaceDetectorYN.create(detector_model, "", (320, 320), 0.6)
+
+    def _aligned_crop(self, bgr_image, location):
+        """Tek bir yüzü SFace'in beklediği 112x112 hizalı kesite çevir"""
+        top, right, bottom, left = location
+        if self.detector is not None:
+            # Kutunun biraz genişletilmiş çevresinde yer işaretlerini bul
+            pad = (bottom - top) // 2
+            y0, x0 = max(0, top - pad), max(0, left - pad)
+            region = bgr_image[y0:bottom + pad, x0:right + pad]
+            if region.size:
+                self.detector.setInputSize((region.shape[1], region.shape[0]))
+                _, faces = self.detector.detect(region)
+                if faces is not None:
+                    # YuNet satırı: x, y, w, h, 5 yer işaretinin (x, y)'si, skor;
+                    # genişlik ve yükseklik kaydırılmaz
+                    face = faces[0].copy()
+                    face[[0, 4, 6, 8, 10, 12]] += x0
+                    face[[1, 5, 7, 9, 11, 13]] += y0
+                    return self.recognizer.alignCrop(bgr_image, face)
+        crop = bgr_image[max(0, top):bottom, max(0, left):right]
+        if crop.size == 0:
+            return None
+        return cv2.resize(crop, (112, 112))
+
+    def embed(self, rgb_image, locations):
+        bgr = cv2.cvtColor(rgb_image, cv2.COLOR_RGB2BGR)
+        encodings = []
+        for location in locations:
+            aligned = self._aligned_crop(bgr, location)
+            if aligned is None:
+                # Birim küreden çok uzak bir vektör hiçbir kişiyle eşleşmez
+                encodings.append(np.full(self.dim, 10.0, dtype=np.float32))
+                continue
+            feature = self.recognizer.feature(aligned).reshape(-1).astype(np.float32)
+            encodings.append(feature / (np.linalg.norm(feature) + 1e-12))
+        return encodings
+
+    def encode_file(self, image_path):
+        bgr = cv2.imread(image_path)
+        if bgr is None:
+            raise IOError(f"Fotoğraf okunamadı: {image_path}")
+        if self.detector is not None:
+            self.detector.setInputSize((bgr.shape[1], bgr.shape[0]))
+            _, faces = self.detector.detect(bgr)
+            if faces is None:
+                return None
+            feature = self.recognizer.feature(self.recognizer.alignCrop(bgr, faces[0]))
+        else:
+            # Dedektör yoksa kayıt fotoğrafının yüz kesiti olduğu varsayılır
+            feature = self.recognizer.feature(cv2.resize(bgr, (112, 112)))
+        feature = feature.reshape(-1).astype(np.float32)
+        return feature / (np.linalg.norm(feature) + 1e-12)
+
+
+EMBEDDER_TYPES = {cls.name: cls for cls in (DlibFaceEmbedder, SFaceEmbedder)}
+
+
+def load_embedder_config(path="face_embedder.json"):
+    """Embedding ayarlarını oku; dosya yoksa varsayılanları kullan"""
+    config = json.loads(json.dumps(DEFAULT_EMBEDDER_CONFIG))
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            user_config = json.load(f)
+        config["backend"] = user_config.get("backend", config["backend"])
+        for name in EMBEDDER_TYPES:
+            config[name].update(user_config.get(name, {}))
+    return config
+
+
+def create_face_embedder(config=None, backend=None):
+    """Ayarlara göre yüz embedding arka ucunu oluştur"""
+    config = config or load_embedder_config()
+    backend = backend or config["backend"]
+    if backend not in EMBEDDER_TYPES:
+        raise ValueError(f"Bilinmeyen yüz embedding arka ucu: {backend}")
+    return EMBEDDER_TYPES[backend](**config.get(backend, {}))
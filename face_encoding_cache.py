@@ -0,0 +1,197 @@
+import os
+import json
+import hashlib
+import time
+import numpy as np
+
+
+def serial_encoder(image_paths, encode_fn):
+    """Dosyaları tek çekirdekte sırayla encode et, (yol, encoding, hata) üret"""
+    for image_path in image_paths:
+        try:
+            yield image_path, encode_fn(image_path), None
+        except Exception as e:
+            yield image_path, None, str(e)
+
+
+def file_sha1(path, chunk_size=1 << 20):
+    """Dosya içeriğinin SHA1 özetini hesapla"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FaceEncodingCache:
+    """Yüz encoding'lerini diskte tutan artımlı önbellek.
+
+    Encoding'ler tek bir float32 matris (.npy) olarak, hangi satırın hangi
+    dosyaya ait olduğu ise manifest (.json) içinde saklanır. Manifest her dosya
+    için yol, boyut, değiştirilme zamanı ve içerik özetini tutar; böylece
+    sadece yeni veya değişen fotoğraflar yeniden encode edilir.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_dir="models", backend="dlib", name=None, prefix="face_encodings"):
+        # Her embedding arka ucunun kendi önbelleği olur, encoding'ler karışmaz.
+        # sync() istenmeyen kayıtları sildiği için farklı fotoğraf kümeleri
+        # eşleyen uygulamalar ayrı prefix kullanmalıdır
+        self.backend = backend
+        if name is None:
+            name = prefix if backend == "dlib" else f"{prefix}_{backend}"
+        self.cache_dir = cache_dir
+        self.matrix_path = os.path.join(cache_dir, f"{name}.npy")
+        self.manifest_path = os.path.join(cache_dir, f"{name}_manifest.json")
+
+    def _load(self):
+        """Manifest ve encoding matrisini oku (bozuksa boş döndür)"""
+        if not (os.path.exists(self.manifest_path) and os.path.exists(self.matrix_path)):
+            return {}, None
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") != self.VERSION or manifest.get("backend", "dlib") != self.backend:
+                return {}, None
+            matrix = np.load(self.matrix_path, mmap_mode='r')
+            return manifest.get("entries", {}), matrix
+        except (OSError, ValueError) as e:
+            print(f"UYARI: Yüz önbelleği okunamadı, yeniden oluşturulacak. Hata: {e}")
+            return {}, None
+
+    def _save(self, entries, matrix):
+        """Manifest ve matrisi atomik olarak yaz"""
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        tmp_matrix = self.matrix_path + ".tmp.npy"
+        tmp_manifest = self.manifest_path + ".tmp"
+        np.save(tmp_matrix, matrix)
+        with open(tmp_manifest, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.VERSION, "backend": self.backend, "entries": entries}, f,
+                      ensure_ascii=False)
+        os.replace(tmp_matrix, self.matrix_path)
+        os.replace(tmp_manifest, self.manifest_path)
+
+    def sync(self, items, encode_fn=None, encoder=None, on_encodings=None):
+        """Önbelleği verilen (fotoğraf yolu, etiket) listesiyle eşitle.
+
+        Değişmeyen dosyalar önbellekten okunur, yeni/değişen dosyalar
+        encode edilir, listede olmayan dosyalar atılır. encoder verilirse
+        (örn. ParallelFaceEncoder) dosya yollarını alıp (yol, encoding, hata)
+        üçlülerini bittikçe üreten bir çağrılabilir olmalıdır; verilmezse
+        encode_fn (örn. embedder.encode_file) ile sırayla encode edilir. on_encodings(encodings, labels)
+        önce önbellekteki yüzlerle, sonra her yeni yüzle çağrılır.
+        (encodings, labels) döndürür; encodings (N, 128) float32 matristir.
+        """
+        old_entries, old_matrix = self._load()
+        slots = []      # (anahtar, etiket, stat, önbellek kaydı veya None)
+        changed = False
+
+        for image_path, label in items:
+            key = os.path.normpath(image_path)
+            try:
+                stat = os.stat(key)
+            except OSError as e:
+                print(f"HATA: {image_path} okunamadı. Hata: {e}")
+                continue
+
+            entry = old_entries.get(key)
+            if entry is not None:
+                if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+                    pass
+                elif entry["size"] == stat.st_size and entry["sha1"] == file_sha1(key):
+                    # Sadece zaman damgası değişmiş, içerik aynı
+                    changed = True
+                else:
+                    entry = None
+            slots.append((key, label, stat, entry))
+
+        cached = [(slot[3]["row"], slot[1]) for slot in slots if slot[3] is not None and slot[3]["row"] is not None]
+        if on_encodings is not None and cached:
+            on_encodings(old_matrix[[row for row, _ in cached]], [label for _, label in cached])
+
+        # Yeni/değişen dosyaları encode et, sonuçlar bittikçe gelir
+        pending = {slot[0]: slot[1] for slot in slots if slot[3] is None}
+        results = {}
+        if pending:
+            if encoder is None:
+                encoder = lambda paths: serial_encoder(paths, encode_fn)
+            total = len(pending)
+            start = time.time()
+            for done, (key, encoding, error) in enumerate(encoder(list(pending)), 1):
+                label = pending[key]
+                if error is not None:
+                    print(f"[{done}/{total}] HATA: {key} yüklenemedi. Hata: {error}")
+                    continue
+                results[key] = encoding
+                if encoding is None:
+                    print(f"[{done}/{total}] UYARI: {os.path.basename(key)} içinde yüz bulunamadı.")
+                else:
+                    print(f"[{done}/{total}] Yüz yüklendi: {label} - {os.path.basename(key)}")
+                    if on_encodings is not None:
+                        on_encodings(np.asarray(encoding, dtype=np.float32)[None, :], [label])
+            elapsed = time.time() - start
+            print(f"{total} fotoğraf {elapsed:.1f} sn'de encode edildi ({total / max(elapsed, 1e-6):.1f} fotoğraf/sn)")
+
+        entries = {}
+        old_rows = []   # (hedef satır, eski satır)
+        new_rows = []   # (hedef satır, encoding)
+        labels = []
+        for key, label, stat, entry in slots:
+            if entry is not None:
+                old_row = entry["row"]
+                sha1 = entry["sha1"]
+                if entry["label"] != label:
+                    changed = True
+                encoding = None
+            elif key in results:
+                old_row = None
+                sha1 = file_sha1(key)
+                encoding = results[key]
+                changed = True
+            else:
+                # Encode edilemedi, bir sonraki açılışta tekrar denenecek
+                continue
+
+            row = None
+            if old_row is not None:
+                row = len(labels)
+                if row != old_row:
+                    changed = True
+                old_rows.append((row, old_row))
+                labels.append(label)
+            elif encoding is not None:
+                row = len(labels)
+                new_rows.append((row, encoding))
+                labels.append(label)
+            entries[key] = {
+                "label": label,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "sha1": sha1,
+                "row": row,
+            }
+
+        dropped = len(set(old_entries) - set(entries))
+        if dropped:
+            changed = True
+
+        dim = old_matrix.shape[1] if old_matrix is not None and old_matrix.ndim == 2 else 128
+        if new_rows:
+            dim = len(new_rows[0][1])
+        matrix = np.empty((len(labels), dim), dtype=np.float32)
+        if old_rows:
+            targets, sources = zip(*old_rows)
+            matrix[list(targets)] = old_matrix[list(sources)]
+        for row, encoding in new_rows:
+            matrix[row] = encoding
+
+        if changed or old_matrix is None:
+            # Windows'ta eşlenmiş dosyanın üzerine yazılamaz, önce bırak
+            old_matrix = None
+            self._save(entries, matrix)
+
+        reused = len(slots) - len(pending)
+        print(f"Yüz önbelleği: {reused} önbellekten, {len(results)} yeni encode edildi, {dropped} silindi")
+        return matrix, labels
@@ -0,0 +1,79 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from face_encoding_cache import serial_encoder
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+# İşçi başına BLAS / OpenMP thread sayısı bu değişkenlerle sınırlanır
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+# İşçi sürecinde bir kez yüklenen encode fonksiyonu (model dahil)
+_worker_encode = None
+
+
+def _init_worker(embedder_config):
+    """Her işçi süreci kendi embedding modelini bir kez yükler"""
+    global _worker_encode
+    # fork ile ebeveynden gelen, zaten yüklenmiş BLAS havuzları da tek thread'e
+    # indirilir (ortam değişkenleri onlar için geç kalır)
+    if threadpool_limits is not None:
+        threadpool_limits(1)
+    from face_embedders import create_face_embedder
+    _worker_encode = create_face_embedder(embedder_config).encode_file
+
+
+def _encode_job(image_path):
+    """İşçide tek bir fotoğrafı encode et; hatalar sonuçla birlikte döner"""
+    try:
+        return image_path, _worker_encode(image_path), None
+    except Exception as e:
+        return image_path, None, str(e)
+
+
+class ParallelFaceEncoder:
+    """Yüz fotoğraflarını ProcessPoolExecutor ile paralel encode eder.
+
+    FaceEncodingCache.sync'e encoder olarak verilir; sonuçlar bittikçe
+    (yol, encoding, hata) olarak döner. Az sayıda dosyada havuz kurma
+    maliyetine girmemek için sırayla encode edilir.
+    """
+
+    def __init__(self, embedder_config, encode_fn, max_workers=None, min_parallel=8):
+        # İşçiler embedder_config'ten kendi modellerini kurar; encode_fn ana
+        # süreçteki aynı arka ucun encode fonksiyonudur (sıralı yol için)
+        self.embedder_config = embedder_config
+        self.encode_fn = encode_fn
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_parallel = min_parallel
+
+    def __call__(self, image_paths):
+        workers = min(self.max_workers, len(image_paths))
+        if workers <= 1 or len(image_paths) < self.min_parallel:
+            yield from serial_encoder(image_paths, self.encode_fn)
+            return
+
+        print(f"{len(image_paths)} fotoğraf {workers} işçiyle encode ediliyor...")
+        # Her işçi tek çekirdek kullansın, çekirdekler arası taşma olmasın. Değişkenler
+        # işçiler başlamadan ebeveynde ayarlanır ve işçiler kurulduktan sonra geri alınır
+        saved = {var: os.environ.get(var) for var in THREAD_ENV_VARS}
+        os.environ.update({var: "1" for var in THREAD_ENV_VARS})
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(self.embedder_config,))
+            # İşçi süreçleri submit sırasında başlatılır
+            futures = {executor.submit(_encode_job, path): path for path in image_paths}
+        finally:
+            for var, value in saved.items():
+                if value is None:
+                    os.environ.pop(var, None)
+                else:
+                    os.environ[var] = value
+        with executor:
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    # İşçi süreci çökerse (örn. bellek) dosya hatalı sayılır
+                    yield futures[future], None, str(e)
@@ -0,0 +1,185 @@
+import threading
+import numpy as np
+from collections import namedtuple
+from face_index import load_or_build_index
+
+# Bir yüz için eşleşme sonucu: en yakın kişi, mesafesi ve ikinci en yakın
+# kişiye göre fark (margin). Tolerans aşılırsa name "Bilinmeyen" olur.
+FaceMatch = namedtuple("FaceMatch", ["name", "distance", "margin"])
+
+UNKNOWN_NAME = "Bilinmeyen"
+
+
+class FaceGallery:
+    """Bilinen yüz encoding'lerini tek bir float32 matriste tutan galeri.
+
+    Satırlar kişiye göre gruplanmış olarak saklanır; bir karedeki tüm yüzlerin
+    tüm galeriye olan mesafeleri tek bir matris çarpımıyla hesaplanır ve her
+    yüz için ilk eşleşen değil, en yakın kişi döndürülür.
+    """
+
+    def __init__(self, encodings=None, labels=None, tolerance=0.6, index_method="auto",
+                 index_path=None, search_k=32, backend="dlib"):
+        self.tolerance = tolerance
+        # Galeriyi üreten embedding arka ucu; farklı arka uç encoding'leri karıştırılmaz
+        self.backend = backend
+        # Büyük galerilerde yaklaşık en yakın komşu indeksi kullanılır
+        self.index_method = index_method
+        self.index_path = index_path
+        self.search_k = search_k
+        self._lock = threading.Lock()
+        self._pending = []
+        self.set(encodings if encodings is not None else [], labels or [])
+
+    def _check_backend(self, backend):
+        if backend is not None and backend != self.backend:
+            raise ValueError(f"Galeri '{self.backend}' encoding'leri içeriyor, '{backend}' verildi")
+
+    def set(self, encodings, labels, backend=None):
+        """Galeriyi verilen encoding ve etiketlerle yeniden kur"""
+        self._check_backend(backend)
+        labels = list(labels)
+        encodings = np.asarray(encodings, dtype=np.float32)
+        if len(labels) == 0:
+            encodings = encodings.reshape(0, encodings.shape[-1] if encodings.ndim == 2 else 128)
+        if len(encodings) != len(labels):
+            raise ValueError("Encoding ve etiket sayıları eşleşmiyor")
+
+        # Aynı kişinin satırlarını yan yana diz (kişi bazında min için)
+        self.names, label_ids = np.unique(np.asarray(labels, dtype=object), return_inverse=True)
+        order = np.argsort(label_ids, kind='stable')
+        self.encodings = np.ascontiguousarray(encodings[order])
+        self.labels = np.asarray(labels, dtype=object)[order]
+        self.label_ids = label_ids[order]
+        self.label_starts = np.flatnonzero(np.r_[True, np.diff(self.label_ids) != 0]) if len(labels) else np.empty(0, dtype=np.intp)
+        self.sq_norms = np.einsum('ij,ij->i', self.encodings, self.encodings)
+        # İndeks ilk sorguda kurulur; akıtılan her parti için k-means tekrarlanmaz
+        self._index = None
+        self._pending = []
+
+    @property
+    def index(self):
+        """Galerinin arama indeksi (gerekirse bekleyen eklemeler işlenip kurulur)"""
+        self._flush()
+        if self._index is None and len(self.labels):
+            self._index = load_or_build_index(self.encodings, self.index_method, self.index_path)
+        return self._index
+
+    def add(self, encodings, labels, backend=None):
+        """Galeriye yeni yüzler ekle (kayıt sürerken sonuçları akıtmak için).
+
+        Eklemeler biriktirilir ve matris bir sonraki sorguda tek seferde
+        yeniden kurulur.
+        """
+        self._check_backend(backend)
+        labels = list(labels)
+        if not labels:
+            return
+        encodings = np.asarray(encodings, dtype=np.float32).reshape(len(labels), -1)
+        with self._lock:
+            self._pending.append((encodings, labels))
+
+    def _flush(self):
+        """Biriken eklemeleri matrise işle"""
+        if not self._pending:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                # Başka bir thread aynı anda işledi
+                return
+            blocks = [self.encodings] + [block for block, _ in pending]
+            labels = list(self.labels) + [label for _, block_labels in pending for label in block_labels]
+            self.set(np.concatenate(blocks), labels)
+
+    def __getstate__(self):
+        # Süreçlere (spawn) bekleyen eklemeler işlenmiş matris gider; kilit ve
+        # indeks her süreçte yeniden kurulur
+        self._flush()
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_index"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        self._flush()
+        return len(self.labels)
+
+    def distances(self, face_encodings):
+        """(M, D) sorgu encoding'lerinin (M, N) galeri mesafelerini döndür"""
+        self._flush()
+        queries = np.asarray(face_encodings, dtype=np.float32).reshape(-1, self.encodings.shape[1])
+        q_norms = np.einsum('ij,ij->i', queries, queries)
+        sq = q_norms[:, None] + self.sq_norms[None, :] - 2.0 * (queries @ self.encodings.T)
+        np.maximum(sq, 0.0, out=sq)
+        return np.sqrt(sq, out=sq)
+
+    def _match_exact(self, face_encodings):
+        """Tüm galeriye tam mesafeyle kişi bazında en yakın ve ikinciyi bul"""
+        # Kişi başına en küçük mesafe: (M, kişi sayısı)
+        per_person = np.minimum.reduceat(self.distances(face_encodings), self.label_starts, axis=1)
+        rows = np.arange(len(per_person))
+        best = np.argmin(per_person, axis=1)
+        best_dist = per_person[rows, best]
+        if per_person.shape[1] > 1:
+            per_person[rows, best] = np.inf
+            margins = per_person.min(axis=1) - best_dist
+        else:
+            margins = np.full(len(per_person), np.inf)
+        return best, best_dist, margins
+
+    def _nearest_other(self, query, person):
+        """Sorgunun person dışındaki kişilere tam en küçük mesafesi"""
+        start = self.label_starts[person]
+        end = self.label_starts[person + 1] if person + 1 < len(self.label_starts) else len(self.labels)
+        others = np.r_[0:start, end:len(self.labels)]
+        if len(others) == 0:
+            return np.inf
+        query = np.asarray(query, dtype=np.float32)
+        sq = self.sq_norms[others] - 2.0 * (self.encodings[others] @ query) + float(query @ query)
+        return float(np.sqrt(max(float(sq.min()), 0.0)))
+
+    def _match_indexed(self, face_encodings):
+        """İndeksten gelen k aday üzerinden en yakın ve ikinci kişiyi bul.
+
+        Adayların hepsi aynı kişiyse ikinci kişiye mesafe, o kişinin dışındaki
+        satırlara tam olarak hesaplanır (margin olduğundan küçük görünmesin).
+        """
+        face_encodings = np.asarray(face_encodings, dtype=np.float32).reshape(-1, self.encodings.shape[1])
+        distances, indices = self.index.search(face_encodings, self.search_k)
+        best = np.zeros(len(distances), dtype=np.intp)
+        best_dist = np.full(len(distances), np.inf)
+        margins = np.zeros(len(distances))
+        for qi, (dist, idx) in enumerate(zip(distances, indices)):
+            valid = idx >= 0
+            if not valid.any():
+                continue
+            dist, people = dist[valid], self.label_ids[idx[valid]]
+            best[qi], best_dist[qi] = people[0], dist[0]
+            others = np.flatnonzero(people != people[0])
+            second = dist[others[0]] if len(others) else self._nearest_other(face_encodings[qi], people[0])
+            margins[qi] = second - dist[0]
+        return best, best_dist, margins
+
+    def match(self, face_encodings, backend=None):
+        """Her sorgu yüzü için en yakın kişiyi FaceMatch olarak döndür"""
+        self._check_backend(backend)
+        if len(face_encodings) == 0:
+            return []
+        if len(self) == 0:
+            return [FaceMatch(UNKNOWN_NAME, float('inf'), 0.0) for _ in face_encodings]
+
+        if self.index.kind == "brute":
+            best, best_dist, margins = self._match_exact(face_encodings)
+        else:
+            best, best_dist, margins = self._match_indexed(face_encodings)
+
+        results = []
+        for person, dist, margin in zip(best, best_dist, margins):
+            name = self.names[person] if dist <= self.tolerance else UNKNOWN_NAME
+            results.append(FaceMatch(name, float(dist), float(margin)))
+        return results
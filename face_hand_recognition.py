@@ -3,7 +3,6 @@ import face_recognition
 import mediapipe as mp
 import numpy as np
 import os
-import json
 import pickle
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
@@ -12,6 +11,19 @@ import time
 import threading
 from datetime import datetime
 import pandas as pd
+from face_encoding_cache import FaceEncodingCache
+from face_gallery import FaceGallery
+from face_embedders import create_face_embedder, load_embedder_config
+from face_enrollment import ParallelFaceEncoder
+from detection_scale import DetectionScaleController
+from face_roi import FaceSearchRegion
+from compiled_forest import CompiledForest
+from gesture_classifiers import (load_gesture_classifier, load_hand_dataset, save_selected_classifier,
+                                 selected_classifier_name, train_gesture_classifier)
+from hand_features import FEATURE_VERSION, HandFeatureExtractor, detected_hands
+from frame_context import FrameBufferPool, FrameContext
+from face_detectors import create_face_detector, load_detector_config
+from frame_capture import LatestFrameCapture
 
 class FaceHandRecognition:
     def __init__(self):
@@ -31,13 +43,26 @@ class FaceHandRecognition:
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
         # Yüz tanıma değişkenleri
-        self.known_face_encodings = []
-        self.known_face_names = []
+        # Yüz embedding arka ucu face_embedder.json'daki "backend" ayarıyla seçilir
+        self.embedder_config = load_embedder_config()
+        self.face_embedder = create_face_embedder(self.embedder_config)
+        backend = self.face_embedder.name
+        self.face_gallery = FaceGallery(tolerance=self.face_embedder.tolerance, backend=backend,
+                                        index_path=os.path.join(self.models_dir, f'face_index_{backend}.npz'))
+        self.last_face_matches = []
         self.face_recognition_model = None
+        self.face_cache = FaceEncodingCache(self.models_dir, backend=backend)
+        self.enrollment_workers = None  # None: tüm çekirdekler
+        self.face_detector = create_face_detector(load_detector_config())
+        self.scale_controller = DetectionScaleController(budget_ms=40.0)
+        self.frame_buffers = FrameBufferPool()
+        self.face_search = FaceSearchRegion(expand=0.75, full_sweep_interval=15)
         
         # El hareketi tanıma değişkenleri
         self.hand_gesture_model = None
         self.scaler = StandardScaler()
+        self.hand_classifier = None  # Tahmin için dizilere çevrilmiş orman
+        self.hand_features = HandFeatureExtractor()
         
         # Sistem durumu
         self.current_person = None
@@ -59,25 +84,23 @@ class FaceHandRecognition:
             print(f"HATA: Yüz veri klasörü bulunamadı: {self.face_data_dir}")
             return
         
+        items = []
         for person_name in os.listdir(self.face_data_dir):
             person_dir = os.path.join(self.face_data_dir, person_name)
             if os.path.isdir(person_dir):
                 for filename in os.listdir(person_dir):
                     if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                        image_path = os.path.join(person_dir, filename)
-                        try:
-                            face_image = face_recognition.load_image_file(image_path)
-                            face_encodings = face_recognition.face_encodings(face_image)
-                            if face_encodings:
-                                self.known_face_encodings.append(face_encodings[0])
-                                self.known_face_names.append(person_name)
-                                print(f"Yüz yüklendi: {person_name} - {filename}")
-                            else:
-                                print(f"UYARI: {filename} içinde yüz bulunamadı.")
-                        except Exception as e:
-                            print(f"HATA: {image_path} yüklenemedi. Hata: {e}")
+                        items.append((os.path.join(person_dir, filename), person_name))
+        
+        # Önbellekte olan ve değişmeyen fotoğraflar yeniden encode edilmez
+        encoder = ParallelFaceEncoder(self.embedder_config, self.face_embedder.encode_file,
+                                      max_workers=self.enrollment_workers)
+        # Önbellekteki yüzler hemen, yeni encode edilenler bittikçe galeriye akar;
+        # galeri bir sonraki sorguda tek seferde yeniden kurulur
+        self.face_gallery.set([], [], backend=self.face_cache.backend)
+        self.face_cache.sync(items, encoder=encoder, on_encodings=self.face_gallery.add)
         
-        print(f"Toplam {len(self.known_face_names)} yüz yüklendi")
+        print(f"Toplam {len(self.face_gallery)} yüz yüklendi")
     
     def load_hand_data(self):
         """El hareketi verilerini yükle"""
@@ -87,32 +110,31 @@ class FaceHandRecognition:
             print("UYARI: El hareketi veri klasörü boş veya yok. Model eğitilemiyor.")
             return None, None
 
-        features = []
-        labels = []
-        for letter in os.listdir(self.hand_data_dir):
-            letter_dir = os.path.join(self.hand_data_dir, letter)
-            if os.path.isdir(letter_dir):
-                for filename in os.listdir(letter_dir):
-                    if filename.endswith('.json'):
-                        file_path = os.path.join(letter_dir, filename)
-                        with open(file_path, 'r') as f:
-                            data = json.load(f)
-                            if 'features' in data:
-                                features.append(data['features'])
-                                labels.append(data['gesture'])
-                            else:
-                                print(f"UYARI: {filename} dosyasında 'features' anahtarı bulunamadı.")
-
-        if not features:
+        # Özellikler her örnekte eğitim sürümüyle yeniden hesaplanır
+        features, labels, mirror_handedness = load_hand_dataset(self.hand_data_dir, FEATURE_VERSION)
+        if len(features) == 0:
             print("UYARI: Yüklenecek el hareketi verisi bulunamadı.")
             return None, None
 
+        # gesture_leaderboard.py ile orman dışında bir model seçildiyse o eğitilir
+        classifier_name = selected_classifier_name(self.models_dir)
+        if classifier_name != CompiledForest.name:
+            self.hand_classifier = train_gesture_classifier(classifier_name, features, labels, FEATURE_VERSION,
+                                                            mirror_handedness)
+            save_selected_classifier(self.hand_classifier, self.models_dir)
+            self.hand_features = HandFeatureExtractor(FEATURE_VERSION, mirror_handedness)
+            print(f"El hareketi modeli ({classifier_name}) eğitildi: {len(features)} örnek")
+            return None, None
+
         self.scaler.fit(features)
         X = self.scaler.transform(features)
         y = np.array(labels)
 
         self.hand_gesture_model = RandomForestClassifier(n_estimators=100, random_state=42)
         self.hand_gesture_model.fit(X, y)
+        # Tahminde aynı dönüşüm kullanılsın diye sürüm modelle birlikte saklanır
+        self.hand_gesture_model.feature_version_ = FEATURE_VERSION
+        self.hand_gesture_model.mirror_handedness_ = mirror_handedness
 
         print(f"El hareketi modeli eğitildi: {len(features)} örnek")
 
@@ -124,19 +146,22 @@ class FaceHandRecognition:
             pickle.dump(self.hand_gesture_model, f)
         with open(scaler_path, 'wb') as f:
             pickle.dump(self.scaler, f)
+        # Ana sistem tahmini sklearn'süz bu dosyadan yapar
+        self.hand_classifier = CompiledForest.from_sklearn(self.hand_gesture_model, self.scaler)
+        self.hand_classifier.save(os.path.join(self.models_dir, 'hand_gesture_model.npz'))
+        self.hand_features = HandFeatureExtractor(FEATURE_VERSION, mirror_handedness)
     
     def load_models(self):
         """Kaydedilmiş modelleri yükle"""
         # El hareketi modelini yükle
-        model_path = os.path.join(self.models_dir, 'hand_gesture_model.pkl')
-        scaler_path = os.path.join(self.models_dir, 'hand_scaler.pkl')
-        
-        if os.path.exists(model_path) and os.path.exists(scaler_path):
-            with open(model_path, 'rb') as f:
-                self.hand_gesture_model = pickle.load(f)
-            with open(scaler_path, 'rb') as f:
-                self.scaler = pickle.load(f)
-            print("El hareketi modeli yüklendi")
+        # Seçilen sınıflandırıcı models/hand_gesture_model.json'da (yoksa orman)
+        self.hand_classifier, model, scaler = load_gesture_classifier(self.models_dir)
+        if self.hand_classifier is not None:
+            if model is not None:
+                self.hand_gesture_model, self.scaler = model, scaler
+            self.hand_features = HandFeatureExtractor(self.hand_classifier.feature_version,
+                                                      self.hand_classifier.mirror_handedness)
+            print(f"El hareketi modeli yüklendi ({self.hand_classifier.name})")
         else:
             print("El hareketi modeli bulunamadı, eğitim gerekli")
     
@@ -145,55 +170,50 @@ class FaceHandRecognition:
         self.load_face_data()
         self.load_hand_data()
     
-    def recognize_face(self, frame):
+    def recognize_face(self, frame, context=None):
         """Yüz tanıma"""
-        if not self.known_face_encodings:
+        if len(self.face_gallery) == 0:
             return None, None
+        context = context or FrameContext(frame)
         
-        # Frame'i küçült (hız için)
-        small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
-        rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+        # Frame'i küçült (hız için); ölçek yüz boyutu ve gecikme bütçesine göre seçilir
+        scale = self.scale_controller.choose(frame.shape)
+        rgb_small_frame = context.small_rgb(scale)
         
         # Yüzleri bul ve encode et
-        face_locations = face_recognition.face_locations(rgb_small_frame)
-        face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
+        start = time.perf_counter()
+        face_locations, searched_pixels = self.face_search.locate(rgb_small_frame, scale, self.face_detector.detect)
+        latency_ms = (time.perf_counter() - start) * 1000
+        face_encodings = self.face_embedder.embed(rgb_small_frame, face_locations)
         
-        face_names = []
-        for face_encoding in face_encodings:
-            matches = face_recognition.compare_faces(self.known_face_encodings, face_encoding, tolerance=0.6)
-            name = "Bilinmeyen"
-            
-            if True in matches:
-                first_match_index = matches.index(True)
-                name = self.known_face_names[first_match_index]
-            
-            face_names.append(name)
+        # Tüm yüzler tek seferde galeriyle karşılaştırılır, en yakın kişi seçilir
+        self.last_face_matches = self.face_gallery.match(face_encodings, backend=self.face_embedder.name)
+        face_names = [match.name for match in self.last_face_matches]
         
         # Koordinatları orijinal boyuta çevir
-        face_locations = [(top * 4, right * 4, bottom * 4, left * 4) for top, right, bottom, left in face_locations]
+        face_locations = [(int(top / scale), int(right / scale), int(bottom / scale), int(left / scale))
+                          for top, right, bottom, left in face_locations]
+        self.scale_controller.observe(frame.shape, [bottom - top for top, _, bottom, _ in face_locations], latency_ms,
+                                      searched_pixels)
+        self.face_search.update(face_locations)
         
         return face_locations, face_names
     
-    def recognize_hand_gesture(self, hand_landmarks):
+    def recognize_hand_gesture(self, hand_landmarks, handedness=None):
         """El hareketi tanıma"""
-        if self.hand_gesture_model is None:
+        if self.hand_classifier is None:
             return None
         
-        # El özelliklerini çıkar
-        features = []
-        for landmark in hand_landmarks.landmark:
-            features.extend([landmark.x, landmark.y, landmark.z])
+        # El özelliklerini modelin eğitildiği sürümle çıkar
+        features = self.hand_features(hand_landmarks, handedness)
         
         # Özellikleri ölçeklendir ve tahmin yap
-        features_scaled = self.scaler.transform([features])
-        prediction = self.hand_gesture_model.predict(features_scaled)[0]
-        probability = np.max(self.hand_gesture_model.predict_proba(features_scaled))
-        
-        return prediction, probability
+        return self.hand_classifier.predict_one(features)
     
     def run_recognition_system(self):
         """Ana tanıma sistemi"""
-        cap = cv2.VideoCapture(0)
+        # Kamera ayrı thread'de okunur; döngü her zaman en yeni kareyi işler
+        cap = LatestFrameCapture(0)
         
         if not cap.isOpened():
             print("Kamera açılamadı!")
@@ -214,8 +234,9 @@ class FaceHandRecognition:
             if not ret:
                 break
             
-            # Yüz tanıma
-            face_locations, face_names = self.recognize_face(frame)
+            # Yüz tanıma; küçük ve RGB kareler havuz tamponlarında bir kez hesaplanır
+            context = FrameContext(frame, self.frame_buffers)
+            face_locations, face_names = self.recognize_face(frame, context)
             # Her frame'de gerçek ve tahmin edilen yüz etiketlerini kaydet
             for (top, right, bottom, left), name in zip(face_locations, face_names):
                 # Gerçek etiket: self.current_person (kayıtlı kişi), Tahmin: name
@@ -252,13 +273,12 @@ class FaceHandRecognition:
             
             # El hareketi tanıma (sadece yüz doğrulandıktan sonra)
             if self.is_face_verified and not self.is_hand_verified:
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results_hand = self.hands.process(rgb_frame)
+                results_hand = self.hands.process(context.rgb())
                 
                 # El tespiti ve hareketi tanıma
                 if results_hand.multi_hand_landmarks:
                     debug_message = "El algılandı! "
-                    for hand_landmarks in results_hand.multi_hand_landmarks:
+                    for hand_landmarks, handedness in detected_hands(results_hand):
                         self.mp_drawing.draw_landmarks(
                             frame,
                             hand_landmarks,
@@ -267,20 +287,14 @@ class FaceHandRecognition:
                             self.mp_drawing_styles.get_default_hand_connections_style())
 
                         # El hareketi tahmini
-                        landmarks = []
-                        for lm in hand_landmarks.landmark:
-                            landmarks.extend([lm.x, lm.y, lm.z])
-                        
                         try:
-                            if self.hand_gesture_model and self.scaler:
-                                landmarks_scaled = self.scaler.transform([landmarks])
-                                prediction = self.hand_gesture_model.predict(landmarks_scaled)
-                                confidence = self.hand_gesture_model.predict_proba(landmarks_scaled).max()
+                            if self.hand_classifier is not None:
+                                prediction, confidence = self.recognize_hand_gesture(hand_landmarks, handedness)
                                 
-                                print(f"DEBUG: Tahmin: {prediction[0]}, Güven: {confidence:.2f}")
+                                print(f"DEBUG: Tahmin: {prediction}, Güven: {confidence:.2f}")
 
                                 if confidence > 0.20: # Güven eşiğini düşürdük
-                                    hand_gesture = prediction[0]
+                                    hand_gesture = prediction
                                 else:
                                     hand_gesture = "Bilinmeyen Hareket"
                             else:
@@ -327,12 +341,14 @@ class FaceHandRecognition:
                 last_debug_message = debug_message
 
             cv2.imshow('Yuz ve El Hareketi Tanitma Sistemi', frame)
+            context.release()
             
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
         
         cap.release()
         cv2.destroyAllWindows()
+        print(f"Atlanan kamera karesi: {cap.frames_dropped}/{cap.frames_captured} ({cap.drop_rate:.0%})")
         # --- Sonuçları kaydet ---
         pd.DataFrame({'y_true': y_true_face, 'y_pred': y_pred_face}).to_csv('face_recognition_test_results.csv', index=False)
         pd.DataFrame({'y_true': y_true_hand, 'y_pred': y_pred_hand}).to_csv('hand_gesture_test_results.csv', index=False)
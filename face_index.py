@@ -0,0 +1,204 @@
+import os
+import hashlib
+import numpy as np
+
+# Bu sayının altındaki galerilerde kaba kuvvet zaten hızlıdır
+ANN_MIN_GALLERY_SIZE = 20000
+
+
+def _squared_distances(queries, vectors, vector_sq_norms=None):
+    """(M, D) ve (N, D) matrisleri arasındaki kare mesafeler (M, N)"""
+    if vector_sq_norms is None:
+        vector_sq_norms = np.einsum('ij,ij->i', vectors, vectors)
+    q_norms = np.einsum('ij,ij->i', queries, queries)
+    sq = q_norms[:, None] + vector_sq_norms[None, :] - 2.0 * (queries @ vectors.T)
+    np.maximum(sq, 0.0, out=sq)
+    return sq
+
+
+def _top_k(sq, k):
+    """Her satırdaki en küçük k değerin (sıralı) indekslerini döndür"""
+    k = min(k, sq.shape[1])
+    if k < sq.shape[1]:
+        part = np.argpartition(sq, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(sq.shape[1]), sq.shape).copy()
+    order = np.argsort(np.take_along_axis(sq, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+def fingerprint(vectors):
+    """Bir indeksin hangi galeriden kurulduğunu anlamak için özet"""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    return hashlib.sha1(vectors.tobytes()).hexdigest()
+
+
+class BruteForceIndex:
+    """Tüm galeriyle tam (exact) mesafe hesabı yapan indeks"""
+
+    kind = "brute"
+
+    def __init__(self, vectors):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.sq_norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def search(self, queries, k=1):
+        """(mesafeler, indeksler) döndür, ikisi de (M, k) ve artan sıralı"""
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.vectors.shape[1])
+        sq = _squared_distances(queries, self.vectors, self.sq_norms)
+        idx = _top_k(sq, k)
+        return np.sqrt(np.take_along_axis(sq, idx, axis=1)), idx
+
+    def state(self):
+        return {}
+
+    @classmethod
+    def from_state(cls, vectors, state):
+        return cls(vectors)
+
+
+class IVFIndex:
+    """K-means kaba nicemleme ile ters dosya (IVF) yaklaşık en yakın komşu indeksi.
+
+    Galeri nlist kümeye bölünür; sorgu sadece kendisine en yakın nprobe
+    kümenin elemanlarıyla tam mesafe hesabı yapar.
+    """
+
+    kind = "ivf"
+
+    def __init__(self, vectors, nlist=None, nprobe=None, n_iter=15, seed=42,
+                 centroids=None, assignments=None):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        n = len(self.vectors)
+        self.nlist = nlist or max(1, int(4 * np.sqrt(n)))
+        self.nlist = min(self.nlist, max(n, 1))
+        self.nprobe = nprobe or max(8, self.nlist // 64)
+        if centroids is None:
+            centroids = self._kmeans(n_iter, seed)
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        if assignments is None:
+            assignments = self._assign(self.vectors)
+        self._build_lists(np.asarray(assignments, dtype=np.int32))
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def _assign(self, vectors, chunk=8192):
+        """Her vektörü en yakın merkeze ata (bellek için parça parça)"""
+        c_norms = np.einsum('ij,ij->i', self.centroids, self.centroids)
+        out = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk):
+            block = vectors[start:start + chunk]
+            out[start:start + chunk] = np.argmin(_squared_distances(block, self.centroids, c_norms), axis=1)
+        return out
+
+    def _kmeans(self, n_iter, seed):
+        """Lloyd k-means; büyük galerilerde örneklem üzerinde eğitilir"""
+        rng = np.random.default_rng(seed)
+        n = len(self.vectors)
+        sample_size = min(n, 64 * self.nlist)
+        sample = self.vectors[rng.choice(n, sample_size, replace=False)] if sample_size < n else self.vectors
+        self.centroids = sample[rng.choice(len(sample), self.nlist, replace=False)].copy()
+        for _ in range(n_iter):
+            labels = self._assign(sample)
+            counts = np.bincount(labels, minlength=self.nlist)
+            sums = np.zeros_like(self.centroids)
+            order = np.argsort(labels, kind='stable')
+            present = np.flatnonzero(counts)
+            starts = np.r_[0, np.cumsum(counts[present])[:-1]]
+            sums[present] = np.add.reduceat(sample[order], starts, axis=0)
+            empty = counts == 0
+            # Boş kalan kümelere rastgele örnek ata
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+                counts[empty] = 1
+            self.centroids = sums / counts[:, None]
+        return self.centroids
+
+    def _build_lists(self, assignments):
+        """Ters listeleri tek bir permütasyon + ofset dizisi olarak kur"""
+        self.assignments = assignments
+        self.order = np.argsort(assignments, kind='stable').astype(np.int64)
+        self.offsets = np.r_[0, np.cumsum(np.bincount(assignments, minlength=self.nlist))]
+        self.sorted_vectors = self.vectors[self.order]
+        self.sorted_sq_norms = np.einsum('ij,ij->i', self.sorted_vectors, self.sorted_vectors)
+
+    def search(self, queries, k=1, nprobe=None):
+        """(mesafeler, indeksler) döndür; aday yetmezse inf / -1 ile doldurulur"""
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.vectors.shape[1])
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        probes = _top_k(_squared_distances(queries, self.centroids), nprobe)
+
+        distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        for qi, lists in enumerate(probes):
+            spans = [np.arange(self.offsets[l], self.offsets[l + 1]) for l in lists]
+            candidates = np.concatenate(spans)
+            if len(candidates) == 0:
+                continue
+            sq = _squared_distances(queries[qi:qi + 1], self.sorted_vectors[candidates],
+                                    self.sorted_sq_norms[candidates])
+            top = _top_k(sq, k)[0]
+            distances[qi, :len(top)] = np.sqrt(sq[0, top])
+            indices[qi, :len(top)] = self.order[candidates[top]]
+        return distances, indices
+
+    def state(self):
+        return {"centroids": self.centroids, "assignments": self.assignments,
+                "nprobe": np.int64(self.nprobe)}
+
+    @classmethod
+    def from_state(cls, vectors, state):
+        return cls(vectors, nlist=len(state["centroids"]), nprobe=int(state["nprobe"]),
+                   centroids=state["centroids"], assignments=state["assignments"])
+
+
+INDEX_TYPES = {cls.kind: cls for cls in (BruteForceIndex, IVFIndex)}
+
+
+def build_index(vectors, method="auto", **kwargs):
+    """Galeri boyutuna göre (ya da istenen yönteme göre) indeks kur"""
+    if method == "auto":
+        method = "ivf" if len(vectors) >= ANN_MIN_GALLERY_SIZE else "brute"
+    if method not in INDEX_TYPES:
+        raise ValueError(f"Bilinmeyen indeks türü: {method}")
+    return INDEX_TYPES[method](vectors, **kwargs)
+
+
+def save_index(index, path):
+    """İndeksi galeri özetiyle birlikte .npz olarak kaydet"""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    np.savez(path, kind=index.kind, fingerprint=fingerprint(index.vectors), **index.state())
+
+
+def load_index(path, vectors):
+    """Kayıtlı indeksi yükle; galeri değiştiyse None döndür"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if str(data["fingerprint"]) != fingerprint(vectors):
+                return None
+            state = {key: data[key] for key in data.files if key not in ("kind", "fingerprint")}
+            return INDEX_TYPES[str(data["kind"])].from_state(vectors, state)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"UYARI: Yüz indeksi okunamadı, yeniden kurulacak. Hata: {e}")
+        return None
+
+
+def load_or_build_index(vectors, method="auto", path=None):
+    """Galeriyle eşleşen kayıtlı indeks varsa onu, yoksa yenisini kurup kaydet"""
+    if method == "auto":
+        method = "ivf" if len(vectors) >= ANN_MIN_GALLERY_SIZE else "brute"
+    if method == "brute" or path is None:
+        return build_index(vectors, method)
+    index = load_index(path, vectors)
+    if index is None or index.kind != method:
+        index = build_index(vectors, method)
+        save_index(index, path)
+    return index
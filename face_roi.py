@@ -0,0 +1,106 @@
+import math
+import numpy as np
+
+
+def _overlaps(a, b):
+    """(top, right, bottom, left) dikdörtgenleri kesişiyor mu"""
+    return a[0] < b[2] and b[0] < a[2] and a[3] < b[1] and b[3] < a[1]
+
+
+def merge_regions(regions):
+    """Kesişen arama bölgelerini tek bir dikdörtgende birleştir"""
+    regions = list(regions)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(regions)):
+            for j in range(i + 1, len(regions)):
+                if _overlaps(regions[i], regions[j]):
+                    a, b = regions[i], regions.pop(j)
+                    regions[i] = (min(a[0], b[0]), max(a[1], b[1]), max(a[2], b[2]), min(a[3], b[3]))
+                    merged = True
+                    break
+            if merged:
+                break
+    return regions
+
+
+class FaceSearchRegion:
+    """İlk yakalamadan sonra yüz aramasını son yüzlerin çevresiyle sınırlar.
+
+    Son bilinen yüz kutuları her yönde expand oranında büyütülerek arama
+    bölgesi yapılır. Yeni gelenleri kaçırmamak için full_sweep_interval karede
+    bir, bölgelerde max_misses kare üst üste yüz bulunamazsa hemen tüm kare
+    taranır.
+    """
+
+    def __init__(self, expand=0.75, full_sweep_interval=15, max_misses=2):
+        self.expand = expand
+        self.full_sweep_interval = full_sweep_interval
+        self.max_misses = max_misses
+        self.reset()
+
+    def reset(self):
+        """Bilinen yüzleri unut; sonraki arama tüm karede yapılır"""
+        self.boxes = []
+        self.frames_since_sweep = 0
+        self.misses = 0
+        self.last_was_full = True
+
+    def regions(self, frame_shape):
+        """Bu karede aranacak bölgeler (tam çözünürlükte top, right, bottom, left)"""
+        height, width = frame_shape[:2]
+        if (not self.boxes or self.misses >= self.max_misses
+                or self.frames_since_sweep >= self.full_sweep_interval - 1):
+            self.last_was_full = True
+            return [(0, width, height, 0)]
+
+        rects = []
+        for top, right, bottom, left in self.boxes:
+            pad_y = (bottom - top) * self.expand
+            pad_x = (right - left) * self.expand
+            rects.append((max(0, int(top - pad_y)), min(width, int(right + pad_x)),
+                          min(height, int(bottom + pad_y)), max(0, int(left - pad_x))))
+        self.last_was_full = False
+        return merge_regions(rects)
+
+    def update(self, face_boxes):
+        """Bu karede bulunan yüz kutularını (tam çözünürlük) bildir"""
+        if self.last_was_full:
+            self.frames_since_sweep = 0
+        else:
+            self.frames_since_sweep += 1
+
+        if face_boxes:
+            self.boxes = list(face_boxes)
+            self.misses = 0
+        elif self.last_was_full:
+            # Tüm karede de yüz yok
+            self.boxes = []
+            self.misses = 0
+        else:
+            self.misses += 1
+
+    def locate(self, image, scale, locate_fn):
+        """Küçültülmüş görüntüde sadece arama bölgelerinde yüz bul.
+
+        image, tam karenin scale ile küçültülmüş hâlidir; locate_fn(görüntü)
+        (top, right, bottom, left) listesi döndürür. (image koordinatlarında
+        yüzler, taranan piksel sayısı) döndürür; gecikme bu piksellere düşer.
+        """
+        height, width = image.shape[:2]
+        found = []
+        searched = 0
+        for top, right, bottom, left in self.regions((height / scale, width / scale)):
+            t, l = int(top * scale), int(left * scale)
+            b, r = min(height, math.ceil(bottom * scale)), min(width, math.ceil(right * scale))
+            if t == 0 and l == 0 and b == height and r == width:
+                crop = image
+            else:
+                crop = np.ascontiguousarray(image[t:b, l:r])
+            if crop.size == 0:
+                continue
+            searched += crop.shape[0] * crop.shape[1]
+            for c_top, c_right, c_bottom, c_left in locate_fn(crop):
+                found.append((c_top + t, c_right + l, c_bottom + t, c_left + l))
+        return found, searched
@@ -0,0 +1,271 @@
+import time
+import itertools
+import cv2
+import numpy as np
+from face_gallery import UNKNOWN_NAME
+
+
+def box_iou(a, b):
+    """(top, right, bottom, left) kutuları arasındaki kesişim / birleşim oranı"""
+    top, bottom = max(a[0], b[0]), min(a[2], b[2])
+    left, right = max(a[3], b[3]), min(a[1], b[1])
+    inter = max(0, bottom - top) * max(0, right - left)
+    area_a = (a[2] - a[0]) * (a[1] - a[3])
+    area_b = (b[2] - b[0]) * (b[1] - b[3])
+    union = area_a + area_b - inter
+    return inter / union if union > 0 else 0.0
+
+
+class OpticalFlowTracker:
+    """Kutu içindeki köşe noktalarını Lucas-Kanade akışıyla izleyen basit izleyici.
+
+    OpenCV contrib (KCF/MOSSE) kurulu değilse yedek olarak kullanılır;
+    init/update arayüzü cv2 izleyicileriyle aynıdır.
+    """
+
+    def __init__(self, min_points=4):
+        self.min_points = min_points
+        self.prev_gray = None
+        self.points = None
+        self.box = None
+
+    def init(self, frame, box):
+        self.prev_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.box = tuple(float(v) for v in box)
+        x, y, w, h = (int(round(v)) for v in box)
+        mask = np.zeros_like(self.prev_gray)
+        mask[max(y, 0):y + h, max(x, 0):x + w] = 255
+        self.points = cv2.goodFeaturesToTrack(self.prev_gray, maxCorners=40, qualityLevel=0.01,
+                                              minDistance=3, mask=mask)
+        return self.points is not None
+
+    def update(self, frame):
+        if self.points is None or len(self.points) < self.min_points:
+            return False, self.box
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        new_points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.points, None)
+        good = status.reshape(-1) == 1
+        if good.sum() < self.min_points:
+            return False, self.box
+        dx, dy = np.median((new_points[good] - self.points[good]).reshape(-1, 2), axis=0)
+        x, y, w, h = self.box
+        self.box = (x + dx, y + dy, w, h)
+        self.prev_gray = gray
+        self.points = new_points[good].reshape(-1, 1, 2)
+        return True, self.box
+
+
+def create_box_tracker():
+    """Kurulu OpenCV'de bulunan en ucuz izleyiciyi oluştur"""
+    legacy = getattr(cv2, 'legacy', None)
+    if legacy is not None and hasattr(legacy, 'TrackerMOSSE_create'):
+        return legacy.TrackerMOSSE_create()
+    if hasattr(cv2, 'TrackerKCF_create'):
+        return cv2.TrackerKCF_create()
+    return OpticalFlowTracker()
+
+
+def face_thumbnail(small_frame, small_box, size=16):
+    """Görünüm karşılaştırması için normalize edilmiş küçük gri yüz kesiti"""
+    x, y, w, h = small_box
+    crop = small_frame[max(y, 0):y + h, max(x, 0):x + w]
+    if crop.size == 0:
+        return None
+    gray = cv2.cvtColor(cv2.resize(crop, (size, size)), cv2.COLOR_BGR2GRAY).astype(np.float32)
+    return (gray - gray.mean()) / (gray.std() + 1e-6)
+
+
+class FaceTrack:
+    """Kararlı kimliğe sahip tek bir yüz izi ve doğrulama sayacı.
+
+    Zamanlar karenin zamanıdır (now): canlı kamerada duvar saati, hızlı
+    dosya oynatmada kaynağın kare zamanı.
+    """
+
+    def __init__(self, track_id, box, match, now=None):
+        now = time.time() if now is None else now
+        self.track_id = track_id
+        self.box = box
+        self.name = match.name
+        self.distance = match.distance
+        self.margin = match.margin
+        self.verify_start = now if match.name != UNKNOWN_NAME else None
+        self.last_seen = now
+        self.tracker = None
+        # Son encoding anındaki durum (kimlik önbelleği için)
+        self.identity_time = now
+        self.identity_box = box
+        self.identity_thumb = None
+
+    def set_match(self, match, box, thumb, now=None):
+        """Yeni encoding sonucunu uygula; kimlik değişirse sayaç sıfırlanır"""
+        now = time.time() if now is None else now
+        if match.name != self.name:
+            self.verify_start = now if match.name != UNKNOWN_NAME else None
+        self.name = match.name
+        self.distance = match.distance
+        self.margin = match.margin
+        self.identity_time = now
+        self.identity_box = box
+        self.identity_thumb = thumb
+
+    def elapsed(self, now=None):
+        """Bu iz için doğrulamanın kaç saniyedir sürdüğü (varsayılan: izin son görüldüğü kare)"""
+        if self.verify_start is None:
+            return 0.0
+        return (self.last_seen if now is None else now) - self.verify_start
+
+
+class FaceTracker:
+    """Bir kez tespit et, aradaki karelerde izle.
+
+    Tam tespit her detect_interval karede bir, herhangi bir izin eşleşme farkı
+    min_margin altına düştüğünde ya da izleyici kaybettiğinde yapılır. Aradaki
+    karelerde yüzler küçültülmüş karede ucuz bir izleyiciyle takip edilir ve
+    her iz kendi kimliğini korur.
+
+    Tespit karelerinde de, kimliği yeterli farkla belirlenmiş bir iz yeniden
+    encode edilmez; önbellek identity_ttl saniye dolunca, kutu son encoding'e
+    göre drift_iou altına kaydığında ya da yüz görünümü appearance_threshold
+    üstünde değiştiğinde geçersiz olur.
+
+    metrics (PipelineMetrics) verilirse tespit edilen ve encoding'i atlanan
+    yüz sayıları "yuz_tespit_edilen" / "yuz_encoding_atlanan" sayaçlarına yazılır.
+    """
+
+    def __init__(self, detect_interval=5, min_margin=0.05, track_scale=0.25, iou_threshold=0.3,
+                 identity_ttl=2.0, drift_iou=0.5, appearance_threshold=0.6, metrics=None):
+        self.detect_interval = detect_interval
+        self.min_margin = min_margin
+        self.track_scale = track_scale
+        self.iou_threshold = iou_threshold
+        self.identity_ttl = identity_ttl
+        self.drift_iou = drift_iou
+        self.appearance_threshold = appearance_threshold
+        self.tracks = []
+        self.frames_since_detect = 0
+        self.detection_pending = False
+        self._ids = itertools.count(1)
+        # Kimlik önbelleği metrikleri
+        self.faces_detected = 0
+        self.encodings_skipped = 0
+        self.metrics = metrics
+
+    def reset(self):
+        """Tüm izleri bırak"""
+        self.tracks = []
+        self.frames_since_detect = 0
+        self.detection_pending = False
+
+    @property
+    def skip_rate(self):
+        """Tespit edilen yüzlerden encoding'i atlananların oranı"""
+        if self.faces_detected == 0:
+            return 0.0
+        return self.encodings_skipped / self.faces_detected
+
+    def needs_detection(self):
+        """Bu karede tam tespit gerekiyor mu"""
+        if not self.tracks or self.detection_pending or self.frames_since_detect >= self.detect_interval - 1:
+            return True
+        return any(track.name != UNKNOWN_NAME and track.margin < self.min_margin for track in self.tracks)
+
+    def _to_small(self, box):
+        top, right, bottom, left = box
+        s = self.track_scale
+        return (int(left * s), int(top * s), int((right - left) * s), int((bottom - top) * s))
+
+    def _from_small(self, box):
+        x, y, w, h = box
+        s = self.track_scale
+        return (int(y / s), int((x + w) / s), int((y + h) / s), int(x / s))
+
+    def _identity_fresh(self, track, box, thumb, now):
+        """İzin önbellekteki kimliği bu kutu için hâlâ geçerli mi"""
+        if track.name == UNKNOWN_NAME or track.margin < self.min_margin:
+            return False
+        if now - track.identity_time > self.identity_ttl:
+            return False
+        if box_iou(track.identity_box, box) < self.drift_iou:
+            return False
+        if track.identity_thumb is None or thumb is None:
+            return False
+        return float(np.mean(np.abs(track.identity_thumb - thumb))) < self.appearance_threshold
+
+    def update(self, frame, detect_fn=None, detection=None, now=None):
+        """Kareyi işle ve güncel izleri döndür.
+
+        detect_fn(frame) -> (konumlar, identify) yüzleri bulur; identify(indeksler)
+        sadece istenen yüzler için encoding + eşleşme yapıp FaceMatch listesi döndürür.
+        Ardışık düzende tespit ayrı bir aşamada yapılıp detection olarak verilir;
+        ikisi de yoksa gereken tespit sonraki kareye bırakılır (needs_detection).
+        now karenin zamanıdır (verilmezse duvar saati); doğrulama sayaçları
+        ve kimlik önbelleği bununla ilerler.
+        """
+        now = time.time() if now is None else now
+        small = cv2.resize(frame, (0, 0), fx=self.track_scale, fy=self.track_scale)
+
+        if detection is None and (detect_fn is None or not self.needs_detection()):
+            lost = False
+            for track in self.tracks:
+                ok, small_box = track.tracker.update(small)
+                if ok:
+                    track.box = self._from_small(small_box)
+                    track.last_seen = now
+                else:
+                    lost = True
+            if not lost or detect_fn is None:
+                self.frames_since_detect += 1
+                self.detection_pending = self.detection_pending or lost
+                return self.tracks
+
+        locations, identify = detection if detection is not None else detect_fn(frame)
+        locations = locations or []
+        self.frames_since_detect = 0
+        self.detection_pending = False
+        assigned = self._associate(locations)
+        thumbs = [face_thumbnail(small, self._to_small(box)) for box in locations]
+
+        # Sadece kimliği taze olmayan yüzler encode edilir
+        to_encode = [di for di, track in enumerate(assigned)
+                     if track is None or not self._identity_fresh(track, locations[di], thumbs[di], now)]
+        matches = dict(zip(to_encode, identify(to_encode))) if to_encode else {}
+        self.faces_detected += len(locations)
+        self.encodings_skipped += len(locations) - len(to_encode)
+        if self.metrics is not None:
+            self.metrics.count("yuz_tespit_edilen", len(locations))
+            self.metrics.count("yuz_encoding_atlanan", len(locations) - len(to_encode))
+
+        tracks = []
+        for di, track in enumerate(assigned):
+            box = locations[di]
+            if track is None:
+                track = FaceTrack(next(self._ids), box, matches[di], now)
+                track.identity_thumb = thumbs[di]
+            elif di in matches:
+                track.set_match(matches[di], box, thumbs[di], now)
+            track.box = box
+            track.last_seen = now
+            track.tracker = create_box_tracker()
+            track.tracker.init(small, self._to_small(box))
+            tracks.append(track)
+        # Eşleşmeyen izler yüz kaybolduğu için bırakılır
+        self.tracks = tracks
+        return self.tracks
+
+    def _associate(self, locations):
+        """Yeni tespitleri IoU'ya göre mevcut izlere bağla (açgözlü).
+
+        Her tespit için eşleşen izi ya da None döndürür.
+        """
+        pairs = sorted(((box_iou(track.box, box), ti, di)
+                        for ti, track in enumerate(self.tracks)
+                        for di, box in enumerate(locations)), reverse=True)
+        assigned = [None] * len(locations)
+        used_tracks = set()
+        for iou, ti, di in pairs:
+            if iou < self.iou_threshold or ti in used_tracks or assigned[di] is not None:
+                continue
+            assigned[di] = self.tracks[ti]
+            used_tracks.add(ti)
+        return assigned
@@ -0,0 +1,268 @@
+import os
+import json
+import threading
+import time
+import cv2
+
+# Kaydedilmiş oturum klasöründeki zamanlama dosyası
+SESSION_MANIFEST = "session.json"
+
+
+class LatestFrameCapture:
+    """cv2.VideoCapture'ı ayrı bir thread'de okuyup yalnızca en yeni kareyi tutar.
+
+    Tanıma kameradan yavaş kaldığında kareler sürücüde birikmez; tek
+    yuvalı tampondaki kare her okumada en yenisiyle değiştirilir ve hiç
+    işlenmeden üzerine yazılan kareler frames_dropped'da sayılır.
+    cv2.VideoCapture ile aynı isOpened / read / release arayüzünü sunar.
+    """
+
+    def __init__(self, source=0, read_timeout=2.0):
+        self.source = source
+        self.read_timeout = read_timeout
+        self.cap = cv2.VideoCapture(source)
+        self._condition = threading.Condition()
+        self._frame = None
+        self._frame_id = 0
+        self._consumed_id = 0
+        self._running = False
+        self._thread = None
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.last_frame_time = None
+        # Canlı kamerada karenin kaynak zamanı yok; zamanlayıcılar duvar saatini kullanır
+        self.frame_time = None
+        if self.cap.isOpened():
+            self.start()
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def start(self):
+        """Okuma thread'ini başlat"""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._reader, daemon=True)
+        self._thread.start()
+        return self
+
+    def _reader(self):
+        try:
+            while self._running:
+                ret, frame = self.cap.read()
+                with self._condition:
+                    if not ret:
+                        # Kamera koptu ya da video bitti; bekleyen okumayı uyandır
+                        self._running = False
+                        self._condition.notify_all()
+                        break
+                    if self._frame is not None and self._consumed_id < self._frame_id:
+                        # Önceki kare hiç işlenmeden üzerine yazılıyor
+                        self.frames_dropped += 1
+                    self._frame = frame
+                    self._frame_id += 1
+                    self.frames_captured += 1
+                    self.last_frame_time = time.time()
+                    self._condition.notify_all()
+        finally:
+            # Kamera okuma thread'inde, son cap.read() bittikten sonra bırakılır;
+            # başka thread'den release() ile aynı anda çalışmaz
+            self.cap.release()
+
+    def read(self):
+        """Henüz işlenmemiş en yeni kareyi bekle: (ret, frame)"""
+        with self._condition:
+            deadline = time.monotonic() + self.read_timeout
+            while self._consumed_id >= self._frame_id:
+                remaining = deadline - time.monotonic()
+                if not self._running or remaining <= 0:
+                    return False, None
+                self._condition.wait(remaining)
+            self._consumed_id = self._frame_id
+            return True, self._frame
+
+    @property
+    def drop_rate(self):
+        """Tanımaya hiç ulaşmadan atlanan karelerin oranı"""
+        if not self.frames_captured:
+            return 0.0
+        return self.frames_dropped / self.frames_captured
+
+    def release(self):
+        """Thread'i durdur ve kamerayı bırak.
+
+        Kamerayı okuma thread'i çıkarken kendisi bırakır. Thread cap.read()'de
+        takılı kaldıysa (kopan kamera) beklenmez; kamera okuma dönünce bırakılır.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        thread, self._thread = self._thread, None
+        if thread is None:
+            # Okuma thread'i hiç başlamadı (kamera açılamadı)
+            self.cap.release()
+            return
+        thread.join(timeout=1.0)
+        if thread.is_alive():
+            print(f"UYARI: Kamera {self.source} okuması sürüyor; kamera okuma bitince bırakılacak")
+
+
+class _PacedSource:
+    """Dosya tabanlı kaynaklar için ortak hız ayarı.
+
+    realtime=True iken kareler kayıttaki zamanlarında verilir (kamera gibi);
+    False iken bekleme yapılmaz, kareler işlenebildiği kadar hızlı okunur.
+    Her kare verilir, yani aynı kayıt her çalıştırmada aynı kare dizisini üretir.
+    frame_time son verilen karenin kayıttaki zamanıdır (sn); hızlı okumada
+    doğrulama sayaçları duvar saati yerine bunu kullanır.
+    """
+
+    def __init__(self, realtime=True):
+        self.realtime = realtime
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.last_frame_time = None
+        self.frame_time = None
+        self._start = None
+
+    def _pace(self, timestamp):
+        if self._start is None:
+            self._start = time.monotonic() - timestamp
+        if self.realtime:
+            delay = self._start + timestamp - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def _deliver(self, frame, timestamp):
+        self.frames_captured += 1
+        self.last_frame_time = time.time()
+        self.frame_time = timestamp
+        return True, frame
+
+    @property
+    def drop_rate(self):
+        return 0.0
+
+
+class VideoFileSource(_PacedSource):
+    """Video dosyasını kamera yerine kare kaynağı olarak kullan"""
+
+    def __init__(self, path, realtime=True):
+        super().__init__(realtime)
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS) if self.cap.isOpened() else 0
+        self.fps = fps if fps and fps > 0 else 30.0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            return False, None
+        # Kare zamanı: kare numarası / videonun fps'i
+        timestamp = self.frames_captured / self.fps
+        self._pace(timestamp)
+        return self._deliver(frame, timestamp)
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageSequenceSource(_PacedSource):
+    """Klasördeki fotoğrafları ad sırasıyla sabit fps'te kare olarak ver"""
+
+    def __init__(self, directory, fps=30.0, realtime=True):
+        super().__init__(realtime)
+        self.directory = directory
+        self.fps = fps
+        self.files = sorted(os.path.join(directory, f) for f in os.listdir(directory)
+                            if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp')))
+        self.timestamps = [i / fps for i in range(len(self.files))]
+        self.position = 0
+
+    def isOpened(self):
+        return bool(self.files)
+
+    def read(self):
+        while self.position < len(self.files):
+            index = self.position
+            self.position += 1
+            frame = cv2.imread(self.files[index])
+            if frame is None:
+                print(f"UYARI: {self.files[index]} okunamadı, atlanıyor")
+                continue
+            self._pace(self.timestamps[index])
+            return self._deliver(frame, self.timestamps[index])
+        return False, None
+
+    def release(self):
+        self.position = len(self.files)
+
+
+class RecordedSessionSource(ImageSequenceSource):
+    """SessionRecorder ile kaydedilmiş oturumu kayıt zamanlamasıyla oynat"""
+
+    def __init__(self, directory, realtime=True):
+        with open(os.path.join(directory, SESSION_MANIFEST), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        _PacedSource.__init__(self, realtime)
+        self.directory = directory
+        self.fps = manifest.get("fps", 30.0)
+        self.files = [os.path.join(directory, entry["file"]) for entry in manifest["frames"]]
+        self.timestamps = [entry["t"] for entry in manifest["frames"]]
+        self.position = 0
+
+
+class SessionRecorder:
+    """Kameradan gelen kareleri zaman damgalarıyla klasöre kaydet.
+
+    Kayıt RecordedSessionSource ile kameranın verdiği zamanlamayla
+    (düşen kareler dahil) aynen tekrar oynatılabilir.
+    """
+
+    def __init__(self, directory, quality=90):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.quality = quality
+        self.frames = []
+        self._start = None
+
+    def write(self, frame):
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        filename = f"{len(self.frames):06d}.jpg"
+        cv2.imwrite(os.path.join(self.directory, filename), frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        self.frames.append({"file": filename, "t": round(now - self._start, 4)})
+
+    def close(self):
+        """Zamanlama bilgisini session.json'a yaz"""
+        duration = self.frames[-1]["t"] if self.frames else 0.0
+        fps = (len(self.frames) - 1) / duration if duration > 0 else 30.0
+        with open(os.path.join(self.directory, SESSION_MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump({"fps": round(fps, 2), "frames": self.frames}, f)
+        print(f"Oturum kaydedildi: {self.directory} ({len(self.frames)} kare)")
+
+
+def open_frame_source(source=0, realtime=True, shared_memory=False, slots=16):
+    """Kare kaynağını aç: kamera numarası, video dosyası, fotoğraf klasörü
+    ya da kaydedilmiş oturum klasörü (session.json içeren).
+
+    Kamera her zaman canlıdır; realtime sadece dosya kaynaklarının hızını
+    belirler (False: olabildiğince hızlı). shared_memory=True ise yakalama
+    ayrı bir süreçte yapılır ve kareler slots yuvalı paylaşılan bellek
+    halkasıyla kopyasız gelir (kaynağın release_frame'i çağrılmalıdır).
+    """
+    if shared_memory:
+        from shared_frames import SharedMemoryFrameSource
+        return SharedMemoryFrameSource(source, realtime, slots)
+    if isinstance(source, int) or str(source).isdigit():
+        return LatestFrameCapture(int(source))
+    if os.path.isdir(source):
+        if os.path.exists(os.path.join(source, SESSION_MANIFEST)):
+            return RecordedSessionSource(source, realtime)
+        return ImageSequenceSource(source, realtime=realtime)
+    return VideoFileSource(source, realtime)
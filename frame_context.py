@@ -0,0 +1,114 @@
+import threading
+import cv2
+import numpy as np
+
+
+class FrameBufferPool:
+    """Ara görüntüler için yeniden kullanılan tamponlar.
+
+    Aynı şekil ve türde bir tampon serbest bırakıldığında sonraki kare onu
+    alır; böylece kare başına megabaytlarca yeni dizi ayrılmaz. Aynı anda
+    birden fazla kare işlenebildiği için her şekil için max_per_shape
+    tampona kadar saklanır.
+    """
+
+    def __init__(self, max_per_shape=8):
+        self.max_per_shape = max_per_shape
+        self.free = {}
+        self.lock = threading.Lock()
+        self.allocations = 0
+        self.reuses = 0
+
+    def acquire(self, shape, dtype=np.uint8):
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self.lock:
+            buffers = self.free.get(key)
+            if buffers:
+                self.reuses += 1
+                return buffers.pop()
+            self.allocations += 1
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, buffer):
+        key = (buffer.shape, buffer.dtype.str)
+        with self.lock:
+            buffers = self.free.setdefault(key, [])
+            if len(buffers) < self.max_per_shape:
+                buffers.append(buffer)
+
+
+class FrameContext:
+    """Bir karenin türetilmiş görüntüleri (küçük BGR/RGB/gri, tam RGB/gri).
+
+    Her görüntü ilk istendiğinde bir kez hesaplanır ve havuzdan alınan
+    tampona yazılır; yüz ve el aşamaları aynı kareyi paylaşır. release()
+    ile tamponlar havuza döner, sonrasında görüntüler kullanılmamalıdır.
+    """
+
+    def __init__(self, frame, pool=None):
+        self.frame = frame
+        self.pool = pool or FrameBufferPool()
+        self.images = {}
+
+    def _buffer(self, key, shape, compute):
+        image = self.images.get(key)
+        if image is None:
+            image = compute(self.pool.acquire(shape, self.frame.dtype))
+            self.images[key] = image
+        return image
+
+    def _small_shape(self, scale):
+        height, width = self.frame.shape[:2]
+        # cv2.resize(fx, fy) ile aynı yuvarlama
+        return int(round(height * scale)), int(round(width * scale))
+
+    def small(self, scale):
+        """scale ile küçültülmüş BGR kare"""
+        if scale == 1.0:
+            return self.frame
+        height, width = self._small_shape(scale)
+        return self._buffer(("small", scale), (height, width, 3),
+                            lambda dst: cv2.resize(self.frame, (width, height), dst=dst))
+
+    def small_rgb(self, scale):
+        """Küçültülmüş RGB kare (yüz tespiti ve encoding için)"""
+        if scale == 1.0:
+            return self.rgb()
+        small = self.small(scale)
+        return self._buffer(("small_rgb", scale), small.shape,
+                            lambda dst: cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=dst))
+
+    def small_gray(self, scale):
+        """Küçültülmüş gri kare (Haar gibi gri girdi bekleyen dedektörler için)"""
+        if scale == 1.0:
+            return self.gray()
+        small = self.small(scale)
+        return self._buffer(("small_gray", scale), small.shape[:2],
+                            lambda dst: cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=dst))
+
+    def rgb(self):
+        """Tam çözünürlükte RGB kare (MediaPipe için)"""
+        return self._buffer("rgb", self.frame.shape,
+                            lambda dst: cv2.cvtColor(self.frame, cv2.COLOR_BGR2RGB, dst=dst))
+
+    def region_rgb(self, region, size):
+        """Tam karenin (top, right, bottom, left) bölgesi, size=(genişlik, yükseklik) RGB (el araması için)"""
+        top, right, bottom, left = region
+        width, height = size
+        crop = self.frame[top:bottom, left:right]
+        if (width, height) != (right - left, bottom - top):
+            crop = self._buffer(("region", region, size), (height, width, 3),
+                                lambda dst: cv2.resize(crop, (width, height), dst=dst))
+        return self._buffer(("region_rgb", region, size), (height, width, 3),
+                            lambda dst: cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=dst))
+
+    def gray(self):
+        """Tam çözünürlükte gri kare"""
+        return self._buffer("gray", self.frame.shape[:2],
+                            lambda dst: cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY, dst=dst))
+
+    def release(self):
+        """Tamponları havuza geri ver"""
+        for image in self.images.values():
+            self.pool.release(image)
+        self.images = {}
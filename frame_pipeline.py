@@ -0,0 +1,281 @@
+import collections
+import itertools
+import threading
+import time
+
+DROP_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+class FramePacket:
+    """Ardışık düzende aşamalar arasında taşınan kare ve aşama sonuçları"""
+
+    def __init__(self, frame_id, frame, on_release=None, context=None, timestamp=None):
+        self.frame_id = frame_id
+        self.frame = frame
+        # Kaynağın kare zamanı (hızlı dosya oynatma); None ise duvar saati kullanılır
+        self.timestamp = timestamp
+        # Aşamaların paylaştığı türetilmiş görüntüler (FrameContext)
+        self.context = context
+        self.created = time.perf_counter()
+        # Aşamaların ürettiği sonuçlar (örn. "tracks", "hand_results")
+        self.data = {}
+        # Aşama adı -> işlem süresi (ms)
+        self.stage_ms = {}
+        # Kare paylaşılan bellek yuvasındaysa işi bitince yuvayı geri verir
+        self._on_release = on_release
+
+    def close(self):
+        """Paketle işi bitti (gösterildi ya da yolda atıldı); kare tamponunu bırak"""
+        if self.context is not None:
+            context, self.context = self.context, None
+            context.release()
+        if self._on_release is not None:
+            on_release, self._on_release = self._on_release, None
+            on_release(self.frame)
+
+
+class StageQueue:
+    """Aşamalar arasındaki sınırlı kuyruk.
+
+    Kuyruk doluyken drop_policy'ye göre davranır: "block" yazanı bekletir,
+    "drop_oldest" en eski paketi atıp yenisine yer açar (canlı görüntüde
+    en taze kare öne geçer), "drop_newest" gelen paketi atar.
+    """
+
+    def __init__(self, maxsize=2, drop_policy="drop_oldest"):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Bilinmeyen kuyruk politikası: {drop_policy}")
+        self.maxsize = maxsize
+        self.drop_policy = drop_policy
+        self.items = collections.deque()
+        self.condition = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def __len__(self):
+        return len(self.items)
+
+    def put(self, packet, timeout=None):
+        """Paketi kuyruğa ekle; paket kuyruğa girdiyse True"""
+        with self.condition:
+            if len(self.items) >= self.maxsize:
+                if self.drop_policy == "drop_newest":
+                    self.dropped += 1
+                    packet.close()
+                    return False
+                if self.drop_policy == "drop_oldest":
+                    self.items.popleft().close()
+                    self.dropped += 1
+                else:
+                    deadline = None if timeout is None else time.monotonic() + timeout
+                    while len(self.items) >= self.maxsize and not self.closed:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            self.dropped += 1
+                            packet.close()
+                            return False
+                        self.condition.wait(remaining)
+            if self.closed:
+                packet.close()
+                return False
+            self.items.append(packet)
+            self.condition.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """Sıradaki paketi al; süre dolarsa ya da kuyruk kapandıysa None"""
+        with self.condition:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self.items:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if self.closed or (remaining is not None and remaining <= 0):
+                    return None
+                self.condition.wait(remaining)
+            packet = self.items.popleft()
+            self.condition.notify_all()
+            return packet
+
+    def close(self):
+        """Bekleyen tüm okuma ve yazmaları serbest bırak; kalan paketleri kapat"""
+        with self.condition:
+            self.closed = True
+            while self.items:
+                self.items.popleft().close()
+            self.condition.notify_all()
+
+
+class PipelineStage:
+    """Ardışık düzenin bir aşaması: fn(packet) paketi işler.
+
+    fn paketi (ya da yeni bir paketi) döndürür; None dönerse paket burada
+    düşürülür. workers > 1 olan aşamalar durum tutmamalıdır, çünkü paketler
+    sırasız bitebilir (çıkışta eski kalan paketler atılır).
+    """
+
+    def __init__(self, name, fn, workers=1):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.processed = 0
+        self.errors = 0
+        self.discarded = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, elapsed_ms):
+        with self.lock:
+            self.processed += 1
+            self.total_ms += elapsed_ms
+            self.last_ms = elapsed_ms
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.processed if self.processed else 0.0
+
+
+class FramePipeline:
+    """Kare işleme aşamalarını sınırlı kuyruklarla bağlanmış thread'lerde çalıştırır.
+
+    Her aşamanın kendi giriş kuyruğu vardır; böylece N+1. karenin yüz
+    tespiti N. karenin encoding'iyle aynı anda yürür. submit() ile kare
+    verilir, get() ile son aşamadan çıkan paket alınır. Kuyruk derinlikleri,
+    atılan paketler ve uçtan uca gecikme stats() ile izlenir; metrics
+    (PipelineMetrics) verilirse aşama süreleri ve çıkış hızı oraya da yazılır.
+    """
+
+    def __init__(self, stages, queue_size=2, drop_policy="drop_oldest", latency_window=120, metrics=None,
+                 context_factory=None):
+        self.stages = list(stages)
+        self.metrics = metrics
+        # Verilirse her pakete context_factory(frame) ile bir FrameContext eklenir
+        self.context_factory = context_factory
+        self.queues = [StageQueue(queue_size, drop_policy) for _ in self.stages]
+        # Çıkış sadece gösterim içindir; okuyan yavaşsa aşamalar beklemesin diye
+        # her zaman en taze paket tutulur
+        self.output = StageQueue(queue_size, "drop_oldest")
+        self.latencies = collections.deque(maxlen=latency_window)
+        self.frames_submitted = 0
+        self.frames_completed = 0
+        self.stale_dropped = 0
+        self._last_output_id = -1
+        self._output_lock = threading.Lock()
+        self._ids = itertools.count()
+        self._threads = []
+        self._running = False
+
+    def start(self):
+        """Aşama thread'lerini başlat"""
+        self._running = True
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                thread = threading.Thread(target=self._run_stage, args=(index,),
+                                          name=f"{stage.name}-{worker}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def _run_stage(self, index):
+        stage = self.stages[index]
+        source = self.queues[index]
+        while self._running:
+            packet = source.get(timeout=0.1)
+            if packet is None:
+                continue
+            start = time.perf_counter()
+            try:
+                result = stage.fn(packet)
+            except Exception as e:
+                stage.errors += 1
+                print(f"HATA: '{stage.name}' aşaması kareyi işleyemedi: {e}")
+                packet.close()
+                continue
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            stage.record(elapsed_ms)
+            if self.metrics is not None:
+                self.metrics.observe(f"asama_{stage.name}", elapsed_ms)
+            if result is None:
+                stage.discarded += 1
+                packet.close()
+                continue
+            packet = result
+            packet.stage_ms[stage.name] = elapsed_ms
+            if index + 1 < len(self.stages):
+                self.queues[index + 1].put(packet)
+            else:
+                self._emit(packet)
+
+    def _emit(self, packet):
+        with self._output_lock:
+            if packet.frame_id < self._last_output_id:
+                # Paralel bir aşamada geride kalmış kare, daha yenisi zaten çıktı
+                self.stale_dropped += 1
+                packet.close()
+                return
+            self._last_output_id = packet.frame_id
+            self.frames_completed += 1
+            latency_ms = (time.perf_counter() - packet.created) * 1000
+            self.latencies.append(latency_ms)
+        if self.metrics is not None:
+            self.metrics.observe("uctan_uca", latency_ms)
+            self.metrics.tick("islenen")
+        self.output.put(packet)
+
+    def submit(self, frame, on_release=None, timestamp=None):
+        """Yeni kareyi ilk aşamaya ver; kare kuyruğa girdiyse True.
+
+        on_release(frame) paket kapanınca çağrılır (paylaşılan bellek yuvası için);
+        timestamp paketin timestamp'i olur.
+        """
+        self.frames_submitted += 1
+        context = self.context_factory(frame) if self.context_factory else None
+        return self.queues[0].put(FramePacket(next(self._ids), frame, on_release, context, timestamp))
+
+    def get(self, timeout=None):
+        """Tüm aşamalardan geçmiş sıradaki paket (yoksa None); işi bitince close() çağrılmalı"""
+        return self.output.get(timeout)
+
+    def _finished(self):
+        """Çıkışa ulaşan ya da yolda atılan kare sayısı"""
+        return (self.frames_completed + self.stale_dropped
+                + sum(queue.dropped for queue in self.queues)
+                + sum(stage.errors + stage.discarded for stage in self.stages))
+
+    def drain(self, timeout=10.0):
+        """Verilmiş tüm kareler çıkışa ulaşana (ya da atılana) kadar bekle"""
+        deadline = time.monotonic() + timeout
+        while self._finished() < self.frames_submitted and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self._finished() >= self.frames_submitted
+
+    def stats(self):
+        """Aşama bazında kuyruk derinliği, atılan paket ve süreler; uçtan uca gecikme"""
+        latencies = sorted(self.latencies)
+        return {
+            "submitted": self.frames_submitted,
+            "completed": self.frames_completed,
+            "stale_dropped": self.stale_dropped,
+            "latency_ms": self.latencies[-1] if self.latencies else 0.0,
+            "mean_latency_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_latency_ms": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] if latencies else 0.0,
+            "stages": [{
+                "name": stage.name,
+                "queue_depth": len(queue),
+                "dropped": queue.dropped,
+                "processed": stage.processed,
+                "errors": stage.errors,
+                "discarded": stage.discarded,
+                "mean_ms": stage.mean_ms,
+                "last_ms": stage.last_ms,
+            } for stage, queue in zip(self.stages, self.queues)],
+            "output_depth": len(self.output),
+        }
+
+    def stop(self):
+        """Thread'leri durdur ve kuyrukları kapat"""
+        self._running = False
+        for queue in self.queues + [self.output]:
+            queue.close()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
@@ -0,0 +1,320 @@
+import os
+import json
+import numpy as np
+from compiled_forest import CompiledForest, load_compiled_forest
+from hand_features import FEATURE_VERSION, HandFeatureExtractor, features_from_record
+
+# Seçilen sınıflandırıcı models/ altında bu dosyada kayıtlıdır; yoksa orman kullanılır
+SELECTION_FILE = "hand_gesture_model.json"
+
+
+def _standardize(X, mean, scale):
+    # StandardScaler.transform ile aynı işlem sırası
+    X = np.array(X, dtype=np.float64)
+    X -= mean
+    X /= scale
+    return X
+
+
+def _fit_scaler(X):
+    """StandardScaler ile aynı ortalama ve ölçek (sabit sütunlarda ölçek 1)"""
+    from sklearn.preprocessing import StandardScaler
+    scaler = StandardScaler().fit(X)
+    return np.asarray(scaler.mean_, dtype=np.float64), np.asarray(scaler.scale_, dtype=np.float64)
+
+
+def _softmax(scores):
+    scores = scores - scores.max(axis=-1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=-1, keepdims=True)
+    return scores
+
+
+def _binary_as_softmax(weights, bias):
+    """İki sınıflı sklearn modelinin tek çıktısını iki sütunlu softmax'a çevir.
+
+    softmax([0, z]) = [1 - sigmoid(z), sigmoid(z)]; sklearn'ün predict_proba'sı ile aynı.
+    """
+    return (np.vstack([np.zeros_like(weights), weights]), np.concatenate([np.zeros_like(bias), bias]))
+
+
+class _NumpyGestureClassifier:
+    """NumPy ile tahmin yapan el hareketi sınıflandırıcılarının ortak kısmı.
+
+    Alt sınıflar predict_proba'yı ve kaydedilecek dizileri (_arrays) tanımlar;
+    girdi her zaman ham özelliklerdir, ölçekleme modelin içindedir.
+    mirror_handedness eğitim özelliklerinde sol ellerin aynalandığını söyler.
+    """
+
+    name = None
+
+    def __init__(self, classes, mean, scale, feature_version=FEATURE_VERSION):
+        self.classes = np.asarray(classes)
+        self.mean = mean
+        self.scale = scale
+        self.feature_version = int(feature_version)
+        self.mirror_handedness = False
+
+    def predict_one(self, features):
+        """Tek özellik satırı için (etiket, olasılık)"""
+        proba = self.predict_proba(np.asarray(features)[None, :])[0]
+        best = int(np.argmax(proba))
+        return self.classes[best], proba[best]
+
+    def predict(self, X):
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # np.savez yolun sonuna .npz ekler; yazılan dosya tam olarak path olsun
+        with open(path, 'wb') as f:
+            np.savez(f, kind=np.array(self.name), classes=self.classes, mean=self.mean, scale=self.scale,
+                     feature_version=np.array(self.feature_version),
+                     mirror_handedness=np.array(self.mirror_handedness), **self._arrays())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files if key != "kind"}
+        arrays["feature_version"] = int(arrays["feature_version"])
+        mirror_handedness = bool(arrays.pop("mirror_handedness", False))
+        classifier = cls._from_arrays(**arrays)
+        classifier.mirror_handedness = mirror_handedness
+        return classifier
+
+
+class KNNGestureClassifier(_NumpyGestureClassifier):
+    """Ölçeklenmiş özelliklerde k en yakın komşu; olasılık komşu oylarının payı"""
+
+    name = "knn"
+
+    def __init__(self, samples, targets, classes, mean, scale, feature_version=FEATURE_VERSION, k=5):
+        super().__init__(classes, mean, scale, feature_version)
+        self.samples = samples
+        self.targets = targets
+        self.k = int(min(k, len(samples)))
+        # |a - b|² = |a|² - 2ab + |b|²; |a|² her satır için sabit, sıralamayı değiştirmez
+        self._sample_norms = np.einsum('ij,ij->i', samples, samples)
+
+    @classmethod
+    def train(cls, X, y, feature_version=FEATURE_VERSION, k=5):
+        mean, scale = _fit_scaler(X)
+        classes, targets = np.unique(y, return_inverse=True)
+        return cls(_standardize(X, mean, scale), targets.astype(np.intp), classes, mean, scale, feature_version, k)
+
+    def predict_proba(self, X):
+        X = _standardize(X, self.mean, self.scale)
+        distances = self._sample_norms - 2.0 * (X @ self.samples.T)
+        nearest = np.argpartition(distances, self.k - 1, axis=1)[:, :self.k]
+        votes = self.targets[nearest]
+        proba = np.zeros((len(X), len(self.classes)))
+        np.add.at(proba, (np.arange(len(X))[:, None], votes), 1.0)
+        return proba / self.k
+
+    def _arrays(self):
+        return dict(samples=self.samples, targets=self.targets, k=np.array(self.k))
+
+    @classmethod
+    def _from_arrays(cls, samples, targets, classes, mean, scale, feature_version, k):
+        return cls(samples, targets, classes, mean, scale, feature_version, int(k))
+
+
+class LogisticGestureClassifier(_NumpyGestureClassifier):
+    """Çok sınıflı lojistik regresyon (sklearn'de eğitilir, tahmin softmax(xWᵀ + b))"""
+
+    name = "logistic"
+
+    def __init__(self, weights, bias, classes, mean, scale, feature_version=FEATURE_VERSION):
+        super().__init__(classes, mean, scale, feature_version)
+        self.weights = weights
+        self.bias = bias
+
+    @classmethod
+    def train(cls, X, y, feature_version=FEATURE_VERSION, C=1.0, max_iter=1000):
+        from sklearn.linear_model import LogisticRegression
+        mean, scale = _fit_scaler(X)
+        model = LogisticRegression(C=C, max_iter=max_iter).fit(_standardize(X, mean, scale), y)
+        weights, bias = model.coef_, model.intercept_
+        if len(model.classes_) == 2:
+            weights, bias = _binary_as_softmax(weights, bias)
+        return cls(weights, bias, model.classes_, mean, scale, feature_version)
+
+    def predict_proba(self, X):
+        return _softmax(_standardize(X, self.mean, self.scale) @ self.weights.T + self.bias)
+
+    def _arrays(self):
+        return dict(weights=self.weights, bias=self.bias)
+
+    @classmethod
+    def _from_arrays(cls, weights, bias, classes, mean, scale, feature_version):
+        return cls(weights, bias, classes, mean, scale, feature_version)
+
+
+class MLPGestureClassifier(_NumpyGestureClassifier):
+    """Tek gizli katmanlı küçük ReLU ağı (sklearn MLPClassifier'da eğitilir)"""
+
+    name = "mlp"
+
+    def __init__(self, layers, classes, mean, scale, feature_version=FEATURE_VERSION):
+        super().__init__(classes, mean, scale, feature_version)
+        # [(ağırlık, sapma), ...]; son katman softmax
+        self.layers = layers
+
+    @classmethod
+    def train(cls, X, y, feature_version=FEATURE_VERSION, hidden=64, alpha=1e-4, max_iter=500):
+        from sklearn.neural_network import MLPClassifier
+        mean, scale = _fit_scaler(X)
+        model = MLPClassifier(hidden_layer_sizes=(hidden,), alpha=alpha, max_iter=max_iter, random_state=42)
+        model.fit(_standardize(X, mean, scale), y)
+        layers = list(zip(model.coefs_, model.intercepts_))
+        if len(model.classes_) == 2:
+            weights, bias = _binary_as_softmax(layers[-1][0].T, layers[-1][1])
+            layers[-1] = (weights.T, bias)
+        return cls(layers, model.classes_, mean, scale, feature_version)
+
+    def predict_proba(self, X):
+        hidden = _standardize(X, self.mean, self.scale)
+        for weights, bias in self.layers[:-1]:
+            hidden = hidden @ weights
+            hidden += bias
+            np.maximum(hidden, 0.0, out=hidden)
+        weights, bias = self.layers[-1]
+        return _softmax(hidden @ weights + bias)
+
+    def _arrays(self):
+        arrays = {}
+        for i, (weights, bias) in enumerate(self.layers):
+            arrays[f"W{i}"], arrays[f"b{i}"] = weights, bias
+        return arrays
+
+    @classmethod
+    def _from_arrays(cls, classes, mean, scale, feature_version, **arrays):
+        layers = [(arrays[f"W{i}"], arrays[f"b{i}"]) for i in range(len(arrays) // 2)]
+        return cls(layers, classes, mean, scale, feature_version)
+
+
+GESTURE_CLASSIFIERS = {cls.name: cls for cls in (CompiledForest, KNNGestureClassifier,
+                                                 LogisticGestureClassifier, MLPGestureClassifier)}
+
+
+def classifier_filename(name):
+    """Sınıflandırıcının models/ altındaki dosyası (orman eski adını korur)"""
+    if name == CompiledForest.name:
+        return "hand_gesture_model.npz"
+    return f"hand_gesture_{name}.npz"
+
+
+def train_gesture_classifier(name, X, y, feature_version=FEATURE_VERSION, mirror_handedness=False, **params):
+    """Sınıflandırıcıyı eğit; mirror_handedness load_hand_dataset'in döndürdüğü değer olmalı"""
+    if name not in GESTURE_CLASSIFIERS:
+        raise ValueError(f"Bilinmeyen el hareketi sınıflandırıcısı: {name}")
+    classifier = GESTURE_CLASSIFIERS[name].train(X, y, feature_version, **params)
+    classifier.mirror_handedness = bool(mirror_handedness)
+    return classifier
+
+
+def load_hand_dataset(data_dir, version=FEATURE_VERSION):
+    """data/hands/<hareket>/*.json örneklerinden (X, y, mirror_handedness).
+
+    Özellikler version ile yeniden hesaplanır. Sol eller sadece tüm
+    kayıtlarda el bilgisi varsa aynalanır; el bilgisi olmayan tek bir eski
+    kayıt bile varsa hiçbiri aynalanmaz. mirror_handedness modele kaydedilir
+    ve tahminde aynı karar uygulanır.
+    """
+    records = []
+    if os.path.isdir(data_dir):
+        for letter in sorted(os.listdir(data_dir)):
+            letter_dir = os.path.join(data_dir, letter)
+            if not os.path.isdir(letter_dir):
+                continue
+            for filename in sorted(os.listdir(letter_dir)):
+                if not filename.endswith('.json'):
+                    continue
+                with open(os.path.join(letter_dir, filename), 'r') as f:
+                    records.append((filename, json.load(f)))
+    mirror_handedness = bool(records) and all(data.get("handedness") for _, data in records)
+
+    features, labels = [], []
+    for filename, data in records:
+        sample = features_from_record(data, version, mirror_handedness)
+        if sample is not None:
+            features.append(sample)
+            labels.append(data['gesture'])
+        else:
+            print(f"UYARI: {filename} dosyasından {version}. sürüm el özellikleri çıkarılamadı.")
+    if not features:
+        return np.empty((0, 0)), np.array([]), False
+    return np.array(features), np.array(labels), mirror_handedness
+
+
+def read_selection(models_dir):
+    """models/hand_gesture_model.json içeriği (yoksa None)"""
+    path = os.path.join(models_dir, SELECTION_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"UYARI: {path} okunamadı: {e}")
+        return None
+
+
+def selected_classifier_name(models_dir):
+    selection = read_selection(models_dir)
+    if selection and selection.get("classifier") in GESTURE_CLASSIFIERS:
+        return selection["classifier"]
+    return CompiledForest.name
+
+
+def save_selected_classifier(classifier, models_dir, **info):
+    """Sınıflandırıcıyı models/ altına kaydet ve seçilen model olarak işaretle"""
+    filename = classifier_filename(classifier.name)
+    classifier.save(os.path.join(models_dir, filename))
+    selection = dict(classifier=classifier.name, path=filename, feature_version=classifier.feature_version,
+                     mirror_handedness=classifier.mirror_handedness, classes=[str(label) for label in classifier.classes], **info)
+    with open(os.path.join(models_dir, SELECTION_FILE), 'w', encoding='utf-8') as f:
+        json.dump(selection, f, ensure_ascii=False, indent=2)
+    return selection
+
+
+def load_gesture_classifier(models_dir):
+    """Seçilen el hareketi sınıflandırıcısını yükle.
+
+    (sınıflandırıcı, model, scaler) döndürür; seçim yoksa ya da orman
+    seçiliyse load_compiled_forest ile aynıdır. Hiçbiri yoksa (None, None, None).
+    """
+    name = selected_classifier_name(models_dir)
+    if name == CompiledForest.name:
+        return load_compiled_forest(os.path.join(models_dir, 'hand_gesture_model.pkl'),
+                                    os.path.join(models_dir, 'hand_scaler.pkl'),
+                                    os.path.join(models_dir, classifier_filename(name)))
+    path = os.path.join(models_dir, classifier_filename(name))
+    if not os.path.exists(path):
+        print(f"UYARI: Seçilen el hareketi modeli bulunamadı: {path}")
+        return None, None, None
+    return GESTURE_CLASSIFIERS[name].load(path), None, None
+
+
+class HandGestureRecognizer:
+    """Sınıflandırıcı ve onun özellik sürümüyle (el işaretleri, el) -> (hareket, olasılık).
+
+    Bağlı bir metot değil düz bir nesne olduğu için çoklu kamera süreçlerine
+    pickle ile aktarılabilir. Sınıflandırıcı yoksa (None, None) döner.
+    """
+
+    def __init__(self, classifier, features=None):
+        self.classifier = classifier
+        if features is None:
+            if classifier is not None:
+                features = HandFeatureExtractor(classifier.feature_version, classifier.mirror_handedness)
+            else:
+                features = HandFeatureExtractor()
+        self.features = features
+
+    def __call__(self, hand_landmarks, handedness=None):
+        if self.classifier is None:
+            return None, None
+        return self.classifier.predict_one(self.features(hand_landmarks, handedness))
@@ -0,0 +1,98 @@
+import os
+import json
+import time
+import argparse
+import tempfile
+import numpy as np
+from sklearn.model_selection import train_test_split
+from benchmark_hand_classifier import time_per_call
+from gesture_classifiers import (GESTURE_CLASSIFIERS, classifier_filename, load_hand_dataset,
+                                 save_selected_classifier, train_gesture_classifier)
+from hand_features import FEATURE_VERSION
+
+
+def evaluate(name, X_train, y_train, X_test, y_test, calls, directory, mirror_handedness):
+    """Eğit, kaydet, yeniden yükle; doğruluk, tek çağrı gecikmesi, boyut ve yükleme süresi"""
+    start = time.perf_counter()
+    classifier = train_gesture_classifier(name, X_train, y_train, FEATURE_VERSION, mirror_handedness)
+    train_s = time.perf_counter() - start
+    path = os.path.join(directory, classifier_filename(name))
+    classifier.save(path)
+    # Yükleme, ana sistemin açılışta yaptığı gibi diskten (ilk okuma hariç) ölçülür
+    GESTURE_CLASSIFIERS[name].load(path)
+    start = time.perf_counter()
+    for _ in range(5):
+        loaded = GESTURE_CLASSIFIERS[name].load(path)
+    load_ms = (time.perf_counter() - start) / 5 * 1000
+    return {
+        "classifier": name,
+        "accuracy": float(np.mean(loaded.predict(X_test) == y_test)),
+        "latency_us": time_per_call(loaded.predict_one, X_test, calls),
+        "size_kb": os.path.getsize(path) / 1024,
+        "load_ms": load_ms,
+        "train_s": train_s,
+    }
+
+
+def choose(results, max_accuracy_drop):
+    """En iyi doğruluktan en fazla max_accuracy_drop geride olanlar arasında en hızlısı"""
+    best_accuracy = max(result["accuracy"] for result in results)
+    eligible = [result for result in results if result["accuracy"] >= best_accuracy - max_accuracy_drop]
+    return min(eligible, key=lambda result: result["latency_us"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="El hareketi sınıflandırıcıları: doğruluk / gecikme / boyut sıralaması")
+    parser.add_argument("--data", default="data/hands", help="El hareketi örnekleri klasörü")
+    parser.add_argument("--models-dir", default="models")
+    parser.add_argument("--classifiers", nargs="+", default=list(GESTURE_CLASSIFIERS), choices=list(GESTURE_CLASSIFIERS))
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--select", default=None, choices=["best"] + list(GESTURE_CLASSIFIERS),
+                        help="Seçilen modeli tüm veriyle eğitip models/ altına kaydet "
+                             "('best': doğruluk payı içindeki en hızlı model)")
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.01,
+                        help="'best' seçiminde en iyi doğruluktan kabul edilen kayıp")
+    parser.add_argument("--output", default="metrics/gesture_leaderboard.json")
+    args = parser.parse_args()
+
+    X, y, mirror_handedness = load_hand_dataset(args.data, FEATURE_VERSION)
+    if len(X) == 0:
+        print(f"HATA: {args.data} içinde el hareketi verisi bulunamadı")
+        raise SystemExit(1)
+    labels, counts = np.unique(y, return_counts=True)
+    stratify = y if counts.min() >= 2 else None
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=args.test_size, random_state=42,
+                                                        stratify=stratify)
+    print(f"{len(X)} örnek, {len(labels)} hareket (eğitim {len(X_train)}, test {len(X_test)}), "
+          f"özellik sürümü {FEATURE_VERSION}, sol el aynalama {'açık' if mirror_handedness else 'kapalı'}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = [evaluate(name, X_train, y_train, X_test, y_test, args.calls, directory, mirror_handedness)
+                   for name in args.classifiers]
+    results.sort(key=lambda result: (-result["accuracy"], result["latency_us"]))
+
+    print(f"{'sınıflandırıcı':<16}{'doğruluk':>10}{'µs/çağrı':>12}{'boyut KB':>12}{'yükleme ms':>12}{'eğitim sn':>12}")
+    for result in results:
+        print(f"{result['classifier']:<16}{result['accuracy']:>10.1%}{result['latency_us']:>12.0f}"
+              f"{result['size_kb']:>12.0f}{result['load_ms']:>12.1f}{result['train_s']:>12.1f}")
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({"time": time.time(), "samples": len(X), "feature_version": FEATURE_VERSION,
+                   "results": results}, f, ensure_ascii=False, indent=2)
+
+    if args.select:
+        if args.select == "best":
+            chosen = choose(results, args.max_accuracy_drop)
+        else:
+            chosen = next((result for result in results if result["classifier"] == args.select),
+                          {"classifier": args.select, "accuracy": None, "latency_us": None})
+        # Seçilen model tüm örneklerle yeniden eğitilir
+        classifier = train_gesture_classifier(chosen["classifier"], X, y, FEATURE_VERSION, mirror_handedness)
+        save_selected_classifier(classifier, args.models_dir, accuracy=chosen["accuracy"],
+                                 latency_us=chosen["latency_us"], selected_at=time.time())
+        print(f"Seçilen model: {chosen['classifier']} -> "
+              f"{os.path.join(args.models_dir, classifier_filename(chosen['classifier']))}")
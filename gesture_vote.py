@@ -0,0 +1,109 @@
+import time
+from collections import deque
+
+VOTE_MODES = ("k_of_n", "ewma")
+
+
+class GestureVoter:
+    """Son n el hareketi tahmininden kararlı hareket seçen oylama.
+
+    Tahminler (etiket, olasılık, zaman) olarak sabit boyutlu bir halkada
+    tutulur; el görünmeyen kareler etiket None ile eklenir. İki yöntem var:
+
+    - "k_of_n": son window tahminin en az min_votes tanesi aynı etiketse
+      (olasılığı min_probability'den büyük) o etiket aday olur.
+    - "ewma": her tahmin olasılığı × 0.5 ** (yaş / half_life) ağırlıkla
+      oylanır; bir etiketin ağırlık payı min_score'u geçerse aday olur.
+
+    Aday dwell saniye boyunca değişmeden kalırsa kabul edilir. Sınıflandırıcı
+    her interval karede bir çalıştırılır (should_classify).
+    """
+
+    def __init__(self, mode="k_of_n", window=8, min_votes=5, min_probability=0.40, half_life=0.5,
+                 min_score=0.5, dwell=0.5, interval=1):
+        if mode not in VOTE_MODES:
+            raise ValueError(f"Bilinmeyen oylama yöntemi: {mode}")
+        self.mode = mode
+        self.window = window
+        self.min_votes = min_votes
+        self.min_probability = min_probability
+        self.half_life = half_life
+        self.min_score = min_score
+        self.dwell = dwell
+        self.interval = max(1, int(interval))
+        self.predictions = deque(maxlen=window)
+        self._frames = 0
+        self.reset()
+
+    def reset(self):
+        """Oyları ve adayı temizle (yeni kullanıcı ya da doğrulama sonrası)"""
+        self.predictions.clear()
+        self.candidate = None
+        self.candidate_since = None
+        self.scores = {}
+        self.accepted = None
+
+    def should_classify(self):
+        """Bu karede sınıflandırıcı çalıştırılmalı mı (her interval karede bir)?"""
+        run = self._frames % self.interval == 0
+        self._frames += 1
+        return run
+
+    def add(self, label, probability=0.0, timestamp=None):
+        """Bir tahmin ekle ve güncel kararı döndür: (kabul edilen etiket ya da None, skor)"""
+        now = time.monotonic() if timestamp is None else timestamp
+        self.predictions.append((label, float(probability or 0.0), now))
+        return self.decide(now)
+
+    def _k_of_n_scores(self):
+        votes = {}
+        for label, probability, _ in self.predictions:
+            if label is not None and probability > self.min_probability:
+                votes[label] = votes.get(label, 0) + 1
+        # Skor: halkadaki oy oranı; aday olmak için min_votes gerekir
+        scores = {label: count / self.window for label, count in votes.items()}
+        winners = [label for label, count in votes.items() if count >= self.min_votes]
+        return scores, winners
+
+    def _ewma_scores(self, now):
+        total = 0.0
+        weights = {}
+        for label, probability, timestamp in self.predictions:
+            weight = 0.5 ** ((now - timestamp) / self.half_life)
+            total += weight
+            if label is not None and probability > self.min_probability:
+                weights[label] = weights.get(label, 0.0) + weight * probability
+        scores = {label: weight / total for label, weight in weights.items()} if total else {}
+        winners = [label for label, score in scores.items() if score >= self.min_score]
+        return scores, winners
+
+    def decide(self, now=None):
+        """Oyları say, adayı güncelle; dwell dolduysa (etiket, skor), yoksa (None, skor)"""
+        now = time.monotonic() if now is None else now
+        if self.mode == "k_of_n":
+            self.scores, winners = self._k_of_n_scores()
+        else:
+            self.scores, winners = self._ewma_scores(now)
+        best = max(winners, key=self.scores.get) if winners else None
+        if best != self.candidate:
+            self.candidate = best
+            self.candidate_since = now if best is not None else None
+            self.accepted = None
+        score = self.scores.get(best, 0.0) if best is not None else 0.0
+        if best is not None and now - self.candidate_since >= self.dwell:
+            self.accepted = best
+            return best, score
+        return None, score
+
+    def state(self, now=None):
+        """Hata ayıklama için oylama durumu (now, add'e verilen zamanlarla aynı saatte olmalı)"""
+        now = time.monotonic() if now is None else now
+        return {
+            "mode": self.mode,
+            "predictions": [(label, round(probability, 3), round(now - timestamp, 3))
+                            for label, probability, timestamp in self.predictions],
+            "scores": {label: round(score, 3) for label, score in self.scores.items()},
+            "candidate": self.candidate,
+            "candidate_for_s": now - self.candidate_since if self.candidate_since is not None else 0.0,
+            "accepted": self.accepted,
+        }
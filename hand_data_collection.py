@@ -7,6 +7,7 @@ from datetime import datetime
 import tkinter as tk
 from tkinter import messagebox, ttk
 import threading
+from hand_features import HandFeatureExtractor, detected_hands
 
 class HandDataCollector:
     def __init__(self):
@@ -26,6 +27,8 @@ class HandDataCollector:
             min_tracking_confidence=0.5
         )
         self.mp_drawing = mp.solutions.drawing_utils
+        # Özellikler eğitimle aynı modülle çıkarılır; ham işaretler de saklanır
+        self.hand_features = HandFeatureExtractor()
         
         # El hareketi türleri
         self.gesture_types = [
@@ -139,12 +142,9 @@ class HandDataCollector:
         self.status_label.config(text="Veri toplama durduruldu")
         self.progress_label.config(text="0 / " + str(self.max_gestures))
     
-    def extract_hand_features(self, hand_landmarks):
-        """El landmark'larından özellik çıkar"""
-        features = []
-        for landmark in hand_landmarks.landmark:
-            features.extend([landmark.x, landmark.y, landmark.z])
-        return features
+    def extract_hand_features(self, hand_landmarks, handedness=None):
+        """El landmark'larından kaydedilecek özellik alanlarını çıkar"""
+        return self.hand_features.record(hand_landmarks, handedness)
     
     def camera_loop(self):
         """Kamera döngüsü"""
@@ -166,12 +166,12 @@ class HandDataCollector:
             results = self.hands.process(rgb_frame)
             
             if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
+                for hand_landmarks, handedness in detected_hands(results):
                     # El çizgilerini çiz
                     self.mp_drawing.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
                     
                     # El özelliklerini çıkar
-                    features = self.extract_hand_features(hand_landmarks)
+                    features = self.extract_hand_features(hand_landmarks, handedness)
                     
                     # Kaydetme koşulları
                     current_time = cv2.getTickCount() / cv2.getTickFrequency()
@@ -198,8 +198,8 @@ class HandDataCollector:
                         data = {
                             "person": self.current_person,
                             "gesture": self.current_gesture,
-                            "features": features,
-                            "timestamp": timestamp
+                            "timestamp": timestamp,
+                            **features
                         }
                         
                         with open(filepath, 'w') as f:
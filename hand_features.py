@@ -0,0 +1,148 @@
+import threading
+from itertools import chain
+from operator import attrgetter
+import numpy as np
+
+LANDMARK_COUNT = 21
+WRIST = 0
+MIDDLE_MCP = 9
+
+# Yeni eğitilen modellerin kullandığı özellik sürümü. Eğitilmiş model kendi
+# sürümünü taşır (feature_version); tahmin her zaman modelin sürümüyle yapılır.
+FEATURE_VERSION = 2
+
+# Sol el x ekseninde aynalanır; iki el de sağ el gibi görünür. Aynalama
+# sadece el bilgisiyle eğitilmiş modellerde yapılır (mirror_handedness):
+# el bilgisi olmayan eski kayıtlarla eğitilen model aynalanmamış el görmüştür
+MIRRORED_HANDEDNESS = "Left"
+
+_xyz = attrgetter("x", "y", "z")
+
+
+def landmarks_to_array(hand_landmarks, out=None):
+    """MediaPipe el işaretlerini (21, 3) float32 diziye yaz (out verilirse ona)"""
+    if out is None:
+        out = np.empty((LANDMARK_COUNT, 3), dtype=np.float32)
+    out.reshape(-1)[:] = list(chain.from_iterable(map(_xyz, hand_landmarks.landmark)))
+    return out
+
+
+def handedness_label(handedness):
+    """"Left" / "Right" ya da None (MediaPipe ClassificationList veya metin kabul eder)"""
+    if handedness is None or isinstance(handedness, str):
+        return handedness
+    return handedness.classification[0].label
+
+
+def detected_hands(results):
+    """MediaPipe sonucundaki her el için (hand_landmarks, "Left"/"Right"/None)"""
+    hands = results.multi_hand_landmarks or []
+    handedness = results.multi_handedness or [None] * len(hands)
+    return [(landmarks, handedness_label(label)) for landmarks, label in zip(hands, handedness)]
+
+
+def _raw_features(points, mirror):
+    """Sürüm 1: görüntü koordinatlarında x, y, z (eski modeller)"""
+    return points.reshape(points.shape[:-2] + (LANDMARK_COUNT * 3,)).copy()
+
+
+def _normalized_features(points, mirror):
+    """Sürüm 2: bileğe göre, avuç boyuyla ölçeklenmiş, sol el aynalanmış"""
+    relative = points - points[..., WRIST:WRIST + 1, :]
+    if mirror.any():
+        relative[..., 0] *= np.where(mirror, np.float32(-1), np.float32(1))[..., None]
+    palm = relative[..., MIDDLE_MCP, :]
+    palm_size = np.sqrt(np.einsum('...i,...i->...', palm, palm))
+    relative /= np.maximum(palm_size, np.float32(1e-6))[..., None, None]
+    return relative.reshape(points.shape[:-2] + (LANDMARK_COUNT * 3,))
+
+
+FEATURE_TRANSFORMS = {
+    1: _raw_features,
+    2: _normalized_features,
+}
+
+
+def compute_features(points, version=FEATURE_VERSION, handedness=None):
+    """(21, 3) ya da (N, 21, 3) işaretlerden sürümün özellik vektör(ler)i.
+
+    handedness tek el için metin, N el için metin listesi olabilir.
+    """
+    if version not in FEATURE_TRANSFORMS:
+        raise ValueError(f"Bilinmeyen el özelliği sürümü: {version}")
+    points = np.asarray(points, dtype=np.float32)
+    if points.ndim == 2:
+        mirror = np.asarray(handedness_label(handedness) == MIRRORED_HANDEDNESS)
+    else:
+        labels = handedness if handedness is not None else [None] * len(points)
+        mirror = np.array([handedness_label(label) == MIRRORED_HANDEDNESS for label in labels])
+    return FEATURE_TRANSFORMS[version](points, mirror)
+
+
+class HandFeatureExtractor:
+    """Eğitim ve tahminde ortak kullanılan el özelliği çıkarıcı.
+
+    İşaretler thread başına önceden ayrılmış (21, 3) diziye yazılır ve
+    version'ın dönüşümü uygulanır. Tahminde sürüm ve mirror_handedness
+    modelden alınır, böylece model hangi dönüşümle eğitildiyse aynısı
+    kullanılır; mirror_handedness False ise el bilgisi yok sayılır.
+    """
+
+    def __init__(self, version=FEATURE_VERSION, mirror_handedness=True):
+        if version not in FEATURE_TRANSFORMS:
+            raise ValueError(f"Bilinmeyen el özelliği sürümü: {version}")
+        self.version = version
+        self.mirror_handedness = mirror_handedness
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # Thread tamponları süreçler arasında taşınmaz (spawn ile çoklu kamera)
+        return {"version": self.version, "mirror_handedness": self.mirror_handedness}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def points(self, hand_landmarks):
+        """Bu thread'in tamponuna yazılmış (21, 3) işaretler (sonraki çağrıda ezilir)"""
+        buffer = getattr(self._local, "points", None)
+        if buffer is None:
+            buffer = self._local.points = np.empty((LANDMARK_COUNT, 3), dtype=np.float32)
+        return landmarks_to_array(hand_landmarks, buffer)
+
+    def __call__(self, hand_landmarks, handedness=None):
+        """El işaretlerinden (63,) özellik vektörü"""
+        return compute_features(self.points(hand_landmarks), self.version,
+                                handedness if self.mirror_handedness else None)
+
+    def record(self, hand_landmarks, handedness=None):
+        """Veri toplama JSON'una eklenecek alanlar.
+
+        Ham işaretler de saklanır; model başka bir sürümle eğitilirken
+        özellikler onlardan yeniden hesaplanır.
+        """
+        points = self.points(hand_landmarks)
+        return {
+            "features": compute_features(points, self.version, handedness).tolist(),
+            "feature_version": self.version,
+            "landmarks": points.tolist(),
+            "handedness": handedness_label(handedness),
+        }
+
+
+def features_from_record(data, version=FEATURE_VERSION, mirror_handedness=True):
+    """Kayıtlı bir örnekten version sürümünün özellikleri; hesaplanamazsa None.
+
+    mirror_handedness False ise kayıttaki el bilgisi yok sayılır (aynalama yok).
+
+    Eski kayıtlarda sadece sürüm 1 (ham x, y, z) "features" bulunur; ham
+    işaretler onlardan geri elde edilir.
+    """
+    points = data.get("landmarks")
+    if points is None and data.get("feature_version", 1) == 1 and "features" in data:
+        points = np.asarray(data["features"], dtype=np.float32).reshape(LANDMARK_COUNT, 3)
+    if points is None:
+        if data.get("feature_version") == version and "features" in data:
+            return np.asarray(data["features"], dtype=np.float32)
+        return None
+    return compute_features(points, version, data.get("handedness") if mirror_handedness else None)
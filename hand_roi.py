@@ -0,0 +1,140 @@
+def face_anchored_region(face_box, frame_shape, side=1.5, above=0.5, below=2.5):
+    """Yüz kutusundan el arama bölgesi (tam çözünürlükte top, right, bottom, left).
+
+    El hareketi yüzün yanında ve altında yapılır: bölge her yana side,
+    yukarı above, aşağı below yüz boyu kadar genişletilip kareyle kırpılır.
+    """
+    height, width = frame_shape[:2]
+    top, right, bottom, left = face_box
+    face_w, face_h = right - left, bottom - top
+    return (max(0, int(top - above * face_h)), min(width, int(right + side * face_w)),
+            min(height, int(bottom + below * face_h)), max(0, int(left - side * face_w)))
+
+
+def map_landmarks_to_frame(hand_landmarks, region, frame_shape):
+    """Kırpılmış bölgede bulunan normalize işaretleri yerinde tam kare koordinatlarına çevir.
+
+    MediaPipe x, y'yi girdi görüntüsünün boyuna, z'yi genişliğine göre
+    normalize eder; küçültme oranı bu yüzden sonucu etkilemez.
+    """
+    height, width = frame_shape[:2]
+    top, right, bottom, left = region
+    crop_w, crop_h = right - left, bottom - top
+    for landmark in hand_landmarks.landmark:
+        landmark.x = (landmark.x * crop_w + left) / width
+        landmark.y = (landmark.y * crop_h + top) / height
+        landmark.z = landmark.z * crop_w / width
+    return hand_landmarks
+
+
+class HandSearchRegion:
+    """El aramasını doğrulanmış yüzün çevresiyle sınırlar.
+
+    MediaPipe'a tam kare yerine son yüz kutusundan türetilen bölge, uzun
+    kenarı max_side pikseli geçmeyecek şekilde küçültülerek verilir; bulunan
+    işaretler tam kare koordinatlarına çevrilir. MediaPipe kareler arası el
+    izini girdi koordinatlarında tuttuğu için bölge yüz değişene kadar sabit
+    kalır. Bölgede max_misses kez üst üste el bulunamazsa bir kez tüm kare
+    işlenir; orada bulunan el bölgeye katılır. Bu tek kareler bölge izini
+    bozmasın diye fallback_factory'nin kurduğu ayrı bir Hands nesnesiyle
+    (tercihen static_image_mode) işlenir. Bölge karenin max_area_ratio'sundan
+    büyükse kırpma yapılmaz, her kare tüm karede işlenir.
+    """
+
+    def __init__(self, max_side=320, side=1.5, above=0.5, below=2.5, max_misses=10,
+                 max_area_ratio=0.5, fallback_factory=None):
+        self.max_side = max_side
+        self.side = side
+        self.above = above
+        self.below = below
+        self.max_misses = max_misses
+        self.max_area_ratio = max_area_ratio
+        self.fallback_factory = fallback_factory
+        self._fallback_hands = None
+        self.reset()
+
+    def reset(self):
+        """Yüzü unut; yeni bir yüz verilene kadar tüm kare işlenir"""
+        self.face_box = None
+        self.region = None
+        self.misses = 0
+        self.full_frames = 0
+        self.region_frames = 0
+
+    def anchor(self, face_box):
+        """Doğrulanan yüzün kutusunu (tam çözünürlük top, right, bottom, left) bildir"""
+        self.face_box = face_box
+        self.region = None
+        self.misses = 0
+
+    def current_region(self, frame_shape):
+        """Arama bölgesi ve MediaPipe'a verilecek (genişlik, yükseklik); yüz yoksa (None, None)"""
+        if self.region is None and self.face_box is not None:
+            self.region = face_anchored_region(self.face_box, frame_shape, self.side, self.above, self.below)
+        if self.region is None:
+            return None, None
+        top, right, bottom, left = self.region
+        crop_w, crop_h = right - left, bottom - top
+        if crop_w <= 0 or crop_h <= 0:
+            return None, None
+        # Kareden belirgin küçük değilse kırpma ve küçültme kazandırmaz
+        if crop_w * crop_h > self.max_area_ratio * frame_shape[0] * frame_shape[1]:
+            return None, None
+        scale = min(1.0, self.max_side / max(crop_w, crop_h))
+        return self.region, (max(1, int(round(crop_w * scale))), max(1, int(round(crop_h * scale))))
+
+    def process(self, hands, context):
+        """hands.process'i bölgede (gerekirse tüm karede) çalıştır; işaretler tam kare koordinatlarında"""
+        frame_shape = context.frame.shape
+        region, size = self.current_region(frame_shape)
+        if region is None:
+            # Bölge yok ya da kareden belirgin küçük değil: her kare tüm karede
+            self.full_frames += 1
+            return hands.process(context.rgb())
+
+        if self.misses < self.max_misses:
+            self.region_frames += 1
+            results = hands.process(context.region_rgb(region, size))
+            if results.multi_hand_landmarks:
+                for hand_landmarks in results.multi_hand_landmarks:
+                    map_landmarks_to_frame(hand_landmarks, region, frame_shape)
+                self.misses = 0
+            else:
+                self.misses += 1
+            return results
+
+        # Bölgede uzun süredir el yok: tek kare tüm karede, ayrı Hands nesnesiyle
+        self.full_frames += 1
+        self.misses = 0
+        results = self._fallback(hands).process(context.rgb())
+        if results.multi_hand_landmarks:
+            self._include(results.multi_hand_landmarks, frame_shape)
+        return results
+
+    def _fallback(self, hands):
+        if self.fallback_factory is None:
+            return hands
+        if self._fallback_hands is None:
+            self._fallback_hands = self.fallback_factory()
+        return self._fallback_hands
+
+    def close(self):
+        """Tüm kare yedeği için kurulan Hands nesnesini kapat"""
+        if self._fallback_hands is not None:
+            self._fallback_hands.close()
+            self._fallback_hands = None
+
+    def _include(self, hand_landmarks_list, frame_shape):
+        """Tüm karede bulunan eli (kutusunun yarısı kadar pay bırakarak) bölgeye kat"""
+        height, width = frame_shape[:2]
+        top, right, bottom, left = self.region
+        for hand_landmarks in hand_landmarks_list:
+            xs = [landmark.x * width for landmark in hand_landmarks.landmark]
+            ys = [landmark.y * height for landmark in hand_landmarks.landmark]
+            pad = max(max(xs) - min(xs), max(ys) - min(ys)) * 0.5
+            top, bottom = min(top, int(min(ys) - pad)), max(bottom, int(max(ys) + pad))
+            left, right = min(left, int(min(xs) - pad)), max(right, int(max(xs) + pad))
+        self.region = (max(0, top), min(width, right), min(height, bottom), max(0, left))
+
+    def report(self):
+        return {"region": self.region, "region_frames": self.region_frames, "full_frames": self.full_frames}
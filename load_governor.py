@@ -0,0 +1,159 @@
+import os
+import json
+import time
+from collections import deque
+
+# Yük altında sırayla devreye giren kısıtlamalar:
+# (k: her k. kare işlenir, el çizgileri çizilsin mi, tespit ölçeği tavanı)
+GOVERNOR_LEVELS = (
+    (1, True, None),
+    (1, False, None),
+    (1, False, 0.25),
+    (2, False, 0.25),
+    (3, False, 0.1875),
+    (4, False, 0.125),
+)
+
+
+class LoadGovernor:
+    """Makine yüklüyken giriş döngüsünü gecikme ve CPU bütçesinde tutan denetleyici.
+
+    interval saniyede bir o aralıkta biten karelerin p95 uçtan uca gecikmesi slo_ms ile,
+    sürecin CPU payı (tüm çekirdeklere oranla) cpu_budget ile karşılaştırılır.
+    Biri aşılırsa bir seviye kısıtlanır (GOVERNOR_LEVELS: önce el çizgileri
+    kapanır, sonra tespit ölçeği düşer, en son her k. kare işlenir); ikisi de
+    rahatsa (gecikme < %70, CPU < %80) relax_after ölçüm sonra bir seviye
+    gevşetilir. Her karar decisions'a eklenir ve log_path'e JSON satırı yazılır.
+    """
+
+    def __init__(self, slo_ms=200.0, cpu_budget=0.8, interval=1.0, relax_after=3, levels=GOVERNOR_LEVELS,
+                 log_path="metrics/governor_log.jsonl"):
+        self.slo_ms = slo_ms
+        # 0 / None: CPU bütçesi uygulanmaz, sadece gecikme izlenir
+        self.cpu_budget = cpu_budget
+        self.interval = interval
+        self.relax_after = relax_after
+        self.levels = levels
+        self.log_path = log_path
+        self.level = 0
+        self.latencies = []
+        self.decisions = deque(maxlen=200)
+        self.level_time = [0.0] * len(levels)
+        self.frames_seen = 0
+        self.frames_skipped = 0
+        self.changes = 0
+        self._calm = 0
+        self._cpu_count = os.cpu_count() or 1
+        now = time.monotonic()
+        self._last_update = now
+        self._level_since = now
+        self._last_cpu = time.process_time()
+
+    @property
+    def skip(self):
+        return self.levels[self.level][0]
+
+    @property
+    def draw_landmarks(self):
+        return self.levels[self.level][1]
+
+    @property
+    def scale_cap(self):
+        return self.levels[self.level][2]
+
+    def should_process(self):
+        """Bu kare ağır aşamalara gönderilmeli mi (her k. kare)?"""
+        process = self.frames_seen % self.skip == 0
+        self.frames_seen += 1
+        if not process:
+            self.frames_skipped += 1
+        return process
+
+    def observe_latency(self, latency_ms):
+        """Bitmiş bir karenin uçtan uca gecikmesini bildir"""
+        self.latencies.append(latency_ms)
+
+    def _p95(self):
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+    def update(self):
+        """Süre dolduysa yükü ölç ve seviyeyi ayarla; seviye değiştiyse kararı döndür"""
+        now = time.monotonic()
+        elapsed = now - self._last_update
+        if elapsed < self.interval:
+            return None
+        cpu_now = time.process_time()
+        cpu = (cpu_now - self._last_cpu) / elapsed / self._cpu_count
+        self._last_cpu = cpu_now
+        self._last_update = now
+        if not self.latencies:
+            # Bu aralıkta kare bitmedi (ör. boşta); karar verilmez
+            return None
+        p95 = self._p95()
+        self.latencies = []
+
+        reasons = []
+        if self.slo_ms and p95 > self.slo_ms:
+            reasons.append(f"p95 {p95:.0f} ms > {self.slo_ms:.0f} ms")
+        if self.cpu_budget and cpu > self.cpu_budget:
+            reasons.append(f"CPU %{cpu * 100:.0f} > %{self.cpu_budget * 100:.0f}")
+        calm = (not self.slo_ms or p95 < 0.7 * self.slo_ms) and (not self.cpu_budget or cpu < 0.8 * self.cpu_budget)
+
+        level = self.level
+        if reasons:
+            self._calm = 0
+            level = min(self.level + 1, len(self.levels) - 1)
+        elif calm:
+            self._calm += 1
+            if self._calm >= self.relax_after and self.level > 0:
+                self._calm = 0
+                level = self.level - 1
+                reasons.append("yük düştü")
+        else:
+            self._calm = 0
+        if level == self.level:
+            return None
+
+        self.level_time[self.level] += now - self._level_since
+        self._level_since = now
+        self.level = level
+        self.changes += 1
+        decision = {
+            "time": time.time(),
+            "level": level,
+            "skip": self.skip,
+            "draw_landmarks": self.draw_landmarks,
+            "scale_cap": self.scale_cap,
+            "p95_ms": round(p95, 1),
+            "cpu": round(cpu, 3),
+            "reason": ", ".join(reasons),
+        }
+        self.decisions.append(decision)
+        self._log(decision)
+        return decision
+
+    def _log(self, decision):
+        if not self.log_path:
+            return
+        try:
+            directory = os.path.dirname(self.log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(decision, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"UYARI: Yük kararı yazılamadı: {e}")
+
+    def report(self):
+        """Seviyelerde geçen süre (sn) ve atlanan kare oranı"""
+        level_time = list(self.level_time)
+        level_time[self.level] += time.monotonic() - self._level_since
+        return {
+            "level": self.level,
+            "level_time_s": level_time,
+            "changes": self.changes,
+            "skip_rate": self.frames_skipped / self.frames_seen if self.frames_seen else 0.0,
+        }
@@ -21,6 +21,26 @@ import re
 import urllib.parse
 import subprocess
 import takvim_db
+from face_encoding_cache import FaceEncodingCache
+from face_gallery import FaceGallery
+from face_embedders import create_face_embedder, load_embedder_config
+from face_enrollment import ParallelFaceEncoder
+from face_tracker import FaceTracker
+from detection_scale import DetectionScaleController
+from face_roi import FaceSearchRegion
+from hand_roi import HandSearchRegion
+from face_detectors import create_face_detector, load_detector_config
+from frame_capture import SessionRecorder, open_frame_source
+from frame_pipeline import FramePipeline, PipelineStage
+from pipeline_metrics import PipelineMetrics
+from multi_camera import (CameraSession, MultiCameraProcessRunner, MultiCameraRunner, PersonGestureCheck,
+                          SharedRecognition, create_hands, detect_faces)
+from frame_context import FrameBufferPool, FrameContext
+from motion_gate import MotionGate
+from load_governor import LoadGovernor
+from gesture_classifiers import HandGestureRecognizer, load_gesture_classifier
+from hand_features import HandFeatureExtractor, detected_hands
+from gesture_vote import GestureVoter
 import signal
 try:
     import screen_brightness_control as sbc
@@ -44,6 +64,19 @@ except ImportError:
     sd = None
 import matplotlib.pyplot as plt
 
+# Kişiye özel giriş hareketleri (listede olmayanlar için "A")
+PERSON_GESTURES = {
+    "ataturk": "A",
+    "cemyilmaz": "B",
+    "centralcee": "C",
+    "esterexposite": "D",
+    "lebronjames": "E",
+    "ricardoquaresma": "F",
+    "stephencurry": "G",
+    "sude": "H",
+    "travisscott": "I",
+}
+
 def safe_print(*args, **kwargs):
     try:
         print(*args, **kwargs)
@@ -66,29 +99,83 @@ class MainSystem:
         self.face_detection_start = None
         self.face_detection_threshold = 5.0  # 5 saniye
         
+        # Yüz izleme (detect_interval=1: her karede tam tespit)
+        self.face_tracker = FaceTracker(detect_interval=5, min_margin=0.05)
+        # Yüz dedektörü face_detector.json'daki "backend" ayarıyla seçilir
+        self.detector_config = load_detector_config()
+        self.face_detector = create_face_detector(self.detector_config)
+        # Yüz tespit ölçeği (kare başına gecikme bütçesi ms)
+        self.scale_controller = DetectionScaleController(budget_ms=40.0)
+        # Yüz arama bölgesi (15 karede bir tüm kare taranır)
+        self.face_search = FaceSearchRegion(expand=0.75, full_sweep_interval=15)
+        # hand_roi açıksa MediaPipe'a tam kare yerine doğrulanan yüzün çevresi,
+        # uzun kenarı hand_roi_size piksele küçültülerek verilir
+        self.hand_roi = False
+        self.hand_roi_size = 320
+        self.hand_search = None
+        # Kare işleme aşamaları arası kuyruk boyu ve dolu kuyruk politikası
+        # ("drop_oldest": en taze kare öne geçer, "block", "drop_newest")
+        self.pipeline_queue_size = 2
+        self.pipeline_drop_policy = "drop_oldest"
+        self.pipeline = None
+        # Kare başına küçük / RGB görüntüler bu havuzdaki tamponlara yazılır
+        self.frame_buffers = FrameBufferPool()
+        # Kare kaynağı: kamera numarası, video dosyası, fotoğraf ya da oturum klasörü
+        self.frame_source = 0
+        self.source_realtime = True  # False: dosya kaynakları olabildiğince hızlı okunur
+        # True: yakalama ayrı süreçte, kareler paylaşılan bellek halkasıyla kopyasız gelir
+        self.shared_memory_capture = False
+        # Çoklu kamerada "processes": kamera başına süreç, "threads": tek süreçte thread havuzu
+        self.camera_mode = "processes"
+        self.record_session_dir = None  # Verilirse kameradan gelen kareler buraya kaydedilir
+        # Hareket kapısı: idle_after sn hareket / yüz yoksa tespit durur, kamera
+        # idle_fps hızında yoklanır; ilk harekette hemen uyanır (0: kapalı)
+        self.idle_after = 10.0
+        self.idle_fps = 2.0
+        self.motion_gate = None
+        # Yük denetleyicisi: p95 gecikme latency_slo_ms'yi ya da süreç CPU payı
+        # cpu_budget'ı aşarsa el çizgileri kapanır, ölçek düşer, kare atlanır
+        self.load_governor_enabled = True
+        self.latency_slo_ms = 200.0
+        self.cpu_budget = 0.8
+        self.load_governor = None
+        self.draw_hand_landmarks = True
+        # El hareketi tek karede değil, son tahminlerin oylamasıyla kabul edilir:
+        # "k_of_n" (son gesture_window tahminin gesture_min_votes'u) ya da "ewma";
+        # kazanan gesture_dwell sn değişmemeli. Sınıflandırıcı her
+        # gesture_interval karede bir çalışır
+        self.gesture_vote_mode = "k_of_n"
+        self.gesture_window = 8
+        self.gesture_min_votes = 5
+        self.gesture_dwell = 0.5
+        self.gesture_interval = 2
+        self.gesture_voter = None
+        self._last_hands = []
+        self._last_vote = None
+        # Başsız mod: çizim ve pencere yok, durum olaylarla bildirilir.
+        # preview_fps verilirse başsız modda bu hızda kopyaya çizilip gösterilir
+        self.headless = False
+        self.preview_fps = None
+        self.event_listeners = []
+        # Aşama gecikme histogramları ve FPS; 5 sn'de bir metrics/ altına JSON ve
+        # Prometheus biçiminde yazılır, arayüz self.metrics.snapshot() ile okur
+        self.metrics = PipelineMetrics(json_path="metrics/login_metrics.json",
+                                       prometheus_path="metrics/login_metrics.prom", export_interval=5.0)
+        # Kimlik önbelleğinin tespit / atlanan encoding sayıları da bu metriklere yazılır
+        self.face_tracker.metrics = self.metrics
+        
         # MediaPipe el tanıma
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
+        self.hands = self.create_hands()
         self.mp_drawing = mp.solutions.drawing_utils
         
-        # Ses tanıma ve sentezleme
+        # Ses tanıma ve sentezleme. Mikrofon ve konuşma motoru ilk
+        # kullanıldıklarında açılır; ses aygıtı olmayan sunucularda (--headless)
+        # sistem açılırken çökmez
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
-        self.engine = pyttsx3.init()
-        
-        # Türkçe ses ayarları
-        voices = self.engine.getProperty('voices')
-        for voice in voices:
-            if 'turkish' in voice.name.lower() or 'türkçe' in voice.name.lower():
-                self.engine.setProperty('voice', voice.id)
-                break
-        
-        self.engine.setProperty('rate', 150)
+        self._microphone = None
+        self._engine = None
+        self._engine_failed = False
         
         # Veri dizinleri
         self.face_data_dir = "data/faces"
@@ -96,13 +183,28 @@ class MainSystem:
         self.models_dir = "models"
         
         # Yüz tanıma değişkenleri
-        self.known_face_encodings = []
-        self.known_face_names = []
+        # Yüz embedding arka ucu face_embedder.json'daki "backend" ayarıyla seçilir
+        self.embedder_config = load_embedder_config()
+        self.face_embedder = create_face_embedder(self.embedder_config)
+        backend = self.face_embedder.name
+        # Ana sistem kişi başına ilk 3 fotoğrafı eşler; face_hand_recognition'ın
+        # tüm fotoğrafları tutan önbelleğini ve indeksini silmemesi için ayrı dosyalar kullanılır
+        self.face_gallery = FaceGallery(tolerance=self.face_embedder.tolerance, backend=backend,
+                                        index_path=os.path.join(self.models_dir, f'face_index_main_{backend}.npz'))
+        self.last_face_matches = []
+        self.face_cache = FaceEncodingCache(self.models_dir, backend=backend, prefix="face_encodings_main")
+        self.enrollment_workers = None  # None: tüm çekirdekler
         
         # El hareketi tanıma değişkenleri
         self.hand_gesture_model = None
         self.scaler = None
-        
+        # Tahmin sklearn'süz yapılır; varsayılan dizilere çevrilmiş orman
+        # (models/hand_gesture_model.npz), gesture_leaderboard.py başka model seçebilir
+        self.hand_classifier = None
+        # Özellik dönüşümü modelin eğitildiği sürümle aynı olmalı (load_hand_model ayarlar)
+        self.hand_features = HandFeatureExtractor()
+        self.person_gesture_check = PersonGestureCheck(PERSON_GESTURES)
+
         # Komut eşleştirmeleri
         self.commands = {
             
@@ -208,95 +310,131 @@ class MainSystem:
             print("Yüz veri dizini bulunamadı!")
             return
         
+        items = []
         for person_name in os.listdir(self.face_data_dir):
             person_dir = os.path.join(self.face_data_dir, person_name)
             if os.path.isdir(person_dir):
                 image_files = [f for f in os.listdir(person_dir) if f.endswith('.jpg')]
                 
-                for i, image_file in enumerate(image_files[:3]):  # İlk 3 fotoğrafı al
-                    image_path = os.path.join(person_dir, image_file)
-                    try:
-                        image = face_recognition.load_image_file(image_path)
-                        face_encodings = face_recognition.face_encodings(image)
-                        
-                        if face_encodings:
-                            self.known_face_encodings.append(face_encodings[0])
-                            self.known_face_names.append(person_name)
-                            print(f"Yüz yüklendi: {person_name}")
-                    except Exception as e:
-                        print(f"Yüz yükleme hatası: {e}")
+                for image_file in image_files[:3]:  # İlk 3 fotoğrafı al
+                    items.append((os.path.join(person_dir, image_file), person_name))
+        
+        # Sadece yeni veya değişen fotoğraflar encode edilir
+        encoder = ParallelFaceEncoder(self.embedder_config, self.face_embedder.encode_file,
+                                      max_workers=self.enrollment_workers)
+        # Önbellekteki yüzler hemen, yeni encode edilenler bittikçe galeriye akar;
+        # galeri bir sonraki sorguda tek seferde yeniden kurulur
+        self.face_gallery.set([], [], backend=self.face_cache.backend)
+        _, names = self.face_cache.sync(items, encoder=encoder, on_encodings=self.face_gallery.add)
+        print(f"Toplam {len(names)} yüz yüklendi")
     
     def load_hand_model(self):
         """El hareketi modelini yükle"""
-        model_path = os.path.join(self.models_dir, 'hand_gesture_model.pkl')
-        scaler_path = os.path.join(self.models_dir, 'hand_scaler.pkl')
-        
-        if os.path.exists(model_path) and os.path.exists(scaler_path):
-            with open(model_path, 'rb') as f:
-                self.hand_gesture_model = pickle.load(f)
-            with open(scaler_path, 'rb') as f:
-                self.scaler = pickle.load(f)
-            print("El hareketi modeli yüklendi")
+        # Seçilen sınıflandırıcı models/hand_gesture_model.json'da (yoksa orman)
+        self.hand_classifier, self.hand_gesture_model, self.scaler = load_gesture_classifier(self.models_dir)
+        if self.hand_classifier is not None:
+            self.hand_features = HandFeatureExtractor(self.hand_classifier.feature_version,
+                                                      self.hand_classifier.mirror_handedness)
+            print(f"El hareketi modeli yüklendi ({self.hand_classifier.name}, "
+                  f"özellik sürümü {self.hand_classifier.feature_version})")
         else:
             print("El hareketi modeli bulunamadı!")
     
     def recognize_face(self, frame):
         """Yüz tanıma"""
-        if not self.known_face_encodings:
+        if len(self.face_gallery) == 0:
             return None, None
         
-        small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
-        rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-        
-        face_locations = face_recognition.face_locations(rgb_small_frame)
-        face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
+        face_locations, identify = self.detect_faces(frame)
+        self.last_face_matches = identify(range(len(face_locations)))
+        face_names = [match.name for match in self.last_face_matches]
         
-        face_names = []
-        for face_encoding in face_encodings:
-            matches = face_recognition.compare_faces(self.known_face_encodings, face_encoding, tolerance=0.6)
-            name = "Bilinmeyen"
-            
-            if True in matches:
-                first_match_index = matches.index(True)
-                name = self.known_face_names[first_match_index]
-            
-            face_names.append(name)
+        return face_locations, face_names
+    
+    def detect_faces(self, frame, context=None):
+        """Yüzleri bul; encoding sadece istenen yüzler için sonradan yapılır.
         
-        face_locations = [(top * 4, right * 4, bottom * 4, left * 4) for top, right, bottom, left in face_locations]
+        (konumlar, identify) döndürür; identify(indeksler) o yüzleri encode edip
+        galeriyle eşleştirir ve FaceMatch listesi döndürür.
+        """
+        return detect_faces(frame, self.scale_controller, self.face_search, self.face_detector,
+                            self.face_embedder, self.face_gallery, self.metrics, context)
+    
+    def add_event_listener(self, callback):
+        """Durum olaylarını dinle: callback(olay) bir sözlük alır ("event", "time", ...)"""
+        self.event_listeners.append(callback)
+    
+    def emit_event(self, event, **data):
+        """Giriş akışındaki durum değişikliğini dinleyicilere bildir"""
+        data.update(event=event, time=time.time())
+        for callback in self.event_listeners:
+            try:
+                callback(data)
+            except Exception as e:
+                safe_print(f"UYARI: Olay dinleyicisi hata verdi ({event}): {e}")
+    
+    def update_face_verification(self, tracks):
+        """İzlerin doğrulama sayaçlarına göre kullanıcıyı ve yüz doğrulamasını güncelle"""
+        known = [track for track in tracks if track.name != "Bilinmeyen"]
+        if not known:
+            if self.current_user is not None:
+                self.emit_event("user_lost", user=self.current_user)
+            self.current_user = None
+            self.face_detection_start = None
+            return
         
-        return face_locations, face_names
+        # En uzun süredir kamerada olan tanınmış yüz öne çıkar
+        track = max(known, key=lambda t: t.elapsed())
+        if self.current_user != track.name:
+            self.hand_verified = False
+            self.reset_gesture_votes()
+            self.emit_event("user_detected", user=track.name, track_id=track.track_id)
+        self.current_user = track.name
+        self.face_detection_start = track.verify_start
+        if track.elapsed() >= self.face_detection_threshold:
+            self.face_verified = True
+            self.face_detection_start = None
+            if self.hand_search is not None:
+                self.hand_search.anchor(track.box)
+            self.emit_event("face_verified", user=track.name)
     
-    def recognize_hand_gesture(self, hand_landmarks):
+    def recognize_hand_gesture(self, hand_landmarks, handedness=None):
         """El hareketi tanıma"""
-        if self.hand_gesture_model is None or self.scaler is None:
+        if self.hand_classifier is None:
             return None, None
         
-        features = []
-        for landmark in hand_landmarks.landmark:
-            features.extend([landmark.x, landmark.y, landmark.z])
-        
-        features_scaled = self.scaler.transform([features])
-        prediction = self.hand_gesture_model.predict(features_scaled)[0]
-        probability = np.max(self.hand_gesture_model.predict_proba(features_scaled))
-        
-        return prediction, probability
+        features = self.hand_features(hand_landmarks, handedness)
+        # Ölçekleme, etiket ve olasılık tek geçişte (sklearn ile aynı sonuç)
+        return self.hand_classifier.predict_one(features)
     
     def check_person_gesture(self, person_name, gesture):
         """Kişiye özel el hareketi kontrolü"""
-        person_gestures = {
-            "ataturk": "A",
-            "cemyilmaz": "B",
-            "centralcee": "C",
-            "esterexposite": "D",
-            "lebronjames": "E",
-            "ricardoquaresma": "F",
-            "stephencurry": "G",
-            "sude": "H",
-            "travisscott": "I",
-        }
-        expected_gesture = person_gestures.get(person_name.lower(), "A")
-        # Karşılaştırmayı büyük harfe çevirerek yap
-        return (gesture or "").upper() == expected_gesture.upper()
+        return self.person_gesture_check(person_name, gesture)
+    
+    @property
+    def microphone(self):
+        if self._microphone is None:
+            self._microphone = sr.Microphone()
+        return self._microphone
+    
+    @property
+    def engine(self):
+        """pyttsx3 konuşma motoru; kurulamazsa None (metin sadece yazdırılır)"""
+        if self._engine is None and not self._engine_failed:
+            try:
+                self._engine = pyttsx3.init()
+            except Exception as e:
+                self._engine_failed = True
+                safe_print(f"UYARI: Konuşma motoru başlatılamadı, yanıtlar sadece yazdırılacak: {e}")
+                return None
+            # Türkçe ses ayarları
+            voices = self._engine.getProperty('voices')
+            for voice in voices:
+                if 'turkish' in voice.name.lower() or 'türkçe' in voice.name.lower():
+                    self._engine.setProperty('voice', voice.id)
+                    break
+            self._engine.setProperty('rate', 150)
+        return self._engine
     
     def speak(self, text):
         """Metni sesli olarak söyle"""
@@ -308,8 +446,11 @@ class MainSystem:
         except Exception:
             # Her ihtimale karşı
             print("Sistem: (Yazdırılamayan karakterler var)")
-        self.engine.say(text)
-        self.engine.runAndWait()
+        engine = self.engine
+        if engine is None:
+            return
+        engine.say(text)
+        engine.runAndWait()
     
     def listen_for_command(self):
         """Vosk ile çevrimdışı sesli komut dinle"""
@@ -813,118 +954,381 @@ class MainSystem:
                 self.speak(response)
 
     def run_main_system(self):
-        """Ana sistem döngüsü"""
-        cap = cv2.VideoCapture(0)
+        """Ana sistem döngüsü.
+        
+        Kare işleme aşamaları (yüz tespiti, yüz kimliği, el hareketi, çizim)
+        sınırlı kuyruklarla bağlı ayrı thread'lerde çalışır; bu döngü sadece
+        kare kaynağından kare verir ve bitmiş kareleri gösterir.
+        """
+        # Kamera ayrı thread'de okunur; döngü her zaman en yeni kareyi işler.
+        # Video / fotoğraf / oturum kaynakları self.source_realtime hızında okunur
+        # Halkada aynı anda işlenebilecek her kare için bir yuva gerekir
+        # (aşama kuyrukları + işlenen kareler + çıkış + gösterilen kare)
+        slots = 5 * self.pipeline_queue_size + 6
+        cap = open_frame_source(self.frame_source, self.source_realtime,
+                                shared_memory=self.shared_memory_capture, slots=slots)
+        release_frame = getattr(cap, "release_frame", None)
         
         if not cap.isOpened():
-            print("Kamera açılamadı!")
+            print(f"Kare kaynağı açılamadı: {self.frame_source}")
             return
+        recorder = SessionRecorder(self.record_session_dir) if self.record_session_dir else None
+        # Hızlı oynatmada kare atılmaz, aşamalar birbirini bekler (verim ölçümü için)
+        drop_policy = self.pipeline_drop_policy if self.source_realtime else "block"
         
         print("Ana sistem başlatıldı...")
-        print("Çıkmak için 'q' tuşuna basın")
+        if self.headless:
+            print("Başsız mod: görüntü çizilmiyor" + (f", önizleme {self.preview_fps} FPS" if self.preview_fps else ""))
+        else:
+            print("Çıkmak için 'q' tuşuna basın")
+        
+        stages = [
+            PipelineStage("yuz_tespit", self._stage_detect_faces),
+            PipelineStage("yuz_kimlik", self._stage_identify_faces),
+            PipelineStage("el", self._stage_hand_gesture),
+        ]
+        # Başsız modda her karede çizim yapılmaz
+        if not self.headless:
+            stages.append(PipelineStage("cizim", self._stage_draw_overlay))
+        self.metrics.reset()
+        pipeline = FramePipeline(stages, queue_size=self.pipeline_queue_size, drop_policy=drop_policy,
+                                 metrics=self.metrics,
+                                 context_factory=lambda frame: FrameContext(frame, self.frame_buffers))
+        self.pipeline = pipeline
+        self._last_detection_frame = -self.face_tracker.detect_interval
+        pipeline.start()
+        start_time = time.perf_counter()
+        ret = True
+        preview_interval = 1.0 / self.preview_fps if self.preview_fps else None
+        last_preview = 0.0
+        gate = MotionGate(self.idle_after, self.idle_fps) if self.idle_after else None
+        self.motion_gate = gate
+        # Boşta yoklama hızı sadece canlı kamerada uygulanır; dosya kaynakları
+        # yavaşlatılmaz, sadece ağır aşamalar atlanır
+        live_camera = str(self.frame_source).isdigit()
+        # Hızlı oynatmada kare atlanmaz (verim ölçümü tüm kareleri işler)
+        governor = None
+        if self.load_governor_enabled and self.source_realtime:
+            governor = LoadGovernor(slo_ms=self.latency_slo_ms, cpu_budget=self.cpu_budget)
+        self.load_governor = governor
+        self.hand_search = None
+        if self.hand_roi:
+            # Bölgede el kaybolunca yapılan tüm kare aramaları bölge izini bozmasın
+            self.hand_search = HandSearchRegion(max_side=self.hand_roi_size,
+                                                fallback_factory=lambda: self.create_hands(static_image_mode=True))
+        self.gesture_voter = GestureVoter(self.gesture_vote_mode, window=self.gesture_window,
+                                          min_votes=self.gesture_min_votes, dwell=self.gesture_dwell,
+                                          interval=self.gesture_interval)
+        self.reset_gesture_votes()
         
         while self.system_active:
-            ret, frame = cap.read()
+            with self.metrics.timer("yakalama"):
+                ret, frame = cap.read()
             if not ret:
                 break
-
-            # Yüz tanıma (sadece yüz doğrulanmadıysa)
-            if not self.face_verified:
-                face_locations, face_names = self.recognize_face(frame)
-                # Yüz çerçevelerini çiz
-                for (top, right, bottom, left), name in zip(face_locations, face_names):
-                    cv2.rectangle(frame, (left, top), (right, bottom), (0, 255, 0), 2)
-                    cv2.putText(frame, name, (left, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-                    # Yüz tanıma sürecini başlat
-                    if name != "Bilinmeyen":
-                        if self.current_user != name:
-                            self.current_user = name
-                            self.face_detection_start = time.time()
-                            self.face_verified = False
-                            self.hand_verified = False
-                        if self.face_detection_start:
-                            elapsed_time = time.time() - self.face_detection_start
-                            if elapsed_time >= self.face_detection_threshold:
-                                self.face_verified = True
-                                self.face_detection_start = None
-                    else:
-                        self.current_user = None
-                        self.face_detection_start = None
-                        self.face_verified = False
-                        self.hand_verified = False
-            # Yüz doğrulandıktan sonra yüz tanıma yapılmaz, sadece el hareketi beklenir
-
-            # El hareketi tanıma (sadece yüz doğrulandıktan sonra)
-            if self.face_verified and not self.hand_verified:
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = self.hands.process(rgb_frame)
-                
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        # El çizgilerini çiz
-                        self.mp_drawing.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-                        
-                        # El hareketini tanı
-                        gesture, probability = self.recognize_hand_gesture(hand_landmarks)
-                        
-                        # Debug bilgisi - her zaman göster
-                        cv2.putText(frame, f"Tespit: {gesture} ({probability:.2f})", 
-                                  (10, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-                        
-                        if gesture and probability > 0.40:
-                            expected_gesture = self.person_gestures.get(self.current_user.lower(), "A") if hasattr(self, 'person_gestures') else None
-                            safe_print(f"DEBUG: Kullanıcı: {self.current_user}, Beklenen: {expected_gesture}, Tahmin: {gesture}, Güven: {probability:.2f}")
-                            cv2.putText(frame, f"El Hareketi: {gesture} ({probability:.2f})", 
-                                      (10, 180), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
-                            # Kişiye özel el hareketi kontrolü
-                            if self.check_person_gesture(self.current_user, gesture):
-                                self.hand_verified = True
-                                welcome_text = f"Hoş geldiniz {self.current_user}!"
-                                cv2.putText(frame, welcome_text, (10, 220), 
-                                          cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                                self.speak(welcome_text)
-                                if not self.voice_active:
-                                    safe_print("DEBUG: Sesli asistan başlatılıyor!")
-                                    threading.Thread(target=self.start_voice_assistant, daemon=True).start()
-                else:
-                    # El tespit edilmediğinde bilgi göster
-                    cv2.putText(frame, "El Tespit Edilmedi", (10, 150), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-            
-            # Durum bilgilerini göster
-            status_text = []
-            if self.current_user:
-                status_text.append(f"Kisi: {self.current_user}")
-                if self.face_detection_start:
-                    elapsed = time.time() - self.face_detection_start
-                    remaining = max(0, self.face_detection_threshold - elapsed)
-                    status_text.append(f"Yuz Dogrulama: {remaining:.1f}s")
-                elif self.face_verified:
-                    status_text.append("Yuz Dogrulandi (OK)")
-                    if not self.hand_verified:
-                        status_text.append("El Hareketi Bekleniyor...")
-                    else:
-                        status_text.append("El Hareketi Dogrulani ✓")
-                        status_text.append("Sisteme Giris Basarili!")
-                        if self.voice_active:
-                            status_text.append("Sesli Asistan Aktif")
-            
-            # Durum bilgilerini ekrana yaz
-            for i, text in enumerate(status_text):
-                cv2.putText(frame, text, (10, 30 + i * 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            self.metrics.tick("yakalama")
+            self.metrics.maybe_export()
+            if recorder:
+                recorder.write(frame)
+            active = True
+            if gate is not None:
+                # Kapıda biri varken (iz, kullanıcı ya da doğrulama sürerken) uyunmaz
+                present = self.current_user is not None or self.face_verified or bool(self.face_tracker.tracks)
+                was_idle = gate.idle
+                with self.metrics.timer("hareket_kapisi"):
+                    active = gate.check(frame, present)
+                if gate.idle != was_idle:
+                    self.emit_event("idle" if gate.idle else "active", motion=float(gate.motion_score))
+            if not active:
+                # Boşta: ağır aşamalar atlanır, ham görüntü gösterilir
+                self.metrics.tick("bosta")
+                if not self.headless:
+                    cv2.imshow('Ana Sistem - Yuz ve El Hareketi Tanitma', frame)
+                if release_frame:
+                    release_frame(frame)
+            elif governor is not None and not governor.should_process():
+                # Yük altında atlanan kare; ekranda son işlenmiş kare kalır
+                self.metrics.tick("yuk_atlanan")
+                if release_frame:
+                    release_frame(frame)
+            else:
+                # Hızlı oynatmada doğrulama sayaçları kaynağın kare zamanıyla ilerler;
+                # kısa bir klip de duvar saatinde 5 sn sürmeden yüz doğrulamasına ulaşır
+                frame_time = None if self.source_realtime else getattr(cap, "frame_time", None)
+                pipeline.submit(frame, on_release=release_frame, timestamp=frame_time)
+            if governor is not None:
+                self.apply_load_decision(governor.update())
             
-            cv2.imshow('Ana Sistem - Yuz ve El Hareketi Tanitma', frame)
+            packet = pipeline.get(timeout=0)
+            show = not self.headless
+            if self.headless and packet is not None and preview_interval:
+                # Düşük hızlı önizleme: sadece gösterilecek karede, kopyaya çizilir
+                now = time.perf_counter()
+                if now - last_preview >= preview_interval:
+                    last_preview = now
+                    preview = packet.frame.copy()
+                    self.draw_overlay(preview, packet.data, packet.timestamp)
+                    cv2.imshow('Ana Sistem - Yuz ve El Hareketi Tanitma', preview)
+                    show = True
+            elif show and packet is not None:
+                cv2.imshow('Ana Sistem - Yuz ve El Hareketi Tanitma', packet.frame)
+            if packet is not None:
+                if governor is not None:
+                    governor.observe_latency((time.perf_counter() - packet.created) * 1000)
+                # imshow kareyi kopyalar; paylaşılan bellek yuvası artık serbest
+                packet.close()
             
             # --- YENİ: Eğer hem yüz hem el doğrulandıysa döngüyü bitir ---
             if self.face_verified and self.hand_verified:
                 safe_print("Doğrulama tamamlandı, sesli asistana geçiliyor.")
                 break
 
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            if show and cv2.waitKey(1) & 0xFF == ord('q'):
                 break
+            if gate is not None and gate.idle and live_camera:
+                gate.wait()
         
+        if not ret:
+            # Dosya kaynağı bitti; kuyruktaki kareler de işlensin
+            pipeline.drain()
+        elapsed = time.perf_counter() - start_time
+        pipeline.stop()
+        self.metrics.export()
         cap.release()
-        cv2.destroyAllWindows()
+        if recorder:
+            recorder.close()
+        if not self.headless or self.preview_fps:
+            cv2.destroyAllWindows()
+        tracker = self.face_tracker
+        safe_print(f"Yüz encoding atlama oranı: {tracker.skip_rate:.0%} "
+                   f"({tracker.encodings_skipped}/{tracker.faces_detected} yüz)")
+        safe_print(f"Atlanan kamera karesi: {cap.frames_dropped}/{cap.frames_captured} ({cap.drop_rate:.0%})")
+        stats = pipeline.stats()
+        safe_print(f"Uçtan uca gecikme: ort. {stats['mean_latency_ms']:.0f} ms, p95 {stats['p95_latency_ms']:.0f} ms "
+                   f"({stats['completed']}/{stats['submitted']} kare işlendi)")
+        if elapsed > 0:
+            safe_print(f"İşlem hızı: {stats['completed'] / elapsed:.1f} kare/sn ({elapsed:.1f} sn)")
+        if gate is not None:
+            active_time, idle_time = gate.times()
+            safe_print(f"Hareket kapısı: etkin {active_time:.1f} sn, boşta {idle_time:.1f} sn "
+                       f"({gate.idle_ratio:.0%}), {gate.wakeups} kez uyandı")
+        if self.hand_search is not None:
+            report = self.hand_search.report()
+            safe_print(f"El arama bölgesi: {report['region_frames']} kare bölgede, "
+                       f"{report['full_frames']} kare tüm karede işlendi")
+            self.hand_search.close()
+        if governor is not None:
+            report = governor.report()
+            levels = ", ".join(f"{level}: {seconds:.0f} sn" for level, seconds in enumerate(report["level_time_s"]) if seconds >= 0.5)
+            safe_print(f"Yük denetleyicisi: {report['changes']} karar, atlanan kare {report['skip_rate']:.0%} "
+                       f"(seviyelerde geçen süre {levels})")
+        self.scale_controller.scale_cap = None
+        self.draw_hand_landmarks = True
+        for stage in stats["stages"]:
+            safe_print(f"  {stage['name']:<12} ort. {stage['mean_ms']:6.1f} ms, "
+                       f"{stage['processed']} kare, {stage['dropped']} kuyruktan atıldı")
+        safe_print("Adım gecikmeleri (p50 / p95 / p99 ms):")
+        for name, summary in sorted(self.metrics.snapshot()["latency"].items()):
+            safe_print(f"  {name:<18} {summary['p50_ms']:7.1f} {summary['p95_ms']:7.1f} {summary['p99_ms']:7.1f}"
+                       f"  ({summary['count']} ölçüm)")
+    
+    def apply_load_decision(self, decision):
+        """Yük denetleyicisinin yeni seviyesini uygula ve kaydet"""
+        if decision is None:
+            return
+        self.scale_controller.scale_cap = decision["scale_cap"]
+        self.draw_hand_landmarks = decision["draw_landmarks"]
+        safe_print(f"YÜK: seviye {decision['level']} (her {decision['skip']}. kare, "
+                   f"ölçek tavanı {decision['scale_cap'] or '-'}, el çizgileri "
+                   f"{'açık' if decision['draw_landmarks'] else 'kapalı'}): {decision['reason']}")
+        self.emit_event("load_level", **{k: v for k, v in decision.items() if k != "time"})
+    
+    def create_hands(self, static_image_mode=False):
+        """Bir kamera için MediaPipe el tanıyıcısı"""
+        return create_hands(static_image_mode)
+    
+    def run_multi_camera(self, sources, workers=None, duration=None):
+        """Birden fazla kapıyı tek makineden izle (başsız).
+        
+        Her kaynak kendi doğrulama durumuyla çalışır; yüz galerisi ve el
+        hareketi modeli kameralar arasında paylaşılır. Olaylar kamera
+        kimliğiyle bildirilir, metrikler metrics/camera_<n>.* dosyalarına yazılır.
+        camera_mode "processes" ise her kamera ayrı süreçte işlenir (workers
+        kullanılmaz), "threads" ise tek süreçte workers thread'lik havuzla.
+        """
+        # Süreçlere pickle ile kopyalanacağı için bağlı metotlar yerine düz nesneler
+        shared = SharedRecognition(self.face_gallery, self.detector_config, self.embedder_config,
+                                   classify_gesture=HandGestureRecognizer(self.hand_classifier, self.hand_features),
+                                   check_gesture=self.person_gesture_check,
+                                   hands_factory=create_hands,
+                                   hand_roi_size=self.hand_roi_size if self.hand_roi else None,
+                                   gesture_vote=dict(mode=self.gesture_vote_mode, window=self.gesture_window,
+                                                     min_votes=self.gesture_min_votes, dwell=self.gesture_dwell,
+                                                     interval=self.gesture_interval))
+        if self.camera_mode == "processes":
+            runner = MultiCameraProcessRunner(sources, shared, realtime=self.source_realtime,
+                                              face_threshold=self.face_detection_threshold)
+        else:
+            sessions = [CameraSession(camera_id, source, shared, realtime=self.source_realtime,
+                                      face_threshold=self.face_detection_threshold)
+                        for camera_id, source in enumerate(sources)]
+            runner = MultiCameraRunner(sessions, workers)
+        for callback in self.event_listeners:
+            runner.add_event_listener(callback)
+        runner.run(duration)
+        return runner
+    
+    def _stage_detect_faces(self, packet):
+        """Aşama 1: tam tespit gereken karelerde yüzleri bul (encoding sonraki aşamada)"""
+        tracker = self.face_tracker
+        if self.face_verified or not tracker.needs_detection():
+            return packet
+        # İzci durumu kimlik aşamasından bir iki kare geride kalır; önceki tespit
+        # henüz işlenmemişse aynı aralıkta ikinci kez tespit yapılmaz
+        in_flight = packet.frame_id - self._last_detection_frame < tracker.detect_interval
+        if tracker.tracks and not tracker.detection_pending and in_flight:
+            return packet
+        self._last_detection_frame = packet.frame_id
+        packet.data["detection"] = self.detect_faces(packet.frame, packet.context)
+        return packet
+    
+    def _stage_identify_faces(self, packet):
+        """Aşama 2: yüzleri encode et / izle ve doğrulama sayaçlarını güncelle"""
+        # Yüz doğrulandıktan sonra yüz tanıma yapılmaz, sadece el hareketi beklenir
+        if not self.face_verified:
+            tracks = self.face_tracker.update(packet.frame, detection=packet.data.get("detection"),
+                                              now=packet.timestamp)
+            # İzler sonraki karelerde değişeceği için çizim bilgisi kopyalanır
+            packet.data["faces"] = [(track.box, f"{track.name} #{track.track_id}") for track in tracks]
+            # Her iz kendi 5 saniyelik doğrulama sayacını tutar
+            self.update_face_verification(tracks)
+        return packet
+    
+    def reset_gesture_votes(self):
+        """El hareketi oylamasını sıfırla (yeni kullanıcı)"""
+        if self.gesture_voter is not None:
+            self.gesture_voter.reset()
+        self._last_hands = []
+        self._last_vote = None
+    
+    def _stage_hand_gesture(self, packet):
+        """Aşama 3: yüz doğrulandıysa el işaretlerini bul ve hareketi oylayarak doğrula"""
+        if not self.face_verified or self.hand_verified:
+            return packet
+        voter = self.gesture_voter
+        if not voter.should_classify():
+            # Bu karede sınıflandırıcı çalışmaz; son el sonucu çizilir
+            packet.data["hands"] = self._last_hands
+            packet.data["gesture_vote"] = voter.state(packet.timestamp)
+            return packet
+        with self.metrics.timer("el_mediapipe"):
+            if self.hand_search is not None:
+                # Yüzün çevresindeki küçültülmüş bölge; işaretler tam kareye çevrilir
+                results = self.hand_search.process(self.hands, packet.context)
+            else:
+                # Tam çözünürlük RGB karede bir kez, havuz tamponuna hesaplanır
+                results = self.hands.process(packet.context.rgb())
+        hands = []
+        best_gesture, best_probability = None, 0.0
+        for hand_landmarks, handedness in detected_hands(results):
+            # El hareketini tanı
+            with self.metrics.timer("el_siniflandirma"):
+                gesture, probability = self.recognize_hand_gesture(hand_landmarks, handedness)
+            hands.append((hand_landmarks, gesture, probability))
+            if gesture and probability > best_probability:
+                best_gesture, best_probability = gesture, probability
+        # El görünmeyen kareler de (None) oylamaya girer
+        gesture, score = voter.add(best_gesture, best_probability, packet.timestamp)
+        packet.data["hands"] = self._last_hands = hands
+        packet.data["gesture_vote"] = vote_state = voter.state(packet.timestamp)
+        
+        if gesture is not None and gesture != self._last_vote:
+            self._last_vote = gesture
+            expected_gesture = self.person_gestures.get(self.current_user.lower(), "A") if hasattr(self, 'person_gestures') else None
+            safe_print(f"DEBUG: Kullanıcı: {self.current_user}, Beklenen: {expected_gesture}, Oylanan: {gesture}, Skor: {score:.2f}")
+            self.emit_event("hand_gesture", user=self.current_user, gesture=gesture, probability=float(score),
+                            votes=vote_state["scores"])
+            # Kişiye özel el hareketi kontrolü
+            if self.check_person_gesture(self.current_user, gesture):
+                self.hand_verified = True
+                welcome_text = f"Hoş geldiniz {self.current_user}!"
+                packet.data["welcome"] = welcome_text
+                self.emit_event("hand_verified", user=self.current_user, gesture=gesture)
+                self.speak(welcome_text)
+                if not self.voice_active:
+                    safe_print("DEBUG: Sesli asistan başlatılıyor!")
+                    threading.Thread(target=self.start_voice_assistant, daemon=True).start()
+        return packet
+    
+    def _stage_draw_overlay(self, packet):
+        """Aşama 4: yüz kutularını, el işaretlerini ve durum bilgilerini çiz"""
+        self.draw_overlay(packet.frame, packet.data, packet.timestamp)
+        return packet
+    
+    def draw_overlay(self, frame, data, now=None):
+        """Aşama sonuçlarını ve giriş durumunu kare üzerine çiz (now: karenin zamanı, yoksa duvar saati)"""
+        # Yüz çerçevelerini çiz
+        for (top, right, bottom, left), label in data.get("faces", []):
+            cv2.rectangle(frame, (left, top), (right, bottom), (0, 255, 0), 2)
+            cv2.putText(frame, label, (left, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        
+        hands = data.get("hands")
+        if hands is not None:
+            if hands:
+                for hand_landmarks, gesture, probability in hands:
+                    # El çizgilerini çiz (yük altında atlanır)
+                    if self.draw_hand_landmarks:
+                        self.mp_drawing.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+                    # Debug bilgisi - her zaman göster
+                    cv2.putText(frame, f"Tespit: {gesture} ({probability:.2f})", 
+                              (10, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+                vote = data.get("gesture_vote")
+                if vote and vote["candidate"]:
+                    # Oylamanın adayı, oy payı ve ne kadardır önde olduğu
+                    cv2.putText(frame, f"El Hareketi: {vote['candidate']} ({vote['scores'].get(vote['candidate'], 0.0):.2f}, "
+                                f"{vote['candidate_for_s']:.1f} sn)",
+                                (10, 180), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+                if "welcome" in data:
+                    cv2.putText(frame, data["welcome"], (10, 220), 
+                              cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            else:
+                # El tespit edilmediğinde bilgi göster
+                cv2.putText(frame, "El Tespit Edilmedi", (10, 150), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+        
+        # Durum bilgilerini göster
+        status_text = []
+        if self.current_user:
+            status_text.append(f"Kisi: {self.current_user}")
+            if self.face_detection_start:
+                elapsed = (time.time() if now is None else now) - self.face_detection_start
+                remaining = max(0, self.face_detection_threshold - elapsed)
+                status_text.append(f"Yuz Dogrulama: {remaining:.1f}s")
+            elif self.face_verified:
+                status_text.append("Yuz Dogrulandi (OK)")
+                if not self.hand_verified:
+                    status_text.append("El Hareketi Bekleniyor...")
+                else:
+                    status_text.append("El Hareketi Dogrulani ✓")
+                    status_text.append("Sisteme Giris Basarili!")
+                    if self.voice_active:
+                        status_text.append("Sesli Asistan Aktif")
+        
+        # Durum bilgilerini ekrana yaz
+        for i, text in enumerate(status_text):
+            cv2.putText(frame, text, (10, 30 + i * 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        
+        # Tespit ölçeği ve gecikmesi (bütçe ayarı için)
+        if not self.face_verified:
+            report = self.scale_controller.report()
+            cv2.putText(frame, f"Olcek: {report['scale']:.3f}  Tespit: {report['latency_ms']:.0f} ms",
+                        (10, frame.shape[0] - 15), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
+        
+        # Uçtan uca gecikme ve aşama kuyruk derinlikleri
+        stats = self.pipeline.stats()
+        depths = " ".join(str(stage["queue_depth"]) for stage in stats["stages"])
+        cv2.putText(frame, f"Gecikme: {stats['latency_ms']:.0f} ms  Kuyruk: {depths}",
+                    (10, frame.shape[0] - 40), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
     
     def create_gui(self):
         self.theme = 'light'  # Varsayılan tema
@@ -974,6 +1378,7 @@ class MainSystem:
                 avatar_label.config(bg=bg_main)
             status_frame.config(bg=bg_status, highlightbackground=bg_header1)
             self.status_label.config(bg=bg_status, fg=fg_status)
+            self.metrics_label.config(bg=bg_status, fg=fg_status)
             button_frame.config(bg=bg_main)
             style.configure('Modern.TButton', background=btn_bg, foreground=btn_fg, font=("Segoe UI", 15, "bold"), borderwidth=0, focusthickness=3, focuscolor=btn_active)
             style.map('Modern.TButton', background=[('active', btn_active)], foreground=[('active', btn_active_fg)])
@@ -1036,6 +1441,11 @@ class MainSystem:
         self.status_label.pack()
         self.progress = ttk.Progressbar(status_frame, orient='horizontal', length=400, mode='indeterminate')
         self.progress.pack(pady=8)
+        # Giriş döngüsü hız ve gecikme özeti (self.metrics'ten saniyede bir)
+        self.metrics_var = tk.StringVar(value="")
+        self.metrics_label = tk.Label(status_frame, textvariable=self.metrics_var, font=("Segoe UI", 10), bg="#FFFFFF", fg="#1A237E")
+        self.metrics_label.pack()
+        self.root.after(1000, self.refresh_metrics_label)
 
         # Butonlar (büyük, yuvarlatılmış, modern)
         button_frame = tk.Frame(self.root, bg='#f5f5f5')
@@ -1076,6 +1486,24 @@ class MainSystem:
         apply_theme()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
+    def refresh_metrics_label(self):
+        """Arayüzdeki FPS ve gecikme özetini güncelle"""
+        if self.system_active:
+            snapshot = self.metrics.snapshot()
+            latency = snapshot["latency"].get("uctan_uca")
+            text = f"{snapshot['fps'].get('islenen', 0.0):.1f} FPS"
+            detected = snapshot["counts"].get("yuz_tespit_edilen", 0)
+            if self.motion_gate is not None and self.motion_gate.idle:
+                text = "Boşta (hareket bekleniyor)"
+            else:
+                if latency:
+                    text += f"  |  gecikme p50 {latency['p50_ms']:.0f} ms, p95 {latency['p95_ms']:.0f} ms"
+                if detected:
+                    skipped = snapshot["counts"].get("yuz_encoding_atlanan", 0)
+                    text += f"  |  encoding atlama {skipped / detected:.0%}"
+            self.metrics_var.set(text)
+        self.root.after(1000, self.refresh_metrics_label)
+    
     def start_system(self):
         """Sistemi başlat"""
         # Tüm state değişkenlerini sıfırla
@@ -1085,6 +1513,8 @@ class MainSystem:
         self.hand_verified = False
         self.current_user = None
         self.face_detection_start = None
+        self.face_tracker.reset()
+        self.face_search.reset()
         self.status_var.set("Sistem Aktif")
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
@@ -1529,5 +1959,66 @@ def parse_task_command(text):
     return tarih, saat, title, desc
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Yüz ve el hareketiyle giriş yapan sesli asistan")
+    parser.add_argument("--source", default=None,
+                        help="Kamera numarası, video dosyası, fotoğraf klasörü ya da kayıtlı oturum klasörü; "
+                             "verilirse arayüz açılmadan giriş döngüsü doğrudan çalışır")
+    parser.add_argument("--fast", action="store_true", help="Dosya kaynaklarını gerçek zaman beklemeden oku")
+    parser.add_argument("--shm", action="store_true",
+                        help="Kareyi ayrı bir süreçte yakala, paylaşılan bellekle kopyasız aktar")
+    parser.add_argument("--record", default=None, help="Kameradan gelen kareleri bu klasöre oturum olarak kaydet")
+    parser.add_argument("--headless", action="store_true", help="Çizim ve pencere olmadan çalış; durum olayları yazdırılır")
+    parser.add_argument("--preview-fps", type=float, default=None, help="Başsız modda bu hızda önizleme göster")
+    parser.add_argument("--cameras", nargs="+", default=None,
+                        help="Birden fazla kapı için kaynaklar (kamera numarası ya da dosya); başsız çalışır")
+    parser.add_argument("--camera-mode", choices=["processes", "threads"], default="processes",
+                        help="Çoklu kamerada kamera başına süreç ya da tek süreçte thread havuzu")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Çoklu kamerada işçi thread sayısı (sadece --camera-mode threads)")
+    parser.add_argument("--idle-after", type=float, default=10.0,
+                        help="Bu kadar saniye hareket yoksa tespiti durdur (0: hareket kapısı kapalı)")
+    parser.add_argument("--idle-fps", type=float, default=2.0, help="Boşta modunda kamera yoklama hızı")
+    parser.add_argument("--latency-slo", type=float, default=200.0,
+                        help="Uçtan uca p95 gecikme hedefi (ms); aşılırsa yük denetleyicisi kısıtlar")
+    parser.add_argument("--cpu-budget", type=float, default=0.8,
+                        help="Sürecin kullanabileceği CPU payı (0-1, tüm çekirdeklere oranla; 0: sınırsız)")
+    parser.add_argument("--no-governor", action="store_true", help="Yük altında kare atlama / kısıtlama yapma")
+    parser.add_argument("--gesture-vote", choices=["k_of_n", "ewma"], default="k_of_n",
+                        help="El hareketi oylama yöntemi")
+    parser.add_argument("--gesture-interval", type=int, default=2, help="El hareketi sınıflandırıcısı her k karede bir çalışır")
+    parser.add_argument("--gesture-dwell", type=float, default=0.5,
+                        help="Oylanan hareketin kabul edilmeden önce değişmeden kalacağı süre (sn)")
+    parser.add_argument("--hand-roi", action="store_true",
+                        help="El işaretlerini tüm karede değil doğrulanan yüzün çevresinde ara")
+    parser.add_argument("--hand-roi-size", type=int, default=320,
+                        help="El arama bölgesinin MediaPipe'a verilmeden önce küçültüleceği uzun kenar (piksel)")
+    args = parser.parse_args()
+
     system = MainSystem()
-    system.run() 
\ No newline at end of file
+    system.source_realtime = not args.fast
+    system.shared_memory_capture = args.shm
+    system.camera_mode = args.camera_mode
+    system.record_session_dir = args.record
+    system.headless = args.headless
+    system.preview_fps = args.preview_fps
+    system.idle_after = args.idle_after
+    system.idle_fps = args.idle_fps
+    system.latency_slo_ms = args.latency_slo
+    system.cpu_budget = args.cpu_budget
+    system.load_governor_enabled = not args.no_governor
+    system.gesture_vote_mode = args.gesture_vote
+    system.gesture_interval = args.gesture_interval
+    system.gesture_dwell = args.gesture_dwell
+    system.hand_roi = args.hand_roi
+    system.hand_roi_size = args.hand_roi_size
+    if args.headless or args.cameras:
+        system.add_event_listener(lambda event: safe_print(f"OLAY: {event}"))
+    if args.cameras:
+        system.run_multi_camera(args.cameras, workers=args.workers)
+    elif args.source is None:
+        system.run()
+    else:
+        system.frame_source = args.source
+        system.system_active = True
+        system.run_main_system()
\ No newline at end of file
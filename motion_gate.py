@@ -0,0 +1,93 @@
+import time
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Kapıda kimse yokken ağır tespiti durduran hareket kapısı.
+
+    Her kare küçük bir gri önizlemeye (varsayılan 64x48) indirilir ve
+    yavaşça güncellenen arka planla farkı alınır; değişen piksel oranı
+    motion_area'yı geçerse hareket var sayılır. idle_after saniye boyunca
+    hareket yoksa (ve present=False ise) kapı boşta moduna geçer: check()
+    False döner ve wait() döngüyü idle_fps hızına indirir. İlk hareketli
+    karede hemen etkin moda dönülür, o kare de işlenir.
+    """
+
+    def __init__(self, idle_after=10.0, idle_fps=2.0, thumb_size=(64, 48), pixel_threshold=12,
+                 motion_area=0.01, learning_rate=0.05):
+        self.idle_after = idle_after
+        self.idle_fps = idle_fps
+        self.thumb_size = thumb_size
+        self.pixel_threshold = pixel_threshold
+        self.motion_area = motion_area
+        # Arka plan bu oranla yeni kareye yaklaşır (ışık değişimleri emilir)
+        self.learning_rate = learning_rate
+        self.background = None
+        self.idle = False
+        self.motion_score = 0.0
+        self.wakeups = 0
+        self.active_time = 0.0
+        self.idle_time = 0.0
+        now = time.monotonic()
+        self.last_motion = now
+        self._state_since = now
+        self._last_check = now
+
+    def _score(self, frame):
+        """Önizlemede arka plana göre değişen piksel oranı"""
+        thumb = cv2.resize(frame, self.thumb_size, interpolation=cv2.INTER_AREA)
+        if thumb.ndim == 3:
+            thumb = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+        thumb = cv2.GaussianBlur(thumb, (5, 5), 0)
+        if self.background is None:
+            self.background = thumb.astype(np.float32)
+            return 1.0
+        diff = cv2.absdiff(thumb, cv2.convertScaleAbs(self.background))
+        cv2.accumulateWeighted(thumb, self.background, self.learning_rate)
+        return np.count_nonzero(diff > self.pixel_threshold) / diff.size
+
+    def check(self, frame, present=False):
+        """Kare ağır aşamalara gönderilmeli mi (etkin mod)?
+
+        present=True (ör. izlenen bir yüz var) iken hareket olmasa da boşta
+        moduna geçilmez.
+        """
+        now = time.monotonic()
+        self._last_check = now
+        self.motion_score = self._score(frame)
+        if present or self.motion_score >= self.motion_area:
+            self.last_motion = now
+        self._set_idle(now - self.last_motion >= self.idle_after, now)
+        return not self.idle
+
+    def _set_idle(self, idle, now):
+        if idle == self.idle:
+            return
+        if self.idle:
+            self.idle_time += now - self._state_since
+            self.wakeups += 1
+        else:
+            self.active_time += now - self._state_since
+        self.idle = idle
+        self._state_since = now
+
+    def wait(self):
+        """Boşta modunda bir sonraki yoklamaya kadar bekle"""
+        if self.idle and self.idle_fps:
+            delay = self._last_check + 1.0 / self.idle_fps - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def times(self):
+        """(etkin sn, boşta sn), içinde bulunulan dönem dahil"""
+        current = time.monotonic() - self._state_since
+        if self.idle:
+            return self.active_time, self.idle_time + current
+        return self.active_time + current, self.idle_time
+
+    @property
+    def idle_ratio(self):
+        active, idle = self.times()
+        total = active + idle
+        return idle / total if total else 0.0
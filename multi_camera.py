@@ -0,0 +1,516 @@
+import os
+import queue
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+from face_tracker import FaceTracker
+from detection_scale import DetectionScaleController
+from face_roi import FaceSearchRegion
+from face_detectors import create_face_detector
+from face_embedders import create_face_embedder
+from frame_capture import open_frame_source
+from pipeline_metrics import PipelineMetrics
+from face_gallery import UNKNOWN_NAME
+from frame_context import FrameBufferPool, FrameContext
+from hand_features import detected_hands
+from hand_roi import HandSearchRegion
+from gesture_vote import GestureVoter
+
+try:
+    import mediapipe as mp
+except ImportError:
+    mp = None
+
+
+def create_hands(static_image_mode=False):
+    """Bir kamera için MediaPipe el tanıyıcısı"""
+    if mp is None:
+        raise ImportError("mediapipe kurulu değil")
+    return mp.solutions.hands.Hands(
+        static_image_mode=static_image_mode,
+        max_num_hands=1,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.5
+    )
+
+
+class PersonGestureCheck:
+    """Kişiye özel el hareketi kontrolü: check(kişi, hareket) -> bool"""
+
+    def __init__(self, person_gestures, default="A"):
+        self.person_gestures = {name.lower(): gesture for name, gesture in person_gestures.items()}
+        self.default = default
+
+    def __call__(self, person_name, gesture):
+        expected_gesture = self.person_gestures.get((person_name or "").lower(), self.default)
+        # Karşılaştırmayı büyük harfe çevirerek yap
+        return (gesture or "").upper() == expected_gesture.upper()
+
+
+def detect_faces(frame, scale_controller, face_search, detector, embedder, gallery, metrics, context=None):
+    """Yüzleri bul; encoding sadece istenen yüzler için sonradan yapılır.
+
+    (konumlar, identify) döndürür; identify(indeksler) o yüzleri encode edip
+    galeriyle eşleştirir ve FaceMatch listesi döndürür. context (FrameContext)
+    verilirse küçültülmüş görüntüler onun tamponlarından alınır; identify de
+    context serbest bırakılmadan çağrılmalıdır.
+    """
+    if len(gallery) == 0:
+        return [], None
+    context = context or FrameContext(frame)
+
+    # Ölçek son yüz boyutlarına ve gecikme bütçesine göre seçilir
+    scale = scale_controller.choose(frame.shape)
+    with metrics.timer("olcekleme_renk"):
+        # Gri girdi alan dedektörlerde RGB sadece encoding gerekirse hesaplanır
+        if getattr(detector, "input_format", "rgb") == "gray":
+            detect_image = context.small_gray(scale)
+        else:
+            detect_image = context.small_rgb(scale)
+    start = time.perf_counter()
+    # İlk yakalamadan sonra sadece son yüzlerin çevresi aranır
+    small_locations, searched_pixels = face_search.locate(detect_image, scale, detector.detect)
+    latency_ms = (time.perf_counter() - start) * 1000
+    metrics.observe("yuz_tespit", latency_ms)
+
+    def identify(indices):
+        # Tüm yüzler tek seferde galeriyle karşılaştırılır, en yakın kişi seçilir
+        with metrics.timer("yuz_encoding"):
+            face_encodings = embedder.embed(context.small_rgb(scale), [small_locations[i] for i in indices])
+        with metrics.timer("yuz_eslesme"):
+            return gallery.match(face_encodings, backend=embedder.name)
+
+    # Koordinatları seçilen ölçeğe göre orijinal boyuta çevir
+    face_locations = [(int(top / scale), int(right / scale), int(bottom / scale), int(left / scale))
+                      for top, right, bottom, left in small_locations]
+    scale_controller.observe(frame.shape, [bottom - top for top, _, bottom, _ in face_locations], latency_ms,
+                             searched_pixels)
+    face_search.update(face_locations)
+    return face_locations, identify
+
+
+class SharedRecognition:
+    """Kameralar arasında paylaşılan tanıma kaynakları.
+
+    Yüz galerisi ve el hareketi modeli salt okunur olarak tek kopya
+    paylaşılır. Dedektör ve embedder (OpenCV DNN / dlib nesneleri)
+    thread güvenli olmadığı için her işçi thread'i kendi kopyasını kurar.
+    Süreç modunda nesne her kamera sürecine pickle ile kopyalanır; bu yüzden
+    geri çağırmalar bağlı metot değil modül düzeyinde fonksiyon ya da
+    pickle edilebilir nesne olmalıdır.
+    """
+
+    def __init__(self, gallery, detector_config, embedder_config, classify_gesture, check_gesture,
+                 hands_factory, gesture_threshold=0.40, hand_roi_size=None, gesture_vote=None):
+        self.gallery = gallery
+        self.detector_config = detector_config
+        self.embedder_config = embedder_config
+        # classify_gesture(hand_landmarks, handedness) -> (hareket, olasılık)
+        self.classify_gesture = classify_gesture
+        # check_gesture(kişi, hareket) -> bool
+        self.check_gesture = check_gesture
+        # Her kamera kendi MediaPipe Hands nesnesini kullanır (kareler arası iz tutar)
+        self.hands_factory = hands_factory
+        self.gesture_threshold = gesture_threshold
+        # Verilirse el işaretleri doğrulanan yüzün çevresinde, bu boyuta küçültülerek aranır
+        self.hand_roi_size = hand_roi_size
+        # Her kameranın GestureVoter ayarları (mode, window, min_votes, dwell, interval)
+        self.gesture_vote = dict(gesture_vote or {})
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # Thread'e özel dedektör / embedder kopyaları süreçlere taşınmaz
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    @property
+    def detector(self):
+        if getattr(self._local, "detector", None) is None:
+            self._local.detector = create_face_detector(self.detector_config)
+        return self._local.detector
+
+    @property
+    def embedder(self):
+        if getattr(self._local, "embedder", None) is None:
+            self._local.embedder = create_face_embedder(self.embedder_config)
+        return self._local.embedder
+
+
+class CameraSession:
+    """Tek bir kapının kamerası ve kendi doğrulama durum makinesi.
+
+    Yüz face_threshold saniye doğrulanınca el hareketi beklenir; giriş
+    onaylandıktan reset_after saniye sonra kapı bir sonraki kişi için
+    sıfırlanır. Olaylar ve metrikler kamera kimliğiyle ayrı tutulur.
+    detection_scale verilirse tespit ölçeği uyarlanmaz, hep o basamakta
+    kalır (verim ölçümlerinde kare başına iş sabit olsun diye).
+    """
+
+    def __init__(self, camera_id, source, shared, realtime=True, face_threshold=5.0, reset_after=5.0,
+                 metrics_dir="metrics", detection_scale=None):
+        self.camera_id = camera_id
+        self.source = source
+        self.shared = shared
+        self.realtime = realtime
+        self.capture = open_frame_source(source, realtime)
+        self.face_threshold = face_threshold
+        self.reset_after = reset_after
+        self.face_tracker = FaceTracker(detect_interval=5, min_margin=0.05)
+        if detection_scale is None:
+            self.scale_controller = DetectionScaleController(budget_ms=40.0)
+        else:
+            self.scale_controller = DetectionScaleController(budget_ms=float("inf"), initial_scale=detection_scale,
+                                                             min_scale=detection_scale, max_scale=detection_scale)
+        self.face_search = FaceSearchRegion(expand=0.75, full_sweep_interval=15)
+        self.hands = shared.hands_factory()
+        self.hand_search = None
+        if shared.hand_roi_size:
+            self.hand_search = HandSearchRegion(max_side=shared.hand_roi_size,
+                                                fallback_factory=lambda: shared.hands_factory(static_image_mode=True))
+        # Hareket tek karede değil, kameranın son tahminlerinin oylamasıyla kabul edilir
+        self.gesture_voter = GestureVoter(min_probability=shared.gesture_threshold, **shared.gesture_vote)
+        self.frame_buffers = FrameBufferPool()
+        self.metrics = PipelineMetrics(json_path=os.path.join(metrics_dir, f"camera_{camera_id}.json"),
+                                       prometheus_path=os.path.join(metrics_dir, f"camera_{camera_id}.prom"))
+        self.face_tracker.metrics = self.metrics
+        self.event_listeners = []
+        self.granted = 0
+        self.reset()
+
+    def reset(self):
+        """Doğrulama durumunu sıfırla (yeni kişi için)"""
+        self.current_user = None
+        self.face_verified = False
+        self.hand_verified = False
+        self.face_detection_start = None
+        self.granted_time = None
+        self.face_tracker.reset()
+        self.face_search.reset()
+        self.gesture_voter.reset()
+        if self.hand_search is not None:
+            self.hand_search.reset()
+
+    def emit_event(self, event, **data):
+        data.update(event=event, camera=self.camera_id, time=time.time())
+        for callback in self.event_listeners:
+            try:
+                callback(data)
+            except Exception as e:
+                print(f"UYARI: Olay dinleyicisi hata verdi ({event}, kamera {self.camera_id}): {e}")
+
+    def detect_faces(self, frame, context=None):
+        shared = self.shared
+        return detect_faces(frame, self.scale_controller, self.face_search, shared.detector,
+                            shared.embedder, shared.gallery, self.metrics, context)
+
+    def update_face_verification(self, tracks):
+        """İzlerin doğrulama sayaçlarına göre kullanıcıyı ve yüz doğrulamasını güncelle"""
+        known = [track for track in tracks if track.name != UNKNOWN_NAME]
+        if not known:
+            if self.current_user is not None:
+                self.emit_event("user_lost", user=self.current_user)
+            self.current_user = None
+            self.face_detection_start = None
+            return
+
+        # En uzun süredir kamerada olan tanınmış yüz öne çıkar
+        track = max(known, key=lambda t: t.elapsed())
+        if self.current_user != track.name:
+            self.hand_verified = False
+            self.gesture_voter.reset()
+            self.emit_event("user_detected", user=track.name, track_id=track.track_id)
+        self.current_user = track.name
+        self.face_detection_start = track.verify_start
+        if track.elapsed() >= self.face_threshold:
+            self.face_verified = True
+            self.face_detection_start = None
+            if self.hand_search is not None:
+                self.hand_search.anchor(track.box)
+            self.emit_event("face_verified", user=track.name)
+
+    def process_hands(self, context, now=None):
+        """Yüz doğrulandıysa el hareketini tanı, oyla ve kişiye özel hareketi kontrol et"""
+        voter = self.gesture_voter
+        if not voter.should_classify():
+            return
+        with self.metrics.timer("el_mediapipe"):
+            if self.hand_search is not None:
+                results = self.hand_search.process(self.hands, context)
+            else:
+                results = self.hands.process(context.rgb())
+        best_gesture, best_probability = None, 0.0
+        for hand_landmarks, handedness in detected_hands(results):
+            with self.metrics.timer("el_siniflandirma"):
+                gesture, probability = self.shared.classify_gesture(hand_landmarks, handedness)
+            if gesture and probability > best_probability:
+                best_gesture, best_probability = gesture, probability
+        previous = voter.accepted
+        gesture, score = voter.add(best_gesture, best_probability, now)
+        if gesture is None or gesture == previous:
+            return
+        self.emit_event("hand_gesture", user=self.current_user, gesture=gesture, probability=float(score))
+        if self.shared.check_gesture(self.current_user, gesture):
+            self.hand_verified = True
+            self.granted_time = time.time() if now is None else now
+            self.granted += 1
+            self.emit_event("hand_verified", user=self.current_user, gesture=gesture)
+
+    def process(self, frame):
+        """Tek kareyi bu kameranın durum makinesinde işle (işçi thread'inde çalışır)"""
+        start = time.perf_counter()
+        # Hızlı oynatmada sayaçlar kaynağın kare zamanıyla, canlıda duvar saatiyle ilerler
+        now = None if self.realtime else getattr(self.capture, "frame_time", None)
+        context = FrameContext(frame, self.frame_buffers)
+        if not self.face_verified:
+            tracks = self.face_tracker.update(frame, lambda f: self.detect_faces(f, context), now=now)
+            self.update_face_verification(tracks)
+        elif not self.hand_verified:
+            self.process_hands(context, now)
+        elif (time.time() if now is None else now) - self.granted_time >= self.reset_after:
+            self.emit_event("session_reset", user=self.current_user)
+            self.reset()
+        context.release()
+        self.metrics.observe("kare_isleme", (time.perf_counter() - start) * 1000)
+        self.metrics.tick("islenen")
+        self.metrics.maybe_export()
+
+
+def session_summary(session, elapsed):
+    """Bir kameranın çalışma özeti (kare sayısı, hız, işleme p95, giriş onayları)"""
+    snapshot = session.metrics.snapshot()
+    frames = snapshot["frames"].get("islenen", 0)
+    latency = snapshot["latency"].get("kare_isleme", {})
+    return {"camera": session.camera_id, "frames": frames, "elapsed": elapsed,
+            "fps": frames / elapsed if elapsed > 0 else 0.0,
+            "p95_ms": latency.get("p95_ms", 0.0), "granted": session.granted}
+
+
+def print_summary(summaries, elapsed):
+    for summary in summaries:
+        print(f"Kamera {summary['camera']}: {summary['frames']} kare, {summary['fps']:.1f} kare/sn, "
+              f"işleme p95 {summary['p95_ms']:.0f} ms, {summary['granted']} giriş onayı")
+    total = sum(summary["frames"] for summary in summaries)
+    print(f"Toplam: {total} kare, {sum(summary['fps'] for summary in summaries):.1f} kare/sn ({elapsed:.1f} sn)")
+
+
+class MultiCameraRunner:
+    """Birden fazla kamerayı tek süreçte, ortak bir işçi thread havuzuyla işler.
+
+    Her kamera kendi thread'inde en yeni kareyi okur ve işlenmek üzere
+    havuza verir; aynı kameranın kareleri sırayla işlenir (durum makinesi
+    tek thread'de ilerler). Kameralar tek süreçte olduğu için GIL'i
+    tutan adımlar (dlib HOG / ResNet, eşleştirme, durum makinesi) sırayla
+    çalışır ve toplam verim çekirdek sayısıyla ölçeklenmez; çok çekirdekli
+    makinelerde MultiCameraProcessRunner kullanılır (bkz.
+    benchmark_multi_camera.py). Bu sınıf tek çekirdekte ya da süreç
+    başlatmanın pahalı olduğu durumlarda işe yarar.
+    """
+
+    def __init__(self, sessions, workers=None):
+        self.sessions = list(sessions)
+        self.workers = workers or min(len(self.sessions), os.cpu_count() or 1)
+        self._running = False
+        self.summaries = []
+
+    def add_event_listener(self, callback):
+        for session in self.sessions:
+            session.event_listeners.append(callback)
+
+    def _camera_loop(self, session, executor):
+        while self._running:
+            with session.metrics.timer("yakalama"):
+                ret, frame = session.capture.read()
+            if not ret:
+                break
+            try:
+                executor.submit(session.process, frame).result()
+            except Exception as e:
+                print(f"HATA: Kamera {session.camera_id} karesi işlenemedi: {e}")
+        session.capture.release()
+        if session.hand_search is not None:
+            session.hand_search.close()
+
+    def run(self, duration=None, verbose=True):
+        """Tüm kameraları çalıştır; kaynaklar bitene, duration dolana ya da Ctrl+C'ye kadar"""
+        opened = [s for s in self.sessions if s.capture.isOpened()]
+        for session in self.sessions:
+            if session not in opened:
+                print(f"HATA: Kamera {session.camera_id} açılamadı: {session.source}")
+        if not opened:
+            return []
+        if verbose:
+            print(f"{len(opened)} kamera, {self.workers} işçi thread ile çalışıyor...")
+
+        self._running = True
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            threads = [threading.Thread(target=self._camera_loop, args=(session, executor),
+                                        name=f"kamera-{session.camera_id}", daemon=True)
+                       for session in opened]
+            for thread in threads:
+                thread.start()
+            try:
+                while any(thread.is_alive() for thread in threads):
+                    if duration is not None and time.perf_counter() - start >= duration:
+                        break
+                    time.sleep(0.1)
+            except KeyboardInterrupt:
+                pass
+            self._running = False
+            for thread in threads:
+                thread.join(timeout=2.0)
+        self.elapsed = time.perf_counter() - start
+        for session in opened:
+            session.metrics.export()
+        self.summaries = [session_summary(session, self.elapsed) for session in opened]
+        if verbose:
+            print_summary(self.summaries, self.elapsed)
+        return self.summaries
+
+
+def _camera_process(camera_id, source, shared, options, events, start_event, stop):
+    """Süreç modunda tek kameranın döngüsü (ayrı süreçte çalışır).
+
+    Kamera ve dedektör kurulunca ("ready", kimlik) gönderilir, tüm kameralar
+    hazır olup start_event kurulunca döngü başlar. Olaylar ("event", veri)
+    olarak, döngü bitince özet ("summary", veri) olarak events kuyruğuna
+    konur; stop kurulunca döngü biter.
+    """
+    session = CameraSession(camera_id, source, shared, **options)
+    session.event_listeners.append(lambda data: events.put(("event", data)))
+    if session.capture.isOpened():
+        # Model yükleme süresi ilk kareye (ve verim ölçümüne) yansımasın
+        shared.detector
+        shared.embedder
+    events.put(("ready", camera_id))
+    start_event.wait()
+    elapsed = 0.0
+    if session.capture.isOpened():
+        start = time.perf_counter()
+        try:
+            while not stop.is_set():
+                with session.metrics.timer("yakalama"):
+                    ret, frame = session.capture.read()
+                if not ret:
+                    break
+                try:
+                    session.process(frame)
+                except Exception as e:
+                    print(f"HATA: Kamera {camera_id} karesi işlenemedi: {e}")
+        except KeyboardInterrupt:
+            # Ctrl+C tüm süreç grubuna gider; durdurmayı ana süreç yönetir
+            pass
+        elapsed = time.perf_counter() - start
+    else:
+        print(f"HATA: Kamera {camera_id} açılamadı: {source}")
+    session.capture.release()
+    if session.hand_search is not None:
+        session.hand_search.close()
+    session.metrics.export()
+    summary = session_summary(session, elapsed)
+    summary["opened"] = elapsed > 0
+    events.put(("summary", summary))
+
+
+class MultiCameraProcessRunner:
+    """Her kamerayı ayrı bir süreçte işler.
+
+    dlib (HOG tespit, ResNet encoding) ve Python tarafındaki durum makinesi
+    GIL'i bırakmadığı için thread havuzu çok çekirdekte ölçeklenmez. Burada
+    her kamera sürecinin kendi yakalaması, dedektörü ve MediaPipe nesnesi
+    vardır; kareler süreçler arasında hiç taşınmaz, ana sürece sadece
+    olaylar ve özetler bir kuyrukla gelir. Süreçler spawn ile başlatılır
+    (shared_frames ile aynı), SharedRecognition her sürece bir kez kopyalanır.
+    session_options CameraSession'a aktarılır. Süre, tüm kameralar kurulup
+    hazır olduktan sonra başlar.
+    """
+
+    def __init__(self, sources, shared, **session_options):
+        self.sources = list(sources)
+        self.shared = shared
+        self.options = session_options
+        self.event_listeners = []
+        self.summaries = []
+
+    def add_event_listener(self, callback):
+        self.event_listeners.append(callback)
+
+    def _dispatch(self, data):
+        for callback in self.event_listeners:
+            try:
+                callback(data)
+            except Exception as e:
+                print(f"UYARI: Olay dinleyicisi hata verdi ({data.get('event')}, kamera {data.get('camera')}): {e}")
+
+    def run(self, duration=None, verbose=True):
+        """Tüm kameraları çalıştır; kaynaklar bitene, duration dolana ya da Ctrl+C'ye kadar"""
+        if not self.sources:
+            return []
+        context = multiprocessing.get_context("spawn")
+        events = context.Queue()
+        start_event = context.Event()
+        stop = context.Event()
+        processes = [context.Process(target=_camera_process,
+                                     args=(camera_id, source, self.shared, self.options, events, start_event, stop),
+                                     name=f"kamera-{camera_id}", daemon=True)
+                     for camera_id, source in enumerate(self.sources)]
+        if verbose:
+            print(f"{len(processes)} kamera, kamera başına bir süreç ile çalışıyor...")
+
+        for process in processes:
+            process.start()
+        ready = set()
+        try:
+            while len(ready) < len(processes):
+                try:
+                    kind, data = events.get(timeout=0.1)
+                except queue.Empty:
+                    # Kurulurken çöken süreçler beklenmez
+                    if all(camera_id in ready or not process.is_alive()
+                           for camera_id, process in enumerate(processes)):
+                        break
+                    continue
+                if kind == "ready":
+                    ready.add(data)
+        except KeyboardInterrupt:
+            stop.set()
+        start_event.set()
+
+        start = time.perf_counter()
+        summaries = {}
+        while len(summaries) < len(processes):
+            try:
+                if duration is not None and time.perf_counter() - start >= duration:
+                    stop.set()
+                try:
+                    kind, data = events.get(timeout=0.1)
+                except queue.Empty:
+                    # Özet göndermeden çıkan (çöken) süreçler beklenmez
+                    if not any(process.is_alive() for process in processes) and events.empty():
+                        break
+                    continue
+                if kind == "summary":
+                    summaries[data["camera"]] = data
+                else:
+                    self._dispatch(data)
+            except KeyboardInterrupt:
+                stop.set()
+        stop.set()
+        for process in processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                print(f"UYARI: {process.name} süreci kapanmadı, sonlandırılıyor")
+                process.terminate()
+        self.elapsed = time.perf_counter() - start
+        self.summaries = [summaries[camera_id] for camera_id in sorted(summaries)
+                          if summaries[camera_id]["opened"]]
+        if verbose and self.summaries:
+            print_summary(self.summaries, self.elapsed)
+        return self.summaries
@@ -0,0 +1,228 @@
+import os
+import json
+import math
+import bisect
+import threading
+import time
+import collections
+from contextlib import contextmanager
+
+
+def _bucket_bounds(low_ms=0.05, high_ms=60000.0, factor=1.25):
+    """Logaritmik aralıklı kova üst sınırları (ms)"""
+    count = int(math.ceil(math.log(high_ms / low_ms) / math.log(factor))) + 1
+    return [low_ms * factor ** i for i in range(count)]
+
+
+BUCKET_BOUNDS_MS = _bucket_bounds()
+
+
+class LatencyHistogram:
+    """Sabit bellekli gecikme histogramı (ms).
+
+    Kovalar logaritmik aralıklıdır (her biri bir öncekinin 1.25 katı), bu
+    yüzden yüzdelikler %12 içinde doğrudur ve kaç ölçüm eklendiğinden
+    bağımsız olarak bellek sabit kalır.
+    """
+
+    def __init__(self, bounds=BUCKET_BOUNDS_MS):
+        self.bounds = bounds
+        # Son kova üst sınırı aşan ölçümler içindir
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, value_ms):
+        index = bisect.bisect_left(self.bounds, value_ms)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value_ms
+            self.last = value_ms
+            if value_ms > self.max:
+                self.max = value_ms
+
+    def percentile(self, q):
+        """q (0-1) yüzdeliği, kova içinde doğrusal aradeğerleme ile"""
+        with self.lock:
+            if self.count == 0:
+                return 0.0
+            target = q * self.count
+            cumulative = 0
+            for index, bucket_count in enumerate(self.counts):
+                if bucket_count and cumulative + bucket_count >= target:
+                    low = self.bounds[index - 1] if index > 0 else 0.0
+                    high = self.bounds[index] if index < len(self.bounds) else self.max
+                    fraction = (target - cumulative) / bucket_count
+                    return min(low + (high - low) * fraction, self.max)
+                cumulative += bucket_count
+            return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max,
+            "last_ms": self.last,
+        }
+
+
+class FpsCounter:
+    """Son window saniyedeki olay hızı (en fazla max_events zaman damgası tutulur).
+
+    tick() işçi thread'lerinden, fps arayüz ve dışa aktarımdan çağrılır;
+    ikisi de aynı kuyruğu değiştirdiği için kilitle korunur.
+    """
+
+    def __init__(self, window=2.0, max_events=512):
+        self.window = window
+        self.times = collections.deque(maxlen=max_events)
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def tick(self):
+        now = time.perf_counter()
+        with self.lock:
+            self.times.append(now)
+            self.total += 1
+
+    @property
+    def fps(self):
+        now = time.perf_counter()
+        with self.lock:
+            while self.times and now - self.times[0] > self.window:
+                self.times.popleft()
+            if len(self.times) < 2:
+                return 0.0
+            span = self.times[-1] - self.times[0]
+            count = len(self.times)
+        return (count - 1) / span if span > 0 else 0.0
+
+
+class PipelineMetrics:
+    """Giriş döngüsünün aşama gecikmeleri ve FPS sayaçları.
+
+    Ölçümler ve olay sayaçları (count) bellekte tutulur (arayüz snapshot()
+    ile okur) ve export_interval saniyede bir JSON ve Prometheus metin
+    biçiminde dosyaya yazılır.
+    """
+
+    def __init__(self, json_path="metrics/login_metrics.json", prometheus_path="metrics/login_metrics.prom",
+                 export_interval=5.0):
+        self.json_path = json_path
+        self.prometheus_path = prometheus_path
+        self.export_interval = export_interval
+        self.histograms = {}
+        self.counters = {}
+        self.totals = collections.Counter()
+        self.started = time.time()
+        self._last_export = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def observe(self, name, elapsed_ms):
+        """Bir aşama süresini kaydet"""
+        self.histogram(name).record(elapsed_ms)
+
+    @contextmanager
+    def timer(self, name):
+        """with metrics.timer("yuz_tespit"): ... bloğunun süresini kaydet"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def tick(self, name):
+        """FPS sayacını bir artır"""
+        counter = self.counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self.counters.setdefault(name, FpsCounter())
+        counter.tick()
+
+    def count(self, name, amount=1):
+        """Olay sayacını amount kadar artır (ör. atlanan encoding sayısı)"""
+        with self._lock:
+            self.totals[name] += amount
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.counters = {}
+            self.totals = collections.Counter()
+            self.started = time.time()
+
+    def snapshot(self):
+        """Arayüz ve dosyalar için tüm metriklerin özeti"""
+        return {
+            "time": time.time(),
+            "uptime_s": time.time() - self.started,
+            "latency": {name: h.summary() for name, h in list(self.histograms.items())},
+            "fps": {name: c.fps for name, c in list(self.counters.items())},
+            "frames": {name: c.total for name, c in list(self.counters.items())},
+            "counts": dict(self.totals),
+        }
+
+    def prometheus_text(self):
+        """Prometheus metin biçimi (gecikmeler saniye cinsinden histogram)"""
+        lines = [
+            "# HELP login_stage_latency_seconds Giris dongusu asama gecikmesi",
+            "# TYPE login_stage_latency_seconds histogram",
+        ]
+        for name, histogram in sorted(self.histograms.items()):
+            with histogram.lock:
+                counts = list(histogram.counts)
+                total, count = histogram.total, histogram.count
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.bounds, counts):
+                cumulative += bucket_count
+                lines.append(f'login_stage_latency_seconds_bucket{{stage="{name}",le="{bound / 1000:.6g}"}} {cumulative}')
+            lines.append(f'login_stage_latency_seconds_bucket{{stage="{name}",le="+Inf"}} {count}')
+            lines.append(f'login_stage_latency_seconds_sum{{stage="{name}"}} {total / 1000:.6f}')
+            lines.append(f'login_stage_latency_seconds_count{{stage="{name}"}} {count}')
+        lines += ["# HELP login_fps Son saniyelerdeki kare hizi", "# TYPE login_fps gauge"]
+        for name, counter in sorted(self.counters.items()):
+            lines.append(f'login_fps{{counter="{name}"}} {counter.fps:.3f}')
+        lines += ["# HELP login_frames_total Toplam kare", "# TYPE login_frames_total counter"]
+        for name, counter in sorted(self.counters.items()):
+            lines.append(f'login_frames_total{{counter="{name}"}} {counter.total}')
+        lines += ["# HELP login_events_total Toplam olay", "# TYPE login_events_total counter"]
+        for name, total in sorted(dict(self.totals).items()):
+            lines.append(f'login_events_total{{event="{name}"}} {total}')
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        """Metrikleri JSON ve Prometheus dosyalarına yaz (yarım dosya okunmasın diye atomik)"""
+        for path, content in ((self.json_path, json.dumps(self.snapshot(), indent=2)),
+                              (self.prometheus_path, self.prometheus_text())):
+            if not path:
+                continue
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        self._last_export = time.perf_counter()
+
+    def maybe_export(self):
+        """export_interval dolduysa dosyaları güncelle"""
+        if time.perf_counter() - self._last_export >= self.export_interval:
+            try:
+                self.export()
+            except OSError as e:
+                print(f"UYARI: Metrikler yazılamadı: {e}")
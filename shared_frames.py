@@ -0,0 +1,231 @@
+import queue
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class SharedFrameRing:
+    """multiprocessing.shared_memory üzerinde sabit sayıda kare yuvası.
+
+    Kareler süreçler arasında kopyalanıp pickle edilmez: yazan taraf boş
+    bir yuvaya kareyi bir kez kopyalar ve kuyruğa sadece (yuva, bilgi)
+    mesajı koyar; okuyan taraf yuvanın NumPy görünümünü kopyasız kullanır
+    ve işi bitince release() ile yuvayı geri verir. Boş yuva kalmadıysa
+    write() kareyi atar (canlı kamera) ya da timeout kadar bekler.
+
+    Tamponu okuyan (sahip) süreç allocate() ile oluşturur ve kapatırken
+    siler; yazan süreç spec'i attach() ile bağlar. Kuyruklar süreç
+    başlatılırken argüman olarak aktarılmalıdır.
+    """
+
+    def __init__(self, slots=8, context=None):
+        context = context or mp.get_context("spawn")
+        self.slots = slots
+        self.free = context.Queue()
+        self.ready = context.Queue()
+        self.spec = None
+        self.shm = None
+        self.frames = None
+        self.owner = False
+
+    def __getstate__(self):
+        return {"slots": self.slots, "free": self.free, "ready": self.ready, "spec": self.spec}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.shm = None
+        self.frames = None
+        self.owner = False
+        if self.spec is not None:
+            self.attach(self.spec)
+
+    def allocate(self, shape, dtype=np.uint8):
+        """Tamponu oluştur, tüm yuvaları boş say ve bağlanma bilgisini döndür"""
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape)) * dtype.itemsize * self.slots
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.owner = True
+        self.spec = (self.shm.name, tuple(shape), dtype.str)
+        self._map(shape, dtype)
+        for slot in range(self.slots):
+            self.free.put(slot)
+        return self.spec
+
+    def attach(self, spec):
+        """Başka süreçte oluşturulmuş tampona bağlan"""
+        name, shape, dtype = spec
+        self.spec = spec
+        self.shm = shared_memory.SharedMemory(name=name)
+        self._map(shape, np.dtype(dtype))
+
+    def _map(self, shape, dtype):
+        self.frames = np.ndarray((self.slots,) + tuple(shape), dtype=dtype, buffer=self.shm.buf)
+        self.frame_bytes = self.frames[0].nbytes
+        self._base = self.frames.ctypes.data
+
+    # --- Yazan taraf ---
+
+    def write(self, frame, meta=None, timeout=0):
+        """Kareyi boş bir yuvaya kopyala ve okuyana bildir.
+
+        timeout içinde boş yuva bulunamazsa False döner (timeout=0: hiç bekleme).
+        """
+        try:
+            if timeout == 0:
+                slot = self.free.get_nowait()
+            else:
+                slot = self.free.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        np.copyto(self.frames[slot], frame)
+        self.ready.put((slot, meta))
+        return True
+
+    def finish(self, reason=None):
+        """Akışın bittiğini bildir"""
+        self.ready.put((None, reason))
+
+    # --- Okuyan taraf ---
+
+    def read(self, timeout=None):
+        """Sıradaki kare: (görünüm, bilgi); akış bittiyse (None, neden).
+
+        Süre dolarsa queue.Empty fırlatılır. Görünüm release() edilene kadar geçerlidir.
+        """
+        slot, meta = self.ready.get(timeout=timeout)
+        if slot is None:
+            return None, meta
+        return self.frames[slot], meta
+
+    def release(self, frame):
+        """read() ile alınan görünümün yuvasını yazana geri ver"""
+        if self.frames is None:
+            return
+        slot = (frame.ctypes.data - self._base) // self.frame_bytes
+        if 0 <= slot < self.slots:
+            self.free.put(int(slot))
+
+    def close(self):
+        """Görünümleri bırak; sahip süreç paylaşılan belleği de siler"""
+        self.frames = None
+        if self.shm is not None:
+            try:
+                self.shm.close()
+            except BufferError:
+                # Dışarıda hâlâ görünüm tutan var; bellek süreç bitince serbest kalır
+                pass
+            if self.owner:
+                self.shm.unlink()
+            self.shm = None
+
+
+def _capture_main(source, realtime, ring, control, stop):
+    """Yakalama süreci: kaynağı açar, kareleri halkaya yazar"""
+    # Bu süreçte sadece yakalama yapılır; frame_capture burada yüklenir
+    from frame_capture import LatestFrameCapture, open_frame_source
+    cap = open_frame_source(source, realtime)
+    ret, frame = cap.read() if cap.isOpened() else (False, None)
+    if not ret:
+        ring.ready.put(("error", f"Kare kaynağı açılamadı: {source}"))
+        cap.release()
+        return
+    ring.ready.put(("open", (frame.shape, frame.dtype.str)))
+    ring.attach(control.get())
+
+    # Canlı kamerada yuva yoksa kare atılır; dosya kaynakları her kareyi verir
+    timeout = 0 if isinstance(cap, LatestFrameCapture) else 0.1
+    frame_id = dropped = 0
+    while ret and not stop.is_set():
+        meta = (frame_id, time.time(), dropped + getattr(cap, "frames_dropped", 0), getattr(cap, "frame_time", None))
+        if ring.write(frame, meta, timeout):
+            frame_id += 1
+        elif timeout == 0:
+            dropped += 1
+        else:
+            continue
+        ret, frame = cap.read()
+    cap.release()
+    ring.finish("bitti")
+    ring.close()
+
+
+class SharedMemoryFrameSource:
+    """Yakalamayı ayrı bir süreçte yapıp kareleri paylaşılan bellek halkasıyla
+    aktaran kare kaynağı (open_frame_source ile aynı isOpened / read / release).
+
+    read() kopya değil halkadaki yuvanın görünümünü döndürür; kare ile iş
+    bitince release_frame(frame) çağrılmalıdır. Aynı anda işlenen kare sayısı
+    slots'u geçerse yakalama süreci yeni kareleri atar.
+    """
+
+    def __init__(self, source=0, realtime=True, slots=16, read_timeout=5.0):
+        self.source = source
+        self.read_timeout = read_timeout
+        context = mp.get_context("spawn")
+        self.ring = SharedFrameRing(slots, context)
+        self.control = context.Queue()
+        self.stop_event = context.Event()
+        self.process = context.Process(target=_capture_main, name="kare-yakalama", daemon=True,
+                                       args=(source, realtime, self.ring, self.control, self.stop_event))
+        self.process.start()
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.last_frame_time = None
+        self.frame_time = None
+        self.opened = False
+
+        try:
+            status, info = self.ring.ready.get(timeout=30)
+        except queue.Empty:
+            status, info = "error", "Yakalama süreci yanıt vermedi"
+        if status != "open":
+            print(f"HATA: {info}")
+            self.release()
+            return
+        shape, dtype = info
+        self.control.put(self.ring.allocate(shape, dtype))
+        self.opened = True
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self):
+        if not self.opened:
+            return False, None
+        try:
+            frame, meta = self.ring.read(timeout=self.read_timeout)
+        except queue.Empty:
+            return False, None
+        if frame is None:
+            return False, None
+        _, self.last_frame_time, self.frames_dropped, self.frame_time = meta
+        self.frames_captured += 1
+        return True, frame
+
+    def release_frame(self, frame):
+        """İşlenmiş karenin yuvasını yakalama sürecine geri ver"""
+        self.ring.release(frame)
+
+    @property
+    def drop_rate(self):
+        total = self.frames_captured + self.frames_dropped
+        return self.frames_dropped / total if total else 0.0
+
+    def release(self):
+        """Yakalama sürecini durdur ve paylaşılan belleği sil"""
+        self.stop_event.set()
+        self.opened = False
+        # Süreç dolu bir yuva beklerken takılmasın diye kuyruktakiler boşaltılır
+        deadline = time.monotonic() + 2.0
+        while self.process.is_alive() and time.monotonic() < deadline:
+            try:
+                slot, _ = self.ring.ready.get(timeout=0.1)
+                if slot is not None and not isinstance(slot, str):
+                    self.ring.free.put(slot)
+            except queue.Empty:
+                pass
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.ring.close()
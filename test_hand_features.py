@@ -0,0 +1,73 @@
+import os
+import json
+from types import SimpleNamespace
+import numpy as np
+from gesture_classifiers import (GESTURE_CLASSIFIERS, HandGestureRecognizer, classifier_filename,
+                                 load_hand_dataset, train_gesture_classifier)
+from hand_features import FEATURE_VERSION, LANDMARK_COUNT, features_from_record
+
+
+def _hand_points(direction, rng):
+    """Bilekten direction (+1 sağ, -1 sol) yönüne uzanan el işaretleri"""
+    points = np.zeros((LANDMARK_COUNT, 3), dtype=np.float32)
+    points[:, 0] = 0.5 + direction * np.linspace(0.0, 0.2, LANDMARK_COUNT)
+    points[:, 1] = 0.5 + np.linspace(0.0, 0.05, LANDMARK_COUNT)
+    return points + rng.normal(0.0, 0.002, points.shape).astype(np.float32)
+
+
+def _write_dataset(data_dir, handedness=None, samples=10):
+    rng = np.random.default_rng(0)
+    for gesture, direction in (("A", 1.0), ("B", -1.0)):
+        os.makedirs(os.path.join(data_dir, gesture))
+        for i in range(samples):
+            # Baştaki veriler gibi: sürüm 1 ham özellikler, el bilgisi yok
+            data = {"gesture": gesture, "features": _hand_points(direction, rng).reshape(-1).tolist()}
+            if handedness is not None:
+                data.update(feature_version=1, handedness=handedness)
+            with open(os.path.join(data_dir, gesture, f"{i}.json"), 'w') as f:
+                json.dump(data, f)
+
+
+def _landmarks(points):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in points])
+
+
+def test_legacy_records_are_not_mirrored_at_inference(tmp_path):
+    data_dir = str(tmp_path / "hands")
+    _write_dataset(data_dir)
+    X, y, mirror_handedness = load_hand_dataset(data_dir, FEATURE_VERSION)
+    assert not mirror_handedness
+
+    classifier = train_gesture_classifier("knn", X, y, FEATURE_VERSION, mirror_handedness)
+    path = str(tmp_path / classifier_filename("knn"))
+    classifier.save(path)
+    loaded = GESTURE_CLASSIFIERS["knn"].load(path)
+    assert loaded.mirror_handedness is False
+
+    # Çevrilmemiş kamera karesinde MediaPipe sağ eli "Left" olarak etiketler;
+    # tahmin özellikleri eğitimdeki dönüşümle bire bir aynı olmalı
+    recognize = HandGestureRecognizer(loaded)
+    points = _hand_points(1.0, np.random.default_rng(1))
+    training = features_from_record({"features": points.reshape(-1).tolist()}, FEATURE_VERSION, mirror_handedness)
+    for handedness in ("Left", "Right", None):
+        np.testing.assert_array_equal(recognize.features(_landmarks(points), handedness), training)
+        assert recognize(_landmarks(points), handedness)[0] == "A"
+
+
+def test_labelled_records_mirror_left_hands(tmp_path):
+    data_dir = str(tmp_path / "hands")
+    _write_dataset(data_dir, handedness="Left")
+    X, y, mirror_handedness = load_hand_dataset(data_dir, FEATURE_VERSION)
+    assert mirror_handedness
+
+    classifier = train_gesture_classifier("random_forest", X, y, FEATURE_VERSION, mirror_handedness)
+    path = str(tmp_path / classifier_filename("random_forest"))
+    classifier.save(path)
+    loaded = GESTURE_CLASSIFIERS["random_forest"].load(path)
+    assert loaded.mirror_handedness is True
+
+    # Eğitimde aynalanan sol el tahminde de aynalanır
+    recognize = HandGestureRecognizer(loaded)
+    points = _hand_points(1.0, np.random.default_rng(1))
+    assert recognize(_landmarks(points), "Left")[0] == "A"
+    assert recognize(_landmarks(points), "Right")[0] == "B"